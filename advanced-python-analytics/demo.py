@@ -11,10 +11,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.data.ingestion import DataLoader, StreamProcessor
+from src.data.alerts import AlertDispatcher, FileSink
 from src.data.processor import DataProcessor
 from src.models.ml_pipeline import MLPipeline
 from src.analysis.statistics import StatisticalAnalyzer
-from src.analysis.anomaly import AnomalyDetector
+from src.analysis.anomaly import AnomalyDetector, StreamingAnomalyDetector
 from src.visualization.dashboard import Dashboard
 from src.visualization.report import ReportGenerator
 from src.core.config import Config
@@ -42,8 +43,11 @@ async def demo_async_processing():
     """Demonstrate async data processing."""
     print_section("Async Data Processing Demo")
     
-    processor = StreamProcessor(batch_size=10)
-    detector = AnomalyDetector(method='zscore', threshold=3.0)
+    # Alerts are queued without blocking the stream and delivered in batches
+    dispatcher = AlertDispatcher([FileSink("outputs/demo_alerts.jsonl")])
+    processor = StreamProcessor(batch_size=10, dispatcher=dispatcher)
+    # Stateful detector: each batch is scored against everything seen so far
+    detector = StreamingAnomalyDetector(method='zscore', threshold=3.0, warmup=5)
     
     print("Simulating real-time data stream...")
     batch_count = 0
@@ -56,10 +60,12 @@ async def demo_async_processing():
         anomalies = detector.detect(batch)
         if len(anomalies) > 0:
             print(f"    ⚠ Detected {len(anomalies)} anomalies!")
+            await processor.alert(anomalies, key='api')
         
         if batch_count >= 3:  # Limit demo to 3 batches
             break
     
+    await dispatcher.close()
     print("✓ Async processing demo complete")
 
 
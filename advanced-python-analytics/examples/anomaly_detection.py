@@ -11,7 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data.ingestion import DataLoader
 from src.data.processor import DataProcessor
-from src.analysis.anomaly import AnomalyDetector
+from src.analysis.anomaly import AnomalyDetector, EnsembleAnomalyDetector
 from src.visualization.charts import ChartBuilder
 import plotly.graph_objects as go
 
@@ -48,8 +48,17 @@ def main():
             print("\nSample anomalous records:")
             print(anomalies.head(3)[['sales', 'marketing_spend', 'website_visits']])
     
+    # Ensemble: one feature extraction, members scored concurrently
+    print("\n[4] Combining methods in an ensemble...")
+    ensemble = EnsembleAnomalyDetector(methods=methods, combine='rank')
+    details = ensemble.fit(processed_data).detect_details(processed_data)
+    
+    print(f"✓ Detected {details['is_anomaly'].sum()} anomalies")
+    print("\nMean normalized score per method for anomalous records:")
+    print(details['contributions'][details['is_anomaly']].mean().round(3))
+    
     # Visualization
-    print("\n[4] Creating visualization...")
+    print("\n[5] Creating visualization...")
     detector = AnomalyDetector(method='isolation_forest')
     detector.fit(processed_data)
     scores = detector.get_anomaly_scores(processed_data)
@@ -0,0 +1,91 @@
+"""
+Compiled Model Benchmark
+Times sklearn/XGBoost prediction against compiled tree ensembles by batch size
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+
+from src.models.compiled import BatchRoutedModel, compile_model
+
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+def make_data(n_rows: int = 20000, n_features: int = 10, seed: int = 42):
+    """Synthetic features with a regression and a classification target."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features))
+    signal = X[:, 0] + np.sin(2 * X[:, 1]) + 0.5 * X[:, 2] * X[:, 3]
+    return X, signal + 0.1 * rng.normal(size=n_rows), np.digitize(signal, [-0.5, 0.5])
+
+
+def time_per_call(predict, X: np.ndarray, min_seconds: float = 0.2) -> float:
+    """Mean seconds per call, repeating the call for at least ``min_seconds``."""
+    calls, start = 0, time.perf_counter()
+    while True:
+        predict(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+
+def benchmark(name: str, model, X_test: np.ndarray) -> pd.DataFrame:
+    """Compare source, compiled and batch-routed prediction for each batch size."""
+    compiled = compile_model(model)
+    routed = BatchRoutedModel(compiled, model, compiled.native_batch_rows)
+    diff = np.max(np.abs(model.predict(X_test) - compiled.predict(X_test)))
+    
+    rows = []
+    for batch_size in BATCH_SIZES:
+        batch = X_test[:batch_size]
+        source = time_per_call(model.predict, batch)
+        fast = time_per_call(compiled.predict, batch)
+        best = time_per_call(routed.predict, batch)
+        rows.append({
+            'model': name,
+            'batch': batch_size,
+            'source_rows_s': batch_size / source,
+            'compiled_rows_s': batch_size / fast,
+            'speedup': source / fast,
+            'routed_speedup': source / best,
+            'max_abs_diff': diff
+        })
+    return pd.DataFrame(rows)
+
+
+def main():
+    """Run compiled model benchmark."""
+    print("=" * 80)
+    print("Compiled Model Benchmark (single core)")
+    print("=" * 80)
+    
+    X, y_reg, y_cls = make_data()
+    X_test = make_data(seed=7)[0]
+    
+    models = {
+        'random_forest_regressor': RandomForestRegressor(n_estimators=100, max_depth=10, n_jobs=1, random_state=0).fit(X, y_reg),
+        'random_forest_classifier': RandomForestClassifier(n_estimators=100, n_jobs=1, random_state=0).fit(X, y_cls),
+        'xgboost_regressor': xgb.XGBRegressor(n_estimators=200, max_depth=6, n_jobs=1).fit(X, y_reg),
+        'xgboost_classifier': xgb.XGBClassifier(n_estimators=200, max_depth=6, n_jobs=1).fit(X, y_cls)
+    }
+    
+    for name, model in models.items():
+        print()
+        print(benchmark(name, model, X_test).to_string(index=False, float_format=lambda v: f"{v:.3g}"))
+    
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
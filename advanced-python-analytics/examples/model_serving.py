@@ -0,0 +1,85 @@
+"""
+Model Serving Example
+Compares per-row MLPipeline.predict calls with micro-batched serving
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from src.models.ml_pipeline import MLPipeline
+from src.models.artifacts import save_artifact, load_artifact
+from src.models.serving import ModelServer
+
+
+def make_data(n_rows: int = 5000, n_features: int = 10, seed: int = 42) -> pd.DataFrame:
+    """Synthetic regression data."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features))
+    data = pd.DataFrame(X, columns=[f"x{j}" for j in range(n_features)])
+    data['target'] = X @ rng.normal(size=n_features) + rng.normal(size=n_rows)
+    return data
+
+
+async def load_test(server: ModelServer, records: list, concurrency: int) -> float:
+    """Send every record as its own request, keeping ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def request(record):
+        async with semaphore:
+            return await server.predict(record)
+    
+    start = time.perf_counter()
+    async with server:
+        await asyncio.gather(*(request(record) for record in records))
+    return time.perf_counter() - start
+
+
+def main():
+    """Run model serving example."""
+    print("=" * 80)
+    print("Model Serving Example")
+    print("=" * 80)
+    
+    data = make_data()
+    tmp = tempfile.TemporaryDirectory()
+    path = str(Path(tmp.name) / "model")
+    save_artifact(MLPipeline(model_type='random_forest', problem_type='regression').fit(data, target='target'), path)
+    # The compiled trees are loaded, with their node arrays memory-mapped, on first use
+    pipeline = load_artifact(path, compiled=True)
+    
+    requests = data.drop(columns=['target']).head(1000)
+    records = requests.to_dict('records')
+    
+    print("\n[1] One MLPipeline.predict call per row...")
+    latencies = []
+    for i in range(len(requests)):
+        start = time.perf_counter()
+        pipeline.predict(requests.iloc[[i]])
+        latencies.append(time.perf_counter() - start)
+    print(f"p50 {np.percentile(latencies, 50) * 1000:.2f} ms, "
+          f"p99 {np.percentile(latencies, 99) * 1000:.2f} ms, "
+          f"{len(requests) / sum(latencies):.0f} requests/s")
+    
+    print("\n[2] Micro-batched ModelServer...")
+    for concurrency, max_batch_size in [(1, 1), (64, 64), (256, 256)]:
+        server = ModelServer(pipeline, max_batch_size=max_batch_size, max_wait=0.002)
+        elapsed = asyncio.run(load_test(server, records, concurrency))
+        stats = server.stats
+        print(f"concurrency {concurrency:>3}: p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, "
+              f"{len(records) / elapsed:.0f} requests/s, {stats['mean_batch_rows']:.1f} rows per batch")
+    
+    print("=" * 80)
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
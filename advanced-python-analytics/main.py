@@ -13,6 +13,7 @@ from src.core.config import Config
 from src.data.ingestion import DataLoader
 from src.data.processor import DataProcessor
 from src.models.ml_pipeline import MLPipeline
+from src.models.search import HyperparameterSearch
 from src.analysis.statistics import StatisticalAnalyzer
 from src.visualization.dashboard import Dashboard
 from src.visualization.report import ReportGenerator
@@ -63,6 +64,19 @@ def parse_arguments():
         help="Run statistical analysis only, skip ML training"
     )
     
+    parser.add_argument(
+        "--cv",
+        type=int,
+        default=0,
+        help="Cross-validate with this many parallel folds instead of a single fit"
+    )
+    
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="Tune hyperparameters with the search settings from the config"
+    )
+    
     parser.add_argument(
         "--config",
         type=str,
@@ -119,7 +133,16 @@ async def run_analysis(args):
                 test_size=0.2
             )
             
-            pipeline.fit(train_data, target=args.target)
+            if args.search:
+                search = HyperparameterSearch(model_type=args.model, config=config)
+                pipeline = search.fit(train_data, target=args.target).best_pipeline_
+                logger.info(f"Best search score: {search.best_score_:.4f} with {search.best_params_}")
+            elif args.cv > 1:
+                # The fold models form the final model; no extra full refit
+                cv_results = pipeline.cross_validate(train_data, target=args.target, cv=args.cv)
+                logger.info(f"Cross-validation score: {cv_results['mean']:.4f} (+/- {cv_results['std']:.4f})")
+            else:
+                pipeline.fit(train_data, target=args.target)
             logger.info("Model training complete")
             
             # Make predictions
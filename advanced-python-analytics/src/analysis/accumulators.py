@@ -0,0 +1,473 @@
+"""
+Streaming statistics module.
+Provides mergeable accumulators for descriptive statistics over batches.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence
+import pandas as pd
+import numpy as np
+
+from src.core.exceptions import DataValidationError
+
+
+# Spread relative to the mean below which a column is constant up to rounding;
+# skewness and kurtosis treat such columns as constant, as pandas does
+_CONSTANT_TOLERANCE = 64 * np.finfo(np.float64).eps
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch for one column (a merging t-digest).
+    
+    Values are kept exactly until more than ``buffer_size`` points have been
+    seen; after that they are compressed into weighted centroids whose size
+    shrinks towards the tails, so extreme quantiles stay accurate.
+    """
+    
+    def __init__(self, compression: int = 200, buffer_size: Optional[int] = None):
+        """
+        Initialize quantile sketch.
+        
+        Args:
+            compression: Approximate number of centroids kept after compression
+            buffer_size: Points held before compressing (default 5 x compression)
+        """
+        self.compression = compression
+        self.buffer_size = buffer_size or 5 * compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0.0
+        self.min = np.nan
+        self.max = np.nan
+    
+    def update(
+        self,
+        values: np.ndarray,
+        weights: Optional[np.ndarray] = None
+    ) -> "QuantileSketch":
+        """
+        Add values to the sketch (NaN values are ignored).
+        
+        Args:
+            values: 1-D array of values
+            weights: Optional positive weight of each value (default 1)
+        
+        Returns:
+            Self for method chaining
+        """
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+        values, weights = values[valid], weights[valid]
+        
+        if len(values) == 0:
+            return self
+        
+        return self._absorb(values, weights, values.min(), values.max())
+    
+    def decay(self, factor: float) -> "QuantileSketch":
+        """
+        Scale down the weight of everything seen so far.
+        
+        Used for exponentially weighted quantiles over a stream, where older
+        values should count less than recent ones.
+        
+        Args:
+            factor: Multiplier in (0, 1]
+        
+        Returns:
+            Self for method chaining
+        """
+        self.weights = self.weights * factor
+        self.count *= factor
+        return self
+    
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Merge another sketch into this one.
+        
+        Args:
+            other: Sketch to merge
+        
+        Returns:
+            Self for method chaining
+        """
+        if other.count == 0:
+            return self
+        
+        return self._absorb(other.means, other.weights, other.min, other.max)
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+        
+        Exact (linear interpolation, as ``pd.Series.quantile``) while the
+        sketch is uncompressed.
+        
+        Args:
+            q: Quantile in [0, 1]
+        
+        Returns:
+            Estimated quantile value (NaN if the sketch is empty)
+        """
+        if self.count == 0:
+            return np.nan
+        
+        order = np.argsort(self.means, kind='stable')
+        means = self.means[order]
+        weights = self.weights[order]
+        
+        if np.all(weights == 1.0):
+            return float(np.quantile(means, q))
+        
+        # Interpolate between centroid centers, anchored at the exact extremes
+        centers = np.cumsum(weights) - weights / 2.0
+        positions = np.concatenate([[0.0], centers, [self.count]])
+        values = np.concatenate([[self.min], means, [self.max]])
+        return float(np.interp(q * self.count, positions, values))
+    
+    def _absorb(
+        self,
+        means: np.ndarray,
+        weights: np.ndarray,
+        min_value: float,
+        max_value: float
+    ) -> "QuantileSketch":
+        """Append weighted points and compress when the buffer is full."""
+        self.means = np.concatenate([self.means, means])
+        self.weights = np.concatenate([self.weights, weights])
+        self.count += float(weights.sum())
+        self.min = np.fmin(self.min, min_value)
+        self.max = np.fmax(self.max, max_value)
+        
+        if len(self.means) > self.buffer_size:
+            self._compress()
+        
+        return self
+    
+    def _compress(self) -> None:
+        """Merge neighbouring points into centroids using the t-digest k1 scale."""
+        order = np.argsort(self.means, kind='stable')
+        means = self.means[order]
+        weights = self.weights[order]
+        
+        cumulative = np.cumsum(weights)
+        q_mid = (cumulative - weights / 2.0) / self.count
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+        bins = np.floor(k)
+        
+        starts = np.flatnonzero(np.concatenate([[True], bins[1:] != bins[:-1]]))
+        merged_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+
+class MomentAccumulator:
+    """
+    Mergeable count, mean and central moment sums (M2, M3, M4) per column.
+    
+    Batches are combined with the Welford/Chan/Pebay pairwise update
+    formulas; NaN values are ignored.
+    """
+    
+    def __init__(self, n_columns: int):
+        """
+        Initialize moment accumulator.
+        
+        Args:
+            n_columns: Number of columns tracked
+        """
+        self.n = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.M2 = np.zeros(n_columns)
+        self.M3 = np.zeros(n_columns)
+        self.M4 = np.zeros(n_columns)
+    
+    def update(self, X: np.ndarray) -> "MomentAccumulator":
+        """
+        Add a batch of rows.
+        
+        Args:
+            X: 2-D float array (rows x columns), NaN for missing values
+        
+        Returns:
+            Self for method chaining
+        """
+        valid = ~np.isnan(X)
+        n = valid.sum(axis=0).astype(np.float64)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, np.where(valid, X, 0.0).sum(axis=0) / n, 0.0)
+            deviation = np.where(valid, X - mean, 0.0)
+            squared = deviation * deviation
+            M2 = squared.sum(axis=0)
+            M3 = (squared * deviation).sum(axis=0)
+            M4 = (squared * squared).sum(axis=0)
+        
+        self._combine(n, mean, M2, M3, M4)
+        return self
+    
+    def merge(self, other: "MomentAccumulator") -> "MomentAccumulator":
+        """
+        Merge another accumulator into this one.
+        
+        Args:
+            other: Accumulator over the same columns
+        
+        Returns:
+            Self for method chaining
+        """
+        self._combine(other.n, other.mean, other.M2, other.M3, other.M4)
+        return self
+    
+    @classmethod
+    def concat(cls, accumulators: Sequence["MomentAccumulator"]) -> "MomentAccumulator":
+        """
+        Place accumulators over different columns side by side.
+        
+        Args:
+            accumulators: Accumulators in output column order
+        
+        Returns:
+            New accumulator over all their columns
+        """
+        combined = cls(0)
+        if accumulators:
+            combined.n = np.concatenate([acc.n for acc in accumulators])
+            combined.mean = np.concatenate([acc.mean for acc in accumulators])
+            combined.M2 = np.concatenate([acc.M2 for acc in accumulators])
+            combined.M3 = np.concatenate([acc.M3 for acc in accumulators])
+            combined.M4 = np.concatenate([acc.M4 for acc in accumulators])
+        return combined
+    
+    def select(self, idx: Sequence[int]) -> "MomentAccumulator":
+        """
+        Extract the moments of a subset of columns.
+        
+        Args:
+            idx: Column positions to keep
+        
+        Returns:
+            New accumulator over the selected columns
+        """
+        idx = np.asarray(idx, dtype=np.int64)
+        subset = MomentAccumulator(len(idx))
+        subset.n, subset.mean = self.n[idx], self.mean[idx]
+        subset.M2, subset.M3, subset.M4 = self.M2[idx], self.M3[idx], self.M4[idx]
+        return subset
+    
+    def is_constant(self) -> np.ndarray:
+        """
+        Flag columns whose values are all equal up to floating-point noise.
+        
+        The tolerance scales with the column mean, so columns of tiny
+        values keep their spread; only rounding noise left by the moment
+        updates on constant columns is ignored.
+        
+        Returns:
+            Boolean array, True for constant (or empty) columns
+        """
+        return self.M2 <= self.n * (_CONSTANT_TOLERANCE * self.mean) ** 2
+    
+    def biased_skewness(self) -> np.ndarray:
+        """Population skewness g1 = m3 / m2^1.5 (0 for constant columns)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            g1 = np.sqrt(self.n) * self.M3 / self.M2 ** 1.5
+        return np.where(self.is_constant(), 0.0, g1)
+    
+    def biased_kurtosis(self) -> np.ndarray:
+        """Population (non-excess) kurtosis b2 = m4 / m2^2 (3 for constant columns)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            b2 = self.n * self.M4 / self.M2 ** 2
+        return np.where(self.is_constant(), 3.0, b2)
+    
+    def std(self) -> np.ndarray:
+        """Sample standard deviation (ddof=1), NaN below two values."""
+        n = self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(n > 1, np.sqrt(self.M2 / (n - 1)), np.nan)
+    
+    def sample_skewness(self) -> np.ndarray:
+        """Bias-corrected sample skewness, as in ``DataFrame.skew``."""
+        n = self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            skew = np.sqrt(n * (n - 1)) / (n - 2) * (self.M3 / n) / (self.M2 / n) ** 1.5
+        skew = np.where(self.is_constant(), 0.0, skew)
+        return np.where(n < 3, np.nan, skew)
+    
+    def excess_kurtosis(self) -> np.ndarray:
+        """Bias-corrected excess kurtosis, as in ``DataFrame.kurtosis``."""
+        n = self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            kurt = (
+                n * (n + 1) * (n - 1) * self.M4 / ((n - 2) * (n - 3) * self.M2 ** 2)
+                - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            )
+        kurt = np.where(self.is_constant(), 0.0, kurt)
+        return np.where(n < 4, np.nan, kurt)
+    
+    def _combine(
+        self,
+        n_b: np.ndarray,
+        mean_b: np.ndarray,
+        M2_b: np.ndarray,
+        M3_b: np.ndarray,
+        M4_b: np.ndarray
+    ) -> None:
+        """Combine moments of another partition into the running state."""
+        n_a, mean_a, M2_a, M3_a, M4_a = self.n, self.mean, self.M2, self.M3, self.M4
+        n = n_a + n_b
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean_b - mean_a
+            delta_n = np.where(n > 0, delta / n, 0.0)
+            
+            mean = mean_a + delta_n * n_b
+            M2 = M2_a + M2_b + delta * delta_n * n_a * n_b
+            M3 = (
+                M3_a + M3_b
+                + delta * delta_n ** 2 * n_a * n_b * (n_a - n_b)
+                + 3 * delta_n * (n_a * M2_b - n_b * M2_a)
+            )
+            M4 = (
+                M4_a + M4_b
+                + delta * delta_n ** 3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b)
+                + 6 * delta_n ** 2 * (n_a * n_a * M2_b + n_b * n_b * M2_a)
+                + 4 * delta_n * (n_a * M3_b - n_b * M3_a)
+            )
+        
+        self.n, self.mean, self.M2, self.M3, self.M4 = n, mean, M2, M3, M4
+
+
+class StatisticsAccumulator:
+    """
+    Mergeable accumulator for descriptive statistics.
+    
+    Moments are combined with the Welford/Chan/Pebay update formulas, so
+    batches can be fed one at a time or accumulated in separate processes
+    and merged. ``finalize`` returns the same structure as
+    ``StatisticalAnalyzer._descriptive_stats``.
+    """
+    
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        compression: int = 200
+    ):
+        """
+        Initialize accumulator.
+        
+        Args:
+            columns: Columns to track (if None, numeric columns of the first batch)
+            compression: Quantile sketch compression (higher is more accurate)
+        """
+        self.compression = compression
+        self.columns: Optional[List[str]] = None
+        if columns is not None:
+            self._initialize(list(columns))
+    
+    def update(self, batch: pd.DataFrame) -> "StatisticsAccumulator":
+        """
+        Add a batch of rows.
+        
+        Args:
+            batch: DataFrame containing the tracked columns
+        
+        Returns:
+            Self for method chaining
+        """
+        if self.columns is None:
+            self._initialize(batch.select_dtypes(include=[np.number]).columns.tolist())
+        
+        missing = [col for col in self.columns if col not in batch.columns]
+        if missing:
+            raise DataValidationError(f"Batch is missing tracked columns: {missing}")
+        
+        X = batch[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.moments.update(X)
+        
+        valid = ~np.isnan(X)
+        for j, sketch in enumerate(self._sketches):
+            sketch.update(X[valid[:, j], j])
+        
+        return self
+    
+    def merge(self, other: "StatisticsAccumulator") -> "StatisticsAccumulator":
+        """
+        Merge another accumulator into this one.
+        
+        Args:
+            other: Accumulator built over a different partition of the data
+        
+        Returns:
+            Self for method chaining
+        """
+        if other.columns is None:
+            return self
+        
+        if self.columns is None:
+            self._initialize(list(other.columns))
+        
+        if other.columns != self.columns:
+            raise DataValidationError("Cannot merge accumulators tracking different columns")
+        
+        self.moments.merge(other.moments)
+        
+        for sketch, other_sketch in zip(self._sketches, other._sketches):
+            sketch.merge(other_sketch)
+        
+        return self
+    
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Compute descriptive statistics from the accumulated state.
+        
+        Returns:
+            Dictionary of per-column mean, median, std, min, max, skewness
+            and kurtosis, matching ``StatisticalAnalyzer._descriptive_stats``
+        """
+        if self.columns is None:
+            keys = ['mean', 'median', 'std', 'min', 'max', 'skewness', 'kurtosis']
+            return {key: {} for key in keys}
+        
+        moments = self.moments
+        mean = np.where(moments.n > 0, moments.mean, np.nan)
+        
+        median = [sketch.quantile(0.5) for sketch in self._sketches]
+        
+        def as_dict(values: Sequence[float]) -> Dict[str, float]:
+            return {col: float(v) for col, v in zip(self.columns, values)}
+        
+        return {
+            'mean': as_dict(mean),
+            'median': as_dict(median),
+            'std': as_dict(moments.std()),
+            'min': as_dict([sketch.min for sketch in self._sketches]),
+            'max': as_dict([sketch.max for sketch in self._sketches]),
+            'skewness': as_dict(moments.sample_skewness()),
+            'kurtosis': as_dict(moments.excess_kurtosis())
+        }
+    
+    def quantiles(self, qs: Sequence[float] = (0.25, 0.5, 0.75)) -> Dict[str, Dict[float, float]]:
+        """
+        Estimate quantiles for every tracked column.
+        
+        Args:
+            qs: Quantiles in [0, 1]
+        
+        Returns:
+            Dictionary mapping column to {quantile: value}
+        """
+        if self.columns is None:
+            return {}
+        
+        return {
+            col: {q: sketch.quantile(q) for q in qs}
+            for col, sketch in zip(self.columns, self._sketches)
+        }
+    
+    def _initialize(self, columns: List[str]) -> None:
+        """Create empty state for the tracked columns."""
+        self.columns = columns
+        self.moments = MomentAccumulator(len(columns))
+        self._sketches = [QuantileSketch(self.compression) for _ in columns]
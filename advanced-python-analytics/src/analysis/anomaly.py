@@ -3,38 +3,228 @@ Anomaly detection module.
 Implements various anomaly detection algorithms.
 """
 
-from typing import Optional, List
+from typing import Dict, Any, Callable, Optional, List, Sequence, Tuple, Union
+import warnings
 import pandas as pd
 import numpy as np
+import joblib
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.covariance import EllipticEnvelope
 from sklearn.ensemble import IsolationForest
+from sklearn.neighbors import LocalOutlierFactor
+from sklearn.pipeline import Pipeline, make_pipeline
 from sklearn.preprocessing import StandardScaler
-from scipy import stats
 
+from src.core.config import AnomalyConfig
 from src.core.logger import setup_logger
+from src.core.exceptions import (
+    DataValidationError, ModelTrainingError, PredictionError, ConfigurationError
+)
+from src.analysis.accumulators import QuantileSketch
 
 
 logger = setup_logger(__name__)
 
 
+# Rows scored per block, bounding temporaries to a few MB per feature
+ROW_CHUNK = 65536
+
+# Tukey fence multiple for the iqr method
+IQR_MULTIPLIER = 1.5
+
+# Version of the file layout written by AnomalyDetector.save
+FORMAT_VERSION = 1
+
+# Methods scored by a trained model rather than per-feature parameters
+MODEL_METHODS = ('isolation_forest', 'hbos', 'mcd', 'lof')
+
+METHODS = MODEL_METHODS + ('zscore', 'iqr')
+
+# Above this many features KD-tree pruning degrades and a ball tree is used
+KD_TREE_MAX_FEATURES = 15
+
+# Points of the training score distribution kept per ensemble member
+NORMALIZATION_QUANTILES = 1001
+
+# Share of anomalies assumed when contamination is "auto" and a cut-off
+# has to come from a quantile of the training scores
+AUTO_CONTAMINATION = 0.1
+
+
+def _contamination_share(contamination: Union[float, str]) -> float:
+    """
+    Share of anomalies for a contamination setting.
+    
+    Args:
+        contamination: Float in (0, 0.5] or "auto" (``AUTO_CONTAMINATION``)
+    
+    Returns:
+        Share of anomalies
+    """
+    if isinstance(contamination, str) and contamination == "auto":
+        return AUTO_CONTAMINATION
+    valid = isinstance(contamination, (int, float)) and not isinstance(contamination, bool)
+    if not valid or not 0.0 < contamination <= 0.5:
+        raise ConfigurationError(
+            f"Contamination must be 'auto' or a number in (0, 0.5], got {contamination!r}"
+        )
+    return float(contamination)
+
+
+class HistogramOutlierModel:
+    """
+    Histogram-based outlier score (HBOS).
+    
+    Fits one equal-width histogram per feature and scores a row by the sum
+    of ``-log`` of its normalized bin heights, i.e. assuming independent
+    features. Fitting and scoring are linear in the number of rows
+    (O(n * p) to fit, O(n * p * log(bins)) to score) and need no distance
+    computations, which makes HBOS the cheapest multivariate method here.
+    
+    Follows the scikit-learn outlier convention: ``score_samples`` is higher
+    for normal rows and ``offset_`` is the contamination cut-off on the
+    training scores. Missing values add nothing to a row's score; values
+    outside the training range score as an empty bin.
+    """
+    
+    def __init__(self, n_bins: int = 10, alpha: float = 0.1, contamination: Union[float, str] = 0.1):
+        """
+        Initialize HBOS model.
+        
+        Args:
+            n_bins: Histogram bins per feature
+            alpha: Pseudo-count added to every bin, bounding scores of empty bins
+            contamination: Expected share of anomalies, setting ``offset_``
+                ("auto" for ``AUTO_CONTAMINATION``)
+        """
+        self.n_bins = n_bins
+        self.alpha = alpha
+        self.contamination = contamination
+        self.edges_: Optional[List[np.ndarray]] = None
+        self.log_heights_: Optional[List[np.ndarray]] = None
+        self.offset_: Optional[float] = None
+    
+    def fit(self, X: Any) -> "HistogramOutlierModel":
+        """
+        Fit per-feature histograms.
+        
+        Args:
+            X: 2-D array or DataFrame of training rows
+        
+        Returns:
+            Self for method chaining
+        """
+        contamination = _contamination_share(self.contamination)
+        X = np.asarray(X, dtype=np.float64)
+        self.edges_, self.log_heights_ = [], []
+        
+        for j in range(X.shape[1]):
+            values = X[:, j][~np.isnan(X[:, j])]
+            if len(values) == 0:
+                values = np.zeros(1)
+            counts, edges = np.histogram(values, bins=self.n_bins)
+            heights = (counts + self.alpha) / (counts.max() + self.alpha)
+            # Slot 0 and the last slot hold values outside the training range
+            empty = np.log(self.alpha / (counts.max() + self.alpha))
+            self.edges_.append(edges)
+            self.log_heights_.append(np.concatenate([[empty], np.log(heights), [empty]]))
+        
+        self.offset_ = float(np.percentile(self.score_samples(X), 100.0 * contamination))
+        return self
+    
+    def score_samples(self, X: Any) -> np.ndarray:
+        """
+        Negative HBOS score of each row (lower is more anomalous).
+        
+        Args:
+            X: 2-D array or DataFrame with the training feature order
+        
+        Returns:
+            Array of scores
+        """
+        X = np.asarray(X, dtype=np.float64)
+        scores = np.zeros(len(X))
+        
+        for j, (edges, log_heights) in enumerate(zip(self.edges_, self.log_heights_)):
+            column = X[:, j]
+            slots = np.searchsorted(edges, column, side='right')
+            # The last edge closes the last bin, as in np.histogram
+            slots[column == edges[-1]] = len(edges) - 1
+            scores += np.where(np.isnan(column), 0.0, log_heights[slots])
+        
+        return scores
+
+
 class AnomalyDetector:
-    """Detects anomalies in data using multiple methods."""
+    """
+    Detects anomalies in data using multiple methods.
+    
+    ``fit`` stores everything scoring needs: the feature order and either
+    per-feature parameters (mean/std for zscore, quartiles for iqr) or the
+    trained model. A fitted detector scores new data against that state and
+    never refits; ``save`` and ``load`` move it between processes. An
+    unfitted zscore/iqr detector scores each call against its own data.
+    
+    Cost for n training rows, m scored rows and p features:
+    
+    - ``zscore``, ``iqr``: fit O(n * p) (iqr sorts, O(n log n * p));
+      score O(m * p).
+    - ``hbos``: per-feature histograms; fit O(n * p), score
+      O(m * p * log(bins)). Assumes independent features.
+    - ``isolation_forest``: fit O(t * s log s) for t trees of s samples;
+      score O(m * t * log s).
+    - ``mcd``: Minimum Covariance Determinant (FastMCD) robust covariance;
+      fit O(n * p^2 + p^3) per concentration step on subsets; score is a
+      Mahalanobis distance, O(m * p^2). Suits elliptical data, p << n.
+    - ``lof``: Local Outlier Factor on standardized features. ``fit``
+      builds a KD-tree (a ball tree above ``KD_TREE_MAX_FEATURES``
+      features) once in O(n log n * p); scoring reuses it for k-neighbor
+      queries, about O(m * k * log n) in low dimensions and degrading
+      towards O(m * n) as p grows. Training rows scored again count
+      themselves as a neighbor, so slightly fewer than ``contamination``
+      of them are flagged.
+    
+    ``examples/anomaly_benchmark.py`` times every method on synthetic data.
+    """
     
     def __init__(
         self,
         method: str = "isolation_forest",
-        threshold: float = 2.5
+        threshold: float = 2.5,
+        config: Optional[Any] = None
     ):
         """
         Initialize anomaly detector.
         
         Args:
-            method: Detection method (isolation_forest, zscore, iqr)
-            threshold: Threshold for anomaly detection
+            method: Detection method (isolation_forest, hbos, mcd, lof, zscore, iqr)
+            threshold: Threshold for anomaly detection (zscore, iqr)
+            config: Configuration object; its ``anomaly`` settings control
+                model training and chunked scoring
         """
         self.method = method
         self.threshold = threshold
         self.scaler = StandardScaler()
         self.model = None
+        self.features: Optional[List[str]] = None
+        self.parameters: Optional[Dict[str, np.ndarray]] = None
+        
+        anomaly_config = config.anomaly if config and hasattr(config, 'anomaly') else AnomalyConfig()
+        self.contamination = anomaly_config.contamination
+        self.n_estimators = anomaly_config.n_estimators
+        self.max_samples = anomaly_config.max_samples
+        self.n_jobs = anomaly_config.n_jobs
+        self.random_state = anomaly_config.random_state
+        self.chunk_size = anomaly_config.chunk_size
+        self.n_bins = anomaly_config.n_bins
+        self.n_neighbors = anomaly_config.n_neighbors
+        self.neighbor_algorithm = anomaly_config.neighbor_algorithm
+        self.support_fraction = anomaly_config.support_fraction
+    
+    @property
+    def is_fitted(self) -> bool:
+        """Whether the detector holds fitted state."""
+        return self.features is not None
     
     def fit(self, data: pd.DataFrame, features: Optional[List[str]] = None) -> "AnomalyDetector":
         """
@@ -43,24 +233,27 @@ class AnomalyDetector:
         Args:
             data: Training data
             features: List of features to use (if None, use all numeric)
-            
+        
         Returns:
             Self for method chaining
         """
         if features is None:
             features = data.select_dtypes(include=[np.number]).columns.tolist()
         
-        X = data[features]
+        if self.method in MODEL_METHODS:
+            self.model = self._build_model(len(features))
+            self.model.fit(data[features])
+            logger.info(f"{self.method} model fitted on {len(features)} features")
         
-        if self.method == "isolation_forest":
-            self.model = IsolationForest(
-                contamination=0.1,
-                random_state=42,
-                n_estimators=100
-            )
-            self.model.fit(X)
-            logger.info("Isolation Forest model fitted")
+        elif self.method in ("zscore", "iqr"):
+            X = data[features].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.parameters = self._feature_statistics(X)
+            logger.info(f"Fitted {self.method} parameters for {len(features)} features")
         
+        else:
+            raise ValueError(f"Unknown detection method: {self.method}")
+        
+        self.features = list(features)
         return self
     
     def detect(
@@ -73,67 +266,444 @@ class AnomalyDetector:
         
         Args:
             data: Data to analyze
-            features: List of features to use
-            
+            features: List of features to use (ignored once fitted)
+        
         Returns:
             DataFrame containing only anomalous records
         """
-        if features is None:
-            features = data.select_dtypes(include=[np.number]).columns.tolist()
+        anomalies = data[self.detect_details(data, features)['is_anomaly']]
         
-        X = data[features]
+        logger.info(f"Detected {len(anomalies)} anomalies using {self.method}")
+        return anomalies
+    
+    def detect_details(
+        self,
+        data: pd.DataFrame,
+        features: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Score every record and report which features made it anomalous.
+        
+        Args:
+            data: Data to analyze
+            features: List of features to use (ignored once fitted)
         
+        Returns:
+            Dictionary with 'is_anomaly' (boolean array per row), 'scores'
+            (float array per row; larger is more anomalous) and
+            'offending_features' (boolean DataFrame of the anomalous rows
+            by feature, True where the feature is out of range; all False
+            for the model-based methods, which do not flag features individually)
+        """
+        if self.method not in METHODS:
+            raise ValueError(f"Unknown detection method: {self.method}")
+        
+        if not self.is_fitted and self.method in MODEL_METHODS:
+            logger.warning(f"{self.method} model is not fitted; fitting on the data being scored")
+            self.fit(data, features)
+        
+        features = self._scoring_features(data, features)
+        
+        if self.method in MODEL_METHODS:
+            # One pass: predict() is score_samples compared with the fitted offset
+            raw = -self._chunked_scores(data, features)
+            is_anomaly = raw < self._estimator().offset_
+            return {
+                'is_anomaly': is_anomaly,
+                'scores': -raw,
+                'offending_features': pd.DataFrame(
+                    False, index=data.index[is_anomaly], columns=features
+                )
+            }
+        
+        X = data[features].to_numpy(dtype=np.float64, na_value=np.nan)
+        parameters = self.parameters if self.is_fitted else self._feature_statistics(X)
+        is_anomaly, scores, offending = self._score_features(X, parameters)
+        
+        return {
+            'is_anomaly': is_anomaly,
+            'scores': scores,
+            'offending_features': pd.DataFrame(
+                offending, index=data.index[is_anomaly], columns=features
+            )
+        }
+    
+    def save(self, path: str) -> None:
+        """
+        Save the fitted detector to disk.
+        
+        Args:
+            path: File path to save the detector
+        """
+        if not self.is_fitted:
+            raise ModelTrainingError("No fitted anomaly detector to save")
+        
+        joblib.dump({
+            'format_version': FORMAT_VERSION,
+            'method': self.method,
+            'threshold': self.threshold,
+            'features': self.features,
+            'parameters': self.parameters,
+            'model': self.model,
+            'chunk_size': self.chunk_size,
+            'n_jobs': self.n_jobs
+        }, path, compress=3)
+        
+        logger.info(f"Anomaly detector saved to: {path}")
+    
+    @classmethod
+    def load(cls, path: str) -> "AnomalyDetector":
+        """
+        Load a fitted detector from disk.
+        
+        Args:
+            path: Path to a file written by ``save``
+        
+        Returns:
+            Fitted AnomalyDetector
+        """
+        state = joblib.load(path)
+        
+        if state.get('format_version') != FORMAT_VERSION:
+            raise ConfigurationError(
+                f"Unsupported anomaly detector format: {state.get('format_version')}"
+            )
+        
+        detector = cls(method=state['method'], threshold=state['threshold'])
+        detector.features = state['features']
+        detector.parameters = state['parameters']
+        detector.model = state['model']
+        detector.chunk_size = state.get('chunk_size', detector.chunk_size)
+        detector.n_jobs = state.get('n_jobs', detector.n_jobs)
+        
+        logger.info(f"Anomaly detector loaded from: {path}")
+        return detector
+    
+    def _build_model(self, n_features: int) -> Any:
+        """Unfitted model for a model-based method."""
         if self.method == "isolation_forest":
-            if self.model is None:
-                self.fit(data, features)
-            predictions = self.model.predict(X)
-            anomalies = data[predictions == -1]
+            # Trees are built in parallel; max_samples bounds the rows each tree sees
+            return IsolationForest(
+                contamination=self.contamination,
+                random_state=self.random_state,
+                n_estimators=self.n_estimators,
+                max_samples=self.max_samples,
+                n_jobs=self.n_jobs
+            )
+        
+        if self.method == "hbos":
+            return HistogramOutlierModel(n_bins=self.n_bins, contamination=self.contamination)
+        
+        if self.method == "mcd":
+            return EllipticEnvelope(
+                contamination=self.contamination,
+                support_fraction=self.support_fraction,
+                random_state=self.random_state
+            )
+        
+        algorithm = self.neighbor_algorithm
+        if algorithm == "auto":
+            algorithm = "kd_tree" if n_features <= KD_TREE_MAX_FEATURES else "ball_tree"
+        
+        # novelty=True keeps the neighbor index for scoring new rows; distances
+        # need comparable feature scales
+        return make_pipeline(
+            StandardScaler(),
+            LocalOutlierFactor(
+                n_neighbors=self.n_neighbors,
+                algorithm=algorithm,
+                contamination=self.contamination,
+                novelty=True,
+                n_jobs=self.n_jobs
+            )
+        )
+    
+    def _estimator(self) -> Any:
+        """Fitted outlier estimator, unwrapped from its preprocessing pipeline."""
+        return self.model[-1] if isinstance(self.model, Pipeline) else self.model
+    
+    def _scoring_features(
+        self,
+        data: pd.DataFrame,
+        features: Optional[List[str]]
+    ) -> List[str]:
+        """Features to score: the fitted ones, or the requested/numeric ones."""
+        if not self.is_fitted:
+            if features is None:
+                features = data.select_dtypes(include=[np.number]).columns.tolist()
+            return features
+        
+        if features is not None and list(features) != self.features:
+            logger.warning("Ignoring features argument; using the features the detector was fitted on")
+        
+        missing = [col for col in self.features if col not in data.columns]
+        if missing:
+            raise PredictionError(f"Data is missing fitted features: {missing}")
+        
+        return self.features
+    
+    def _feature_statistics(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """NaN-aware per-feature parameters of the zscore or iqr method."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
             
-        elif self.method == "zscore":
-            anomalies = self._zscore_detection(data, features)
+            if self.method == "zscore":
+                mean = np.nanmean(X, axis=0)
+                # Missing values count as the mean (zero deviation) but still
+                # count towards n, as when filling them with the mean first
+                squares = np.zeros(X.shape[1])
+                for start in range(0, len(X), ROW_CHUNK):
+                    deviation = X[start:start + ROW_CHUNK] - mean
+                    squares += np.nansum(deviation * deviation, axis=0)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    std = np.sqrt(squares / len(X))
+                return {'mean': mean, 'std': std}
             
-        elif self.method == "iqr":
-            anomalies = self._iqr_detection(data, features)
+            q1, q3 = np.nanquantile(X, [0.25, 0.75], axis=0)
+            return {'q1': q1, 'q3': q3}
+    
+    def _score_features(
+        self,
+        X: np.ndarray,
+        parameters: Dict[str, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score rows against per-feature parameters, one row chunk at a time.
+        
+        Returns:
+            Tuple of (anomaly mask, row scores, feature flags of the anomalous rows)
+        """
+        n_rows = len(X)
+        is_anomaly = np.zeros(n_rows, dtype=bool)
+        scores = np.zeros(n_rows)
+        offending = []
+        
+        if self.method == "iqr":
+            q1, q3 = parameters['q1'], parameters['q3']
+            iqr = q3 - q1
+            lower, upper = q1 - IQR_MULTIPLIER * iqr, q3 + IQR_MULTIPLIER * iqr
         
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for start in range(0, n_rows, ROW_CHUNK):
+                chunk = X[start:start + ROW_CHUNK]
+                
+                if self.method == "zscore":
+                    distance = np.abs(chunk - parameters['mean']) / parameters['std']
+                    flags = distance > self.threshold
+                else:
+                    # Distance outside the box in IQR units; the fences are at 1.5
+                    distance = np.maximum(q1 - chunk, chunk - q3) / iqr
+                    flags = (chunk < lower) | (chunk > upper)
+                
+                # Missing values and constant features never score
+                distance = np.where(np.isfinite(distance), np.maximum(distance, 0.0), 0.0)
+                if chunk.shape[1]:
+                    scores[start:start + len(chunk)] = distance.max(axis=1)
+                
+                rows = flags.any(axis=1)
+                is_anomaly[start:start + len(chunk)] = rows
+                offending.append(flags[rows])
+        
+        if offending:
+            offending = np.concatenate(offending)
         else:
+            offending = np.zeros((0, X.shape[1]), dtype=bool)
+        
+        return is_anomaly, scores, offending
+    
+    def get_anomaly_scores(
+        self,
+        data: pd.DataFrame,
+        features: Optional[List[str]] = None
+    ) -> np.ndarray:
+        """
+        Get anomaly scores for all records.
+        
+        Args:
+            data: Data to score
+            features: List of features to use (ignored once fitted)
+        
+        Returns:
+            Array of anomaly scores
+        """
+        if self.method not in METHODS:
             raise ValueError(f"Unknown detection method: {self.method}")
         
-        logger.info(f"Detected {len(anomalies)} anomalies using {self.method}")
-        return anomalies
+        if not self.is_fitted:
+            if self.method not in MODEL_METHODS:
+                # Parameters come from the data itself, so it is scored whole
+                return self.detect_details(data, features)['scores']
+            logger.warning(f"{self.method} model is not fitted; fitting on the data being scored")
+            self.fit(data, features)
+        
+        return self._chunked_scores(data, self._scoring_features(data, features))
+    
+    def _chunked_scores(self, data: pd.DataFrame, features: List[str]) -> np.ndarray:
+        """
+        Score with the fitted state in row blocks of ``chunk_size``, in parallel.
+        
+        Each block copies only its own rows of the feature columns, so memory
+        stays at a few blocks instead of a full copy of ``data[features]``.
+        Tree traversal, neighbor queries and NumPy release the GIL, so blocks
+        run on threads.
+        Larger scores are more anomalous.
+        """
+        positions = data.columns.get_indexer(features)
+        n_rows = len(data)
+        blocks = [
+            (start, min(start + self.chunk_size, n_rows))
+            for start in range(0, n_rows, self.chunk_size)
+        ]
+        
+        def score(start: int, stop: int) -> np.ndarray:
+            block = data.iloc[start:stop, positions]
+            if self.method in MODEL_METHODS:
+                return -self.model.score_samples(block)
+            X = block.to_numpy(dtype=np.float64, na_value=np.nan)
+            return self._score_features(X, self.parameters)[1]
+        
+        if len(blocks) > 1 and effective_n_jobs(self.n_jobs) > 1:
+            outputs = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                delayed(score)(start, stop) for start, stop in blocks
+            )
+        else:
+            outputs = [score(start, stop) for start, stop in blocks]
+        
+        return np.concatenate(outputs) if outputs else np.zeros(0)
+
+
+class EnsembleAnomalyDetector:
+    """
+    Combines several anomaly detection methods into one score.
+    
+    The feature matrix is extracted from the input once and shared by every
+    member detector; members fit and score concurrently on threads. Each
+    member's raw scores are mapped to a common [0, 1] scale by their
+    percentile among that member's training scores (kept as a quantile grid
+    of ``NORMALIZATION_QUANTILES`` points), then combined by their mean
+    (``rank``) or maximum (``max``). Rows whose combined score exceeds the
+    ``1 - contamination`` quantile of the training scores are anomalous.
+    """
+    
+    def __init__(
+        self,
+        methods: Sequence[str] = ("isolation_forest", "hbos", "zscore"),
+        combine: str = "rank",
+        threshold: float = 2.5,
+        n_jobs: int = -1,
+        config: Optional[Any] = None
+    ):
+        """
+        Initialize ensemble anomaly detector.
+        
+        Args:
+            methods: Member detection methods
+            combine: How normalized scores are combined (rank, max)
+            threshold: Threshold passed to the zscore and iqr members
+            n_jobs: Members fitted and scored concurrently (-1 for all)
+            config: Configuration object passed to the members; its
+                ``anomaly.contamination`` sets the ensemble cut-off
+        """
+        unknown = [method for method in methods if method not in METHODS]
+        if unknown:
+            raise ValueError(f"Unknown detection methods: {unknown}")
+        if combine not in ("rank", "max"):
+            raise ValueError(f"Unknown combination method: {combine}")
+        
+        self.methods = list(methods)
+        self.combine = combine
+        self.n_jobs = n_jobs
+        
+        anomaly_config = config.anomaly if config and hasattr(config, 'anomaly') else AnomalyConfig()
+        self.contamination = anomaly_config.contamination
+        
+        self.detectors = {
+            method: AnomalyDetector(method=method, threshold=threshold, config=config)
+            for method in self.methods
+        }
+        self.features: Optional[List[str]] = None
+        self.quantiles: Dict[str, np.ndarray] = {}
+        self.offset_: Optional[float] = None
+    
+    @property
+    def is_fitted(self) -> bool:
+        """Whether the ensemble holds fitted state."""
+        return self.features is not None
+    
+    def fit(self, data: pd.DataFrame, features: Optional[List[str]] = None) -> "EnsembleAnomalyDetector":
+        """
+        Fit every member and the score normalization on training data.
+        
+        Args:
+            data: Training data
+            features: List of features to use (if None, use all numeric)
+        
+        Returns:
+            Self for method chaining
+        """
+        features, frame = self._matrix(data, features)
+        
+        raw = self._run(lambda detector: detector.fit(frame, features).get_anomaly_scores(frame))
+        grid = np.linspace(0.0, 1.0, NORMALIZATION_QUANTILES)
+        self.quantiles = {method: np.quantile(raw[method], grid) for method in self.methods}
+        
+        self.features = features
+        combined = self._combine(self._normalize(raw))
+        self.offset_ = float(np.quantile(combined, 1.0 - _contamination_share(self.contamination)))
+        
+        logger.info(f"Anomaly ensemble fitted with methods: {self.methods}")
+        return self
     
-    def _zscore_detection(
+    def detect(
         self,
         data: pd.DataFrame,
-        features: List[str]
+        features: Optional[List[str]] = None
     ) -> pd.DataFrame:
-        """Detect anomalies using Z-score method."""
-        anomaly_mask = pd.Series([False] * len(data), index=data.index)
+        """
+        Detect anomalies in data.
+        
+        Args:
+            data: Data to analyze
+            features: List of features to use (ignored once fitted)
         
-        for feature in features:
-            z_scores = np.abs(stats.zscore(data[feature].fillna(data[feature].mean())))
-            anomaly_mask |= (z_scores > self.threshold)
+        Returns:
+            DataFrame containing only anomalous records
+        """
+        anomalies = data[self.detect_details(data, features)['is_anomaly']]
         
-        return data[anomaly_mask]
+        logger.info(f"Detected {len(anomalies)} anomalies using ensemble of {self.methods}")
+        return anomalies
     
-    def _iqr_detection(
+    def detect_details(
         self,
         data: pd.DataFrame,
-        features: List[str]
-    ) -> pd.DataFrame:
-        """Detect anomalies using Interquartile Range method."""
-        anomaly_mask = pd.Series([False] * len(data), index=data.index)
+        features: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Score every record with the ensemble.
         
-        for feature in features:
-            Q1 = data[feature].quantile(0.25)
-            Q3 = data[feature].quantile(0.75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            anomaly_mask |= (data[feature] < lower_bound) | (data[feature] > upper_bound)
+        Args:
+            data: Data to analyze
+            features: List of features to use (ignored once fitted)
         
-        return data[anomaly_mask]
+        Returns:
+            Dictionary with 'is_anomaly' (boolean array per row), 'scores'
+            (combined score in [0, 1] per row; larger is more anomalous) and
+            'contributions' (DataFrame of each method's normalized score)
+        """
+        if not self.is_fitted:
+            logger.warning("Anomaly ensemble is not fitted; fitting on the data being scored")
+            self.fit(data, features)
+        
+        features, frame = self._matrix(data, features)
+        normalized = self._normalize(self._run(lambda detector: detector.get_anomaly_scores(frame)))
+        scores = self._combine(normalized)
+        
+        return {
+            'is_anomaly': scores > self.offset_,
+            'scores': scores,
+            'contributions': pd.DataFrame(normalized, index=data.index, columns=self.methods)
+        }
     
     def get_anomaly_scores(
         self,
@@ -141,25 +711,241 @@ class AnomalyDetector:
         features: Optional[List[str]] = None
     ) -> np.ndarray:
         """
-        Get anomaly scores for all records.
+        Get combined anomaly scores for all records.
         
         Args:
             data: Data to score
-            features: List of features to use
-            
+            features: List of features to use (ignored once fitted)
+        
         Returns:
-            Array of anomaly scores
+            Array of combined scores in [0, 1]
         """
-        if self.method != "isolation_forest":
-            raise NotImplementedError("Anomaly scores only available for isolation_forest")
-        
-        if features is None:
+        return self.detect_details(data, features)['scores']
+    
+    def _matrix(
+        self,
+        data: pd.DataFrame,
+        features: Optional[List[str]]
+    ) -> Tuple[List[str], pd.DataFrame]:
+        """Features and a single float block of them shared by all members."""
+        if self.is_fitted:
+            features = self.features
+            missing = [col for col in features if col not in data.columns]
+            if missing:
+                raise PredictionError(f"Data is missing fitted features: {missing}")
+        elif features is None:
             features = data.select_dtypes(include=[np.number]).columns.tolist()
         
-        if self.model is None:
-            self.fit(data, features)
+        X = data[features].to_numpy(dtype=np.float64, na_value=np.nan)
+        return list(features), pd.DataFrame(X, index=data.index, columns=features, copy=False)
+    
+    def _run(self, task: Callable[[AnomalyDetector], np.ndarray]) -> Dict[str, np.ndarray]:
+        """Apply a task to every member concurrently."""
+        if len(self.methods) > 1 and effective_n_jobs(self.n_jobs) > 1:
+            outputs = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                delayed(task)(self.detectors[method]) for method in self.methods
+            )
+        else:
+            outputs = [task(self.detectors[method]) for method in self.methods]
+        
+        return dict(zip(self.methods, outputs))
+    
+    def _normalize(self, raw: Dict[str, np.ndarray]) -> np.ndarray:
+        """Percentile of each raw score among its member's training scores (rows x methods)."""
+        columns = []
+        
+        for method in self.methods:
+            quantiles = self.quantiles[method]
+            # Ties (e.g. many zero z-scores) take the middle of their percentile range
+            below = np.searchsorted(quantiles, raw[method], side='left')
+            at_or_below = np.searchsorted(quantiles, raw[method], side='right')
+            columns.append((below + at_or_below) / (2.0 * len(quantiles)))
+        
+        return np.column_stack(columns)
+    
+    def _combine(self, normalized: np.ndarray) -> np.ndarray:
+        """Combine normalized member scores into one score per row."""
+        if self.combine == "max":
+            return normalized.max(axis=1)
+        return normalized.mean(axis=1)
+
+
+class StreamingAnomalyDetector:
+    """
+    Stateful anomaly detector for data arriving in batches.
+    
+    Keeps an exponentially weighted running mean and variance per feature
+    (``zscore``) or exponentially weighted quantile sketches (``iqr``), so
+    each row is scored in O(1) against everything seen so far rather than
+    against its own batch. Rows of a batch are scored against the state
+    before the batch, then the batch is absorbed.
+    
+    Drift adaptation is set by ``halflife``: after that many rows an
+    observation carries half its original weight. With ``halflife=None``
+    the statistics cover the whole stream with equal weights.
+    """
+    
+    def __init__(
+        self,
+        method: str = "zscore",
+        threshold: float = 3.0,
+        halflife: Optional[float] = 1000,
+        warmup: int = 30,
+        iqr_multiplier: float = 1.5,
+        learn_anomalies: bool = False,
+        compression: int = 100
+    ):
+        """
+        Initialize streaming anomaly detector.
+        
+        Args:
+            method: Detection method (zscore, iqr)
+            threshold: Z-score above which a value is anomalous
+            halflife: Rows after which an observation's weight halves
+                (None for no decay)
+            warmup: Rows to absorb before any row is flagged
+            iqr_multiplier: IQR multiple beyond the quartiles that is anomalous
+            learn_anomalies: Whether flagged rows update the state; excluding
+                them keeps a burst of anomalies from shifting the baseline
+            compression: Quantile sketch compression for the iqr method
+        """
+        if method not in ("zscore", "iqr"):
+            raise ValueError(f"Unknown streaming detection method: {method}")
+        
+        self.method = method
+        self.threshold = threshold
+        self.halflife = halflife
+        self.warmup = warmup
+        self.iqr_multiplier = iqr_multiplier
+        self.learn_anomalies = learn_anomalies
+        self.compression = compression
+        self.features: Optional[List[str]] = None
+        self.n_seen = 0
+        self._decay = 1.0 if halflife is None else 0.5 ** (1.0 / halflife)
+        self._weight: Optional[np.ndarray] = None
+        self._mean: Optional[np.ndarray] = None
+        self._var: Optional[np.ndarray] = None
+        self._sketches: List[QuantileSketch] = []
+    
+    def update(self, batch: pd.DataFrame) -> "StreamingAnomalyDetector":
+        """
+        Absorb a batch into the running state without scoring it.
+        
+        Args:
+            batch: Batch of records
         
-        X = data[features]
-        scores = self.model.score_samples(X)
+        Returns:
+            Self for method chaining
+        """
+        self._absorb(self._matrix(batch))
+        return self
+    
+    def score(self, batch: pd.DataFrame) -> np.ndarray:
+        """
+        Score a batch against the current state without updating it.
+        
+        Args:
+            batch: Batch of records
+        
+        Returns:
+            Per-row score: largest absolute z-score (zscore) or largest
+            distance beyond the quartiles in IQR units (iqr); 0 during warmup
+        """
+        return self._score(self._matrix(batch))
+    
+    def detect(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score a batch, then absorb it.
+        
+        Args:
+            batch: Batch of records
+        
+        Returns:
+            DataFrame containing only anomalous records
+        """
+        X = self._matrix(batch)
+        scores = self._score(X)
+        limit = self.threshold if self.method == "zscore" else self.iqr_multiplier
+        mask = scores > limit
+        
+        self._absorb(X if self.learn_anomalies else X[~mask])
+        
+        if mask.any():
+            logger.debug(f"Detected {int(mask.sum())} anomalies in streaming batch")
+        return batch[mask]
+    
+    def _matrix(self, batch: pd.DataFrame) -> np.ndarray:
+        """Feature columns of a batch as a float array; features fixed by the first batch."""
+        if self.features is None:
+            self.features = batch.select_dtypes(include=[np.number]).columns.tolist()
+        
+        missing = [col for col in self.features if col not in batch.columns]
+        if missing:
+            raise DataValidationError(f"Batch is missing tracked features: {missing}")
+        
+        return batch[self.features].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    def _score(self, X: np.ndarray) -> np.ndarray:
+        """Per-row scores against the current state."""
+        if self.n_seen < self.warmup or X.shape[1] == 0:
+            return np.zeros(len(X))
+        
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            if self.method == "zscore":
+                distance = np.abs(X - self._mean) / np.sqrt(self._var)
+            else:
+                q1 = np.array([sketch.quantile(0.25) for sketch in self._sketches])
+                q3 = np.array([sketch.quantile(0.75) for sketch in self._sketches])
+                distance = np.maximum(q1 - X, X - q3) / (q3 - q1)
+            
+            # NaN values and constant features never score
+            distance = np.where(np.isfinite(distance), distance, 0.0)
+        
+        return distance.max(axis=1)
+    
+    def _absorb(self, X: np.ndarray) -> None:
+        """Fold rows into the exponentially weighted state."""
+        if self._weight is None:
+            p = X.shape[1]
+            self._weight = np.zeros(p)
+            self._mean = np.zeros(p)
+            self._var = np.zeros(p)
+            self._sketches = [QuantileSketch(self.compression) for _ in range(p)]
+        
+        m = len(X)
+        if m == 0:
+            return
+        
+        # Row i of the batch is m - 1 - i rows older than the newest one
+        row_weights = self._decay ** np.arange(m - 1, -1, -1, dtype=np.float64)
+        carried = self._decay ** m
+        valid = ~np.isnan(X)
+        
+        if self.method == "zscore":
+            weights = valid * row_weights[:, None]
+            batch_weight = weights.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                batch_mean = np.where(
+                    batch_weight > 0, (weights * np.where(valid, X, 0.0)).sum(axis=0) / batch_weight, 0.0
+                )
+                deviation = np.where(valid, X - batch_mean, 0.0)
+                batch_var = np.where(
+                    batch_weight > 0, (weights * deviation ** 2).sum(axis=0) / batch_weight, 0.0
+                )
+            
+            # Weighted Chan update of (weight, mean, variance)
+            old_weight = self._weight * carried
+            total = old_weight + batch_weight
+            with np.errstate(invalid='ignore', divide='ignore'):
+                share = np.where(total > 0, batch_weight / total, 0.0)
+            delta = batch_mean - self._mean
+            self._mean = self._mean + share * delta
+            self._var = (1 - share) * self._var + share * batch_var + share * (1 - share) * delta ** 2
+            self._weight = total
+        else:
+            for j, sketch in enumerate(self._sketches):
+                sketch.decay(carried)
+                sketch.update(X[:, j], row_weights)
         
-        return -scores  # Negative scores indicate anomalies
+        self.n_seen += m
@@ -0,0 +1,204 @@
+"""
+Analysis cache module.
+Caches statistical results per column, keyed by a fingerprint of the column contents.
+"""
+
+import copy
+import hashlib
+from typing import Dict, Any, List, Optional, Tuple, Hashable
+import pandas as pd
+import numpy as np
+
+
+# Column dtypes fingerprinted from their raw bytes; others from pandas row hashes
+_RAW_KINDS = 'biufcmM'
+
+
+class AnalysisCache:
+    """
+    Cache of StatisticalAnalyzer results.
+    
+    Per-column sections store one entry per column, tagged with the column's
+    fingerprint; whole-dataset results (correlation matrix, importance) are
+    stored under a key plus the fingerprints they were computed from. A
+    fingerprint covers the column name, dtype, length and values, so any
+    edit invalidates that column only. ``scan`` also recognizes columns
+    that only gained rows at the end, whose mergeable results (moments,
+    Pearson co-moments) can be updated from the new rows alone.
+    """
+    
+    def __init__(self):
+        self._columns: Dict[str, Dict[str, Tuple[str, Any]]] = {}
+        self._sections: Dict[str, Tuple[Hashable, Any]] = {}
+        self._seen: Dict[str, Tuple[str, int]] = {}
+    
+    @staticmethod
+    def fingerprint(series: pd.Series) -> str:
+        """
+        Compute a content fingerprint of a column.
+        
+        Args:
+            series: Column values
+        
+        Returns:
+            Hex digest identifying the column contents
+        """
+        return AnalysisCache._digest(series)[0]
+    
+    @staticmethod
+    def _digest(series: pd.Series, prefix_rows: Optional[int] = None) -> Tuple[str, Optional[str]]:
+        """
+        Fingerprint a column and, in the same pass, its first ``prefix_rows`` rows.
+        
+        The row count is hashed last, so the fingerprint of the first k rows
+        is an intermediate state of the full one.
+        """
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in _RAW_KINDS:
+            values = np.ascontiguousarray(series.to_numpy())
+        else:
+            values = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        
+        digest = hashlib.sha256(f"{series.name}|{series.dtype}|".encode())
+        prefix = None
+        if prefix_rows is not None:
+            digest.update(values[:prefix_rows].view(np.uint8))
+            head = digest.copy()
+            head.update(f"|{prefix_rows}".encode())
+            prefix = head.hexdigest()
+            values = values[prefix_rows:]
+        
+        digest.update(values.view(np.uint8))
+        digest.update(f"|{len(series)}".encode())
+        return digest.hexdigest(), prefix
+    
+    def fingerprints(self, data: pd.DataFrame) -> Dict[str, str]:
+        """
+        Fingerprint every column of a DataFrame.
+        
+        Args:
+            data: Input DataFrame
+        
+        Returns:
+            Dictionary mapping column name to fingerprint
+        """
+        return {col: self.fingerprint(data[col]) for col in data.columns}
+    
+    def scan(self, data: pd.DataFrame) -> Tuple[Dict[str, str], Dict[str, Tuple[str, int]]]:
+        """
+        Fingerprint every column and find the columns that only gained rows.
+        
+        A column counts as appended when its first rows hash to the
+        fingerprint it had at the previous scan. Both fingerprints come from
+        one pass over the column.
+        
+        Args:
+            data: Input DataFrame
+        
+        Returns:
+            Tuple of (fingerprint by column, {column: (previous fingerprint,
+            previous row count)} for appended columns)
+        """
+        fingerprints: Dict[str, str] = {}
+        appended: Dict[str, Tuple[str, int]] = {}
+        
+        for col in data.columns:
+            seen = self._seen.get(col)
+            prefix_rows = seen[1] if seen is not None and 0 < seen[1] < len(data) else None
+            fingerprints[col], prefix = self._digest(data[col], prefix_rows)
+            if prefix is not None and prefix == seen[0]:
+                appended[col] = seen
+        
+        self._seen.update((col, (fp, len(data))) for col, fp in fingerprints.items())
+        return fingerprints, appended
+    
+    def get_columns(
+        self,
+        section: str,
+        fingerprints: Dict[str, str]
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Look up cached per-column results.
+        
+        Args:
+            section: Section name
+            fingerprints: Current fingerprint of each requested column
+        
+        Returns:
+            Tuple of (cached results by column, columns that must be recomputed)
+        """
+        entries = self._columns.get(section, {})
+        hits: Dict[str, Any] = {}
+        misses: List[str] = []
+        
+        for col, fp in fingerprints.items():
+            entry = entries.get(col)
+            if entry is not None and entry[0] == fp:
+                hits[col] = copy.deepcopy(entry[1])
+            else:
+                misses.append(col)
+        
+        return hits, misses
+    
+    def put_columns(
+        self,
+        section: str,
+        fingerprints: Dict[str, str],
+        values: Dict[str, Any]
+    ) -> None:
+        """
+        Store per-column results.
+        
+        Args:
+            section: Section name
+            fingerprints: Fingerprint of each column in values
+            values: Results by column
+        """
+        entries = self._columns.setdefault(section, {})
+        for col, value in values.items():
+            entries[col] = (fingerprints[col], value)
+    
+    def get(self, section: str, key: Hashable) -> Optional[Any]:
+        """
+        Look up a whole-section result.
+        
+        Args:
+            section: Section name
+            key: Key the result was stored under (parameters, fingerprints)
+        
+        Returns:
+            Cached value, or None if missing or stored under another key
+        """
+        entry = self._sections.get(section)
+        if entry is not None and entry[0] == key:
+            return copy.deepcopy(entry[1])
+        return None
+    
+    def get_latest(self, section: str) -> Optional[Tuple[Hashable, Any]]:
+        """
+        Get the last stored (key, value) for a section regardless of key.
+        The value is not copied and must not be modified.
+        
+        Args:
+            section: Section name
+        
+        Returns:
+            Tuple of (key, value), or None if nothing is stored
+        """
+        return self._sections.get(section)
+    
+    def put(self, section: str, key: Hashable, value: Any) -> None:
+        """
+        Store a whole-section result, replacing any previous one.
+        
+        Args:
+            section: Section name
+            key: Key identifying the inputs of the result
+            value: Result to store
+        """
+        self._sections[section] = (key, value)
+    
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._columns.clear()
+        self._sections.clear()
+        self._seen.clear()
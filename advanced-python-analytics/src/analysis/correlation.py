@@ -0,0 +1,389 @@
+"""
+Correlation engine module.
+Computes Pearson, Spearman and Kendall correlations in column blocks.
+"""
+
+import warnings
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+from src.core.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+METHODS = ('pearson', 'spearman', 'kendall')
+
+
+class CorrelationEngine:
+    """
+    Blocked correlation engine.
+    
+    Columns are centered and scaled once, so each block of the correlation
+    matrix is a single BLAS matrix product. Columns with missing values use
+    pairwise-complete observations (same as ``DataFrame.corr``), computed with
+    a few extra products against the validity mask.
+    
+    Rank methods rank every column once. Spearman is Pearson on those ranks;
+    Kendall's tau-b runs SciPy's O(n log n) algorithm on them pair by pair,
+    on a row sample when the data exceeds ``kendall_max_rows``. With missing
+    values, ranks are taken over each column's own non-null values.
+    """
+    
+    def __init__(
+        self,
+        block_size: int = 512,
+        method: str = "pearson",
+        kendall_max_rows: Optional[int] = 10000,
+        random_state: int = 42
+    ):
+        """
+        Initialize correlation engine.
+        
+        Args:
+            block_size: Number of columns per block; bounds peak memory to
+                roughly block_size x n_columns floats per intermediate
+            method: Correlation method (pearson, spearman, kendall)
+            kendall_max_rows: Row count above which Kendall runs on a random
+                row sample of this size (None to always use every row)
+            random_state: Random seed for row sampling
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown correlation method: {method}")
+        
+        self.block_size = block_size
+        self.method = method
+        self.kendall_max_rows = kendall_max_rows
+        self.random_state = random_state
+        self.columns: List[str] = []
+        self.n_rows: int = 0
+        self.sampled: bool = False
+        self._Z: Optional[np.ndarray] = None
+        self._mask: Optional[np.ndarray] = None
+        self._ranks: Optional[np.ndarray] = None
+    
+    def fit(
+        self,
+        X: np.ndarray,
+        columns: List[str],
+        ranks: Optional[np.ndarray] = None
+    ) -> "CorrelationEngine":
+        """
+        Prepare the data for correlation queries.
+        
+        Args:
+            X: 2-D float array (rows x columns), NaN for missing values
+            columns: Column names matching the array columns
+            ranks: Precomputed column ranks of X for rank methods (ignored
+                when Kendall samples rows)
+        
+        Returns:
+            Self for method chaining
+        """
+        X = np.asarray(X, dtype=np.float64)
+        self.columns = list(columns)
+        self.sampled = False
+        
+        if self.method == "kendall":
+            if self.kendall_max_rows is not None and len(X) > self.kendall_max_rows:
+                rng = np.random.default_rng(self.random_state)
+                rows = np.sort(rng.choice(len(X), size=self.kendall_max_rows, replace=False))
+                X = X[rows]
+                self.sampled = True
+                ranks = None
+            self.n_rows = len(X)
+            self._ranks = ranks if ranks is not None else self._rank(X)
+            return self
+        
+        if self.method == "spearman":
+            X = ranks if ranks is not None else self._rank(X)
+        
+        self.n_rows = len(X)
+        valid = ~np.isnan(X)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if valid.all():
+                # Unit-norm centered columns: a block of r is just Z_b.T @ Z
+                centered = X - X.mean(axis=0)
+                self._Z = centered / np.linalg.norm(centered, axis=0)
+                self._mask = None
+            else:
+                # Centering by the column mean does not change r but keeps the
+                # pairwise sums below numerically well conditioned
+                counts = valid.sum(axis=0)
+                means = np.where(valid, X, 0.0).sum(axis=0) / np.maximum(counts, 1)
+                self._Z = np.where(valid, X - means, 0.0)
+                self._mask = valid.astype(np.float64)
+        
+        return self
+    
+    def matrix(self) -> pd.DataFrame:
+        """
+        Compute the full correlation matrix.
+        
+        Returns:
+            Correlation matrix as a DataFrame
+        """
+        p = len(self.columns)
+        corr = np.empty((p, p))
+        
+        # Compute the upper triangle only and mirror it
+        for start, stop, block in self._blocks(upper=True):
+            corr[start:stop, start:] = block
+        
+        lower = np.tril_indices(p, -1)
+        corr[lower] = corr.T[lower]
+        
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+    
+    def with_column(self, column: str) -> pd.Series:
+        """
+        Correlate one column against every column.
+        
+        Args:
+            column: Column name
+        
+        Returns:
+            Series of correlations indexed by column name
+        """
+        return pd.Series(self.rows([column])[0], index=self.columns)
+    
+    def rows(self, columns: List[str]) -> np.ndarray:
+        """
+        Correlate a subset of columns against every column.
+        
+        Args:
+            columns: Column names
+        
+        Returns:
+            Array of shape (len(columns), n_columns)
+        """
+        idx = np.array([self.columns.index(col) for col in columns], dtype=np.intp)
+        return self._correlate(idx)
+    
+    def pairs(
+        self,
+        threshold: float = 0.7,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find column pairs whose absolute correlation exceeds a threshold.
+        
+        Only the upper triangle is examined and the full matrix is never
+        materialized; at most one block is held in memory at a time.
+        
+        Args:
+            threshold: Absolute correlation threshold (strictly greater)
+            top_k: If set, keep only the k strongest pairs
+        
+        Returns:
+            List of dicts with feature1, feature2 and correlation, in matrix
+            order, or by decreasing absolute correlation when top_k is set
+        """
+        return self._collect_pairs(self._blocks(upper=True), threshold, top_k)
+    
+    def pairs_with_column(
+        self,
+        column: str,
+        threshold: float = 0.7,
+        top_k: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], pd.Series]:
+        """
+        Same as ``pairs``, also returning ``with_column(column)``.
+        
+        The column's correlations are read off the blocks ``pairs`` computes
+        anyway, so no pair is correlated twice (which matters for Kendall).
+        
+        Args:
+            column: Column name
+            threshold: Absolute correlation threshold (strictly greater)
+            top_k: If set, keep only the k strongest pairs
+        
+        Returns:
+            Tuple of the pairs and the column's correlations indexed by column name
+        """
+        t = self.columns.index(column)
+        values = np.empty(len(self.columns))
+        
+        def blocks() -> Iterator[Tuple[int, int, np.ndarray]]:
+            for start, stop, block in self._blocks(upper=True):
+                if start <= t:
+                    # Rows up to the column hold corr(i, column) in its slot
+                    end = min(stop, t + 1)
+                    values[start:end] = block[:end - start, t - start]
+                if start <= t < stop:
+                    values[t:] = block[t - start, t - start:]
+                yield start, stop, block
+        
+        pairs = self._collect_pairs(blocks(), threshold, top_k)
+        return pairs, pd.Series(values, index=self.columns)
+    
+    def pairs_from_matrix(
+        self,
+        matrix: np.ndarray,
+        threshold: float = 0.7,
+        top_k: Optional[int] = None,
+        columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Same as ``pairs`` for an already computed correlation matrix.
+        
+        Args:
+            matrix: Square correlation matrix ordered like ``columns``
+            threshold: Absolute correlation threshold (strictly greater)
+            top_k: If set, keep only the k strongest pairs
+            columns: Column names of the matrix (defaults to the fitted
+                columns; the engine need not be fitted when given)
+        
+        Returns:
+            List of dicts with feature1, feature2 and correlation
+        """
+        columns = list(columns) if columns is not None else self.columns
+        p = len(columns)
+        blocks = (
+            (start, min(start + self.block_size, p),
+             matrix[start:min(start + self.block_size, p), start:])
+            for start in range(0, p, self.block_size)
+        )
+        return self._collect_pairs(blocks, threshold, top_k, columns)
+    
+    def _collect_pairs(
+        self,
+        blocks: Iterator[Tuple[int, int, np.ndarray]],
+        threshold: float,
+        top_k: Optional[int],
+        columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Extract pairs above the threshold from upper-triangle row blocks."""
+        columns = columns if columns is not None else self.columns
+        if top_k is not None and top_k <= 0:
+            return []
+        
+        rows: List[np.ndarray] = []
+        cols: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        
+        for start, stop, block in blocks:
+            # Block covers columns [start, p); keep entries right of the diagonal
+            offsets = np.arange(stop - start)[:, None]
+            upper = np.arange(block.shape[1])[None, :] > offsets
+            i, j = np.nonzero(upper & (np.abs(block) > threshold))
+            
+            rows.append(i + start)
+            cols.append(j + start)
+            values.append(block[i, j])
+            
+            if top_k is not None:
+                rows, cols, values = self._keep_top_k(rows, cols, values, top_k)
+        
+        if not rows:
+            return []
+        
+        i, j, r = np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+        
+        if top_k is not None:
+            order = np.argsort(-np.abs(r), kind='stable')
+            i, j, r = i[order], j[order], r[order]
+        
+        return [
+            {
+                'feature1': columns[a],
+                'feature2': columns[b],
+                'correlation': float(c)
+            }
+            for a, b, c in zip(i.tolist(), j.tolist(), r.tolist())
+        ]
+    
+    def _blocks(self, upper: bool = False) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """Yield (start, stop, block) over row blocks of the correlation matrix."""
+        p = len(self.columns)
+        for start in range(0, p, self.block_size):
+            stop = min(start + self.block_size, p)
+            yield start, stop, self._correlate(np.arange(start, stop), start if upper else 0)
+    
+    def _correlate(self, idx: np.ndarray, col_start: int = 0) -> np.ndarray:
+        """Correlations of the columns at idx against columns [col_start, p)."""
+        if self.method == "kendall":
+            return self._kendall(idx, col_start)
+        
+        Z_b = self._Z[:, idx]
+        Z = self._Z[:, col_start:]
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if self._mask is None:
+                block = Z_b.T @ Z
+            else:
+                M_b = self._mask[:, idx]
+                M = self._mask[:, col_start:]
+                
+                n = M_b.T @ M
+                sx = Z_b.T @ M
+                sy = M_b.T @ Z
+                sxx = (Z_b * Z_b).T @ M
+                syy = M_b.T @ (Z * Z)
+                sxy = Z_b.T @ Z
+                
+                cov = sxy - sx * sy / n
+                var = (sxx - sx * sx / n) * (syy - sy * sy / n)
+                block = cov / np.sqrt(var)
+                block[n < 2] = np.nan
+        
+        return np.clip(block, -1.0, 1.0)
+    
+    def _kendall(self, idx: np.ndarray, col_start: int) -> np.ndarray:
+        """Kendall tau-b of the columns at idx against columns [col_start, p)."""
+        ranks = self._ranks
+        valid = ~np.isnan(ranks)
+        block = np.full((len(idx), ranks.shape[1] - col_start), np.nan)
+        in_block = set(idx.tolist())
+        computed: Dict[Tuple[int, int], float] = {}
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            for row, i in enumerate(idx.tolist()):
+                for j in range(col_start, ranks.shape[1]):
+                    key = (min(i, j), max(i, j))
+                    if key in computed:
+                        block[row, j - col_start] = computed[key]
+                        continue
+                    
+                    both = valid[:, i] & valid[:, j]
+                    if both.sum() < 2:
+                        tau = np.nan
+                    elif i == j:
+                        tau = 1.0
+                    else:
+                        tau = stats.kendalltau(ranks[both, i], ranks[both, j]).statistic
+                    block[row, j - col_start] = tau
+                    
+                    # Symmetric pairs inside the block are computed once
+                    if j in in_block:
+                        computed[key] = tau
+        
+        return block
+    
+    @staticmethod
+    def _rank(X: np.ndarray) -> np.ndarray:
+        """Average ranks of every column, leaving missing values as NaN."""
+        if X.size == 0:
+            return X
+        return stats.rankdata(X, axis=0, nan_policy='omit')
+    
+    @staticmethod
+    def _keep_top_k(
+        rows: List[np.ndarray],
+        cols: List[np.ndarray],
+        values: List[np.ndarray],
+        k: int
+    ) -> Tuple[List[np.ndarray], List[np.ndarray], List[np.ndarray]]:
+        """Prune accumulated candidate pairs to the k strongest."""
+        i, j, r = np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+        
+        if len(r) > k:
+            keep = np.argpartition(-np.abs(r), k - 1)[:k]
+            keep.sort()
+            i, j, r = i[keep], j[keep], r[keep]
+        
+        return [i], [j], [r]
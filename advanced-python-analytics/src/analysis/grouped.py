@@ -0,0 +1,263 @@
+"""
+Grouped statistics module.
+Computes descriptive, correlation and outlier statistics per segment.
+"""
+
+import warnings
+from typing import Dict, Any, Hashable, List, Optional, Tuple, Union
+import pandas as pd
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+
+from src.core.logger import setup_logger
+from src.core.exceptions import DataValidationError
+from src.analysis.correlation import CorrelationEngine
+
+
+logger = setup_logger(__name__)
+
+
+def _group_correlations(
+    groups: List[Tuple[Hashable, np.ndarray]],
+    columns: List[str],
+    settings: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Correlation results for a chunk of groups (runs in a worker process)."""
+    results = []
+    
+    for _, X in groups:
+        result = {'method': settings['method'], 'n_rows': len(X), 'matrix': {}, 'pairs': []}
+        
+        if len(X) >= settings['min_group_size']:
+            engine = CorrelationEngine(
+                block_size=settings['block_size'],
+                method=settings['method'],
+                kendall_max_rows=settings['kendall_max_rows']
+            ).fit(X, columns)
+            matrix = engine.matrix().to_numpy()
+            
+            result['n_rows'] = engine.n_rows
+            result['matrix'] = pd.DataFrame(matrix, index=columns, columns=columns).to_dict()
+            result['pairs'] = engine.pairs_from_matrix(
+                matrix, settings['threshold'], top_k=settings['top_k']
+            )
+            
+            target = settings['target']
+            if target is not None:
+                target_corr = pd.Series(matrix[:, columns.index(target)], index=columns)
+                target_corr = target_corr.drop(target).sort_values(ascending=False)
+                result['target_correlations'] = target_corr.to_dict()
+        
+        results.append(result)
+    
+    return results
+
+
+class GroupedStatistics:
+    """
+    Per-segment statistics computed in one partitioning pass.
+    
+    Rows are sorted by group code once. Descriptive statistics and z-score
+    outlier counts then come from segmented reductions over the sorted
+    array (``np.ufunc.reduceat``), so their cost does not grow with the
+    number of groups. Correlation matrices are the per-group heavy part and
+    are computed for chunks of groups in a process pool.
+    
+    Results match running the global sections on each group's slice.
+    """
+    
+    def __init__(
+        self,
+        n_jobs: int = 1,
+        chunk_size: int = 64,
+        min_group_size: int = 3,
+        outlier_threshold: float = 3.0
+    ):
+        """
+        Initialize grouped statistics.
+        
+        Args:
+            n_jobs: Worker processes for per-group correlations (-1 for all cores)
+            chunk_size: Groups per correlation task
+            min_group_size: Smallest group for which correlations are computed
+            outlier_threshold: Z-score above which a value is an outlier
+        """
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.min_group_size = min_group_size
+        self.outlier_threshold = outlier_threshold
+    
+    def compute(
+        self,
+        data: pd.DataFrame,
+        group_by: Union[str, List[str]],
+        target: Optional[str] = None,
+        method: str = "pearson",
+        correlation_threshold: float = 0.7,
+        top_k_pairs: Optional[int] = None,
+        correlation_block_size: int = 512,
+        kendall_max_rows: Optional[int] = 10000
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        """
+        Compute statistics for every group.
+        
+        Args:
+            data: Input DataFrame
+            group_by: Column or columns defining the segments
+            target: Target column for per-group target correlations
+            method: Correlation method (pearson, spearman, kendall)
+            correlation_threshold: Absolute correlation above which a pair is reported
+            top_k_pairs: If set, report only the k strongest pairs per group
+            correlation_block_size: Columns per block in the correlation engine
+            kendall_max_rows: Row sample size for Kendall correlation
+        
+        Returns:
+            Dictionary mapping group key (a tuple for several columns) to
+            {size, descriptive, correlations, outliers}; rows with a missing
+            group key are ignored
+        """
+        keys = [group_by] if isinstance(group_by, str) else list(group_by)
+        missing = [key for key in keys if key not in data.columns]
+        if missing:
+            raise DataValidationError(f"Group columns not found: {missing}")
+        
+        numeric_data = data.drop(columns=keys).select_dtypes(include=[np.number])
+        columns = numeric_data.columns.tolist()
+        X = numeric_data.to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        # One hash partition pass assigns group codes; one sort makes groups contiguous
+        grouper = data.groupby(keys if len(keys) > 1 else keys[0], sort=True, observed=True)
+        codes = grouper.ngroup().to_numpy(dtype=np.float64, na_value=np.nan)
+        labels = grouper.size().index.tolist()
+        
+        # Rows with a missing key get no group (NaN, or -1 in older pandas)
+        rows = np.flatnonzero(codes >= 0)
+        order = rows[np.argsort(codes[rows], kind='stable')]
+        X = X[order]
+        codes = codes[order].astype(np.int64)
+        starts = np.searchsorted(codes, np.arange(len(labels)))
+        sizes = np.diff(np.append(starts, len(codes)))
+        
+        logger.info(f"Computing statistics for {len(labels)} groups")
+        
+        descriptive, outliers = self._segment_statistics(X, codes, starts, sizes)
+        correlations = self._correlations(
+            X, starts, sizes, labels, columns,
+            {
+                'method': method,
+                'threshold': correlation_threshold,
+                'top_k': top_k_pairs,
+                'block_size': correlation_block_size,
+                'kendall_max_rows': kendall_max_rows,
+                'min_group_size': self.min_group_size,
+                'target': target if target in columns else None
+            }
+        )
+        
+        results = {}
+        for g, label in enumerate(labels):
+            results[label] = {
+                'size': int(sizes[g]),
+                'descriptive': {
+                    name: dict(zip(columns, values[g].tolist()))
+                    for name, values in descriptive.items()
+                },
+                'correlations': correlations[g],
+                'outliers': {
+                    col: {
+                        'count': int(outliers[g, j]),
+                        'percentage': float(outliers[g, j] / sizes[g] * 100)
+                    }
+                    for j, col in enumerate(columns)
+                }
+            }
+        
+        return results
+    
+    def _segment_statistics(
+        self,
+        X: np.ndarray,
+        codes: np.ndarray,
+        starts: np.ndarray,
+        sizes: np.ndarray
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Descriptive statistics and outlier counts (groups x columns) for sorted rows."""
+        n_groups, n_columns = len(starts), X.shape[1]
+        if n_groups == 0 or n_columns == 0:
+            empty = np.empty((n_groups, n_columns))
+            names = ('mean', 'median', 'std', 'min', 'max', 'skewness', 'kurtosis')
+            return {name: empty for name in names}, empty
+        
+        valid = ~np.isnan(X)
+        
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            
+            n = np.add.reduceat(valid, starts, axis=0).astype(np.float64)
+            mean = np.add.reduceat(np.where(valid, X, 0.0), starts, axis=0) / n
+            
+            # Central moments from deviations to each group's own mean
+            deviation = np.where(valid, X - mean[codes], 0.0)
+            m2 = np.add.reduceat(deviation ** 2, starts, axis=0)
+            m3 = np.add.reduceat(deviation ** 3, starts, axis=0)
+            m4 = np.add.reduceat(deviation ** 4, starts, axis=0)
+            
+            # pandas-compatible bias-corrected skewness and excess kurtosis;
+            # constant columns report 0 like DataFrame.skew/kurtosis
+            constant = m2 < 1e-14
+            skewness = np.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / (m2 / n) ** 1.5
+            skewness = np.where(constant, 0.0, skewness)
+            skewness[n < 3] = np.nan
+            kurtosis = (
+                n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2)
+                - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            )
+            kurtosis = np.where(constant, 0.0, kurtosis)
+            kurtosis[n < 4] = np.nan
+            
+            std = np.sqrt(m2 / (n - 1))
+            std[n < 2] = np.nan
+            
+            # Population z-scores, as in the global outlier section
+            z = np.abs(deviation) / np.sqrt(m2 / n)[codes]
+            outliers = np.add.reduceat(valid & (z > self.outlier_threshold), starts, axis=0)
+            
+            descriptive = {
+                'mean': mean,
+                'median': pd.DataFrame(X).groupby(codes, sort=True).median().to_numpy(),
+                'std': std,
+                'min': np.fmin.reduceat(X, starts, axis=0),
+                'max': np.fmax.reduceat(X, starts, axis=0),
+                'skewness': skewness,
+                'kurtosis': kurtosis
+            }
+        
+        return descriptive, outliers
+    
+    def _correlations(
+        self,
+        X: np.ndarray,
+        starts: np.ndarray,
+        sizes: np.ndarray,
+        labels: List[Hashable],
+        columns: List[str],
+        settings: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Per-group correlation results, computed in chunks of groups."""
+        groups = [
+            (label, X[start:start + size])
+            for label, start, size in zip(labels, starts, sizes)
+        ]
+        chunks = [
+            groups[i:i + self.chunk_size]
+            for i in range(0, len(groups), self.chunk_size)
+        ]
+        
+        if len(chunks) > 1 and effective_n_jobs(self.n_jobs) > 1:
+            outputs = Parallel(n_jobs=self.n_jobs)(
+                delayed(_group_correlations)(chunk, columns, settings) for chunk in chunks
+            )
+        else:
+            outputs = [_group_correlations(chunk, columns, settings) for chunk in chunks]
+        
+        return [result for output in outputs for result in output]
@@ -0,0 +1,223 @@
+"""
+Feature importance module.
+Estimates mutual information between features and a target.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import pandas as pd
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.feature_selection import (
+    mutual_info_regression, mutual_info_classif, f_classif, f_regression
+)
+from sklearn.model_selection import train_test_split
+
+from src.core.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+PREFILTERS = ('correlation', 'anova')
+
+
+def _mutual_info(
+    X: np.ndarray,
+    y: np.ndarray,
+    classification: bool,
+    random_state: int
+) -> np.ndarray:
+    """Mutual information of each column of X with y."""
+    if classification:
+        return mutual_info_classif(X, y, random_state=random_state)
+    return mutual_info_regression(X, y, random_state=random_state)
+
+
+class MutualInformationImportance:
+    """
+    Mutual-information feature importance with sampling and parallelism.
+    
+    The k-NN MI estimator is the expensive step, so this estimator can:
+    
+    - skip columns a cheap test marks as irrelevant (``prefilter``)
+    - run on stratified row samples, repeated ``n_repeats`` times to report
+      the spread of the estimate (``sample_size``)
+    - split the columns into partitions scored in parallel (``n_jobs``)
+    
+    With the defaults it runs the same single call as before. The estimator
+    perturbs continuous columns with seeded noise, so partitioned runs give
+    slightly different (but reproducible) scores than a single call.
+    """
+    
+    def __init__(
+        self,
+        n_jobs: int = 1,
+        sample_size: Optional[int] = None,
+        n_repeats: int = 3,
+        prefilter: Optional[str] = None,
+        prefilter_threshold: float = 0.01,
+        max_classes: int = 20,
+        random_state: int = 42
+    ):
+        """
+        Initialize feature importance estimator.
+        
+        Args:
+            n_jobs: Parallel jobs across column partitions (-1 for all cores)
+            sample_size: Rows per stratified sample (None to use every row)
+            n_repeats: Number of independent samples when sampling
+            prefilter: Cheap relevance test run first (correlation, anova, or None)
+            prefilter_threshold: Minimum relevance score to keep a column;
+                |r| for correlation, 1 - p-value of the F-test for anova
+            max_classes: Targets with at most this many values are treated
+                as classification
+            random_state: Random seed for sampling and the MI estimator
+        """
+        if prefilter is not None and prefilter not in PREFILTERS:
+            raise ValueError(f"Unknown prefilter: {prefilter}")
+        
+        self.n_jobs = n_jobs
+        self.sample_size = sample_size
+        self.n_repeats = n_repeats
+        self.prefilter = prefilter
+        self.prefilter_threshold = prefilter_threshold
+        self.max_classes = max_classes
+        self.random_state = random_state
+    
+    def compute(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series
+    ) -> Tuple[Dict[str, float], Dict[str, Any]]:
+        """
+        Compute feature importance.
+        
+        Args:
+            X: Numeric feature columns
+            y: Target values
+        
+        Returns:
+            Tuple of (importance, details). importance maps every column to
+            its MI score, sorted descending (skipped columns score 0.0).
+            details holds the rows used, skipped columns and, when sampling,
+            per-column standard deviation and 95% confidence interval.
+        """
+        classification = y.nunique() <= self.max_classes
+        columns = X.columns.tolist()
+        values = X.to_numpy(dtype=np.float64)
+        target = y.to_numpy()
+        
+        keep = self._prefilter(values, target, classification)
+        skipped = [col for col, kept in zip(columns, keep) if not kept]
+        if skipped:
+            logger.info(f"Prefilter skipped {len(skipped)} of {len(columns)} columns")
+        
+        kept_idx = np.flatnonzero(keep)
+        samples = self._sample_rows(target, classification)
+        
+        # One task per (sample, column partition)
+        n_parts = max(1, min(effective_n_jobs(self.n_jobs), len(kept_idx)))
+        partitions = [part for part in np.array_split(kept_idx, n_parts) if len(part)]
+        tasks = [
+            (repeat, part, rows)
+            for repeat, rows in enumerate(samples)
+            for part in partitions
+        ]
+        
+        scores = np.zeros((len(samples), len(columns)))
+        if tasks:
+            if n_parts * len(samples) > 1 and effective_n_jobs(self.n_jobs) > 1:
+                outputs = Parallel(n_jobs=self.n_jobs)(
+                    delayed(_mutual_info)(
+                        values[np.ix_(rows, part)], target[rows], classification,
+                        self.random_state + repeat
+                    )
+                    for repeat, part, rows in tasks
+                )
+            else:
+                outputs = [
+                    _mutual_info(
+                        values[np.ix_(rows, part)], target[rows], classification,
+                        self.random_state + repeat
+                    )
+                    for repeat, part, rows in tasks
+                ]
+            
+            for (repeat, part, _), output in zip(tasks, outputs):
+                scores[repeat, part] = output
+        
+        mean_scores = scores.mean(axis=0)
+        importance = dict(zip(columns, mean_scores.tolist()))
+        importance = dict(sorted(importance.items(), key=lambda x: x[1], reverse=True))
+        
+        details: Dict[str, Any] = {
+            'n_rows': int(len(samples[0])),
+            'n_repeats': len(samples),
+            'skipped': skipped
+        }
+        
+        if self.sample_size is not None and len(samples) > 1:
+            std = scores.std(axis=0, ddof=1)
+            half_width = 1.96 * std / np.sqrt(len(samples))
+            details['confidence'] = {
+                col: {
+                    'std': float(std[j]),
+                    'ci_low': float(max(mean_scores[j] - half_width[j], 0.0)),
+                    'ci_high': float(mean_scores[j] + half_width[j])
+                }
+                for j, col in enumerate(columns) if keep[j]
+            }
+        
+        return importance, details
+    
+    def _prefilter(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        classification: bool
+    ) -> np.ndarray:
+        """Boolean mask of columns that pass the cheap relevance test."""
+        if self.prefilter is None or X.shape[1] == 0:
+            return np.ones(X.shape[1], dtype=bool)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if self.prefilter == "correlation":
+                centered = X - X.mean(axis=0)
+                target = y.astype(np.float64) - y.astype(np.float64).mean()
+                score = np.abs(centered.T @ target) / (
+                    np.linalg.norm(centered, axis=0) * np.linalg.norm(target)
+                )
+            else:
+                test = f_classif if classification else f_regression
+                _, p_values = test(X, y)
+                score = 1.0 - p_values
+        
+        # Columns the test cannot score (e.g. constant) are kept for MI to decide
+        return ~(score < self.prefilter_threshold)
+    
+    def _sample_rows(self, y: np.ndarray, classification: bool) -> List[np.ndarray]:
+        """Row indices for each repeat; all rows when not sampling."""
+        n = len(y)
+        if self.sample_size is None or self.sample_size >= n:
+            return [np.arange(n)]
+        
+        # Stratify by class, or by target deciles for regression
+        if classification:
+            strata = y
+        else:
+            strata = pd.qcut(y, q=10, labels=False, duplicates='drop')
+        
+        samples = []
+        for repeat in range(max(1, self.n_repeats)):
+            seed = self.random_state + repeat
+            try:
+                rows, _ = train_test_split(
+                    np.arange(n), train_size=self.sample_size,
+                    stratify=strata, random_state=seed
+                )
+            except ValueError:
+                # Strata too small to split; fall back to a plain random sample
+                rows = np.random.default_rng(seed).choice(n, self.sample_size, replace=False)
+            samples.append(np.sort(rows))
+        
+        return samples
@@ -0,0 +1,323 @@
+"""
+Normality testing module.
+Runs normality tests on large or streamed data from moments and reservoir samples.
+"""
+
+from typing import Dict, Any, List, Optional
+import warnings
+import pandas as pd
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy import stats
+
+from src.analysis.accumulators import MomentAccumulator
+from src.core.exceptions import DataValidationError
+
+
+TESTS = ('shapiro', 'dagostino', 'jarque_bera', 'anderson')
+
+# Tests computed from the full-data moments rather than from a sample
+MOMENT_TESTS = ('dagostino', 'jarque_bera')
+
+
+class ReservoirSampler:
+    """
+    Uniform row sample of fixed size over a stream of batches (Algorithm R).
+    
+    Each batch is processed with vectorized draws, so one pass over the data
+    yields a sample in which every row had the same chance to be kept.
+    """
+    
+    def __init__(self, size: int, random_state: int = 42):
+        """
+        Initialize reservoir sampler.
+        
+        Args:
+            size: Maximum number of rows kept
+            random_state: Random seed
+        """
+        self.size = size
+        self.seen = 0
+        self._rng = np.random.default_rng(random_state)
+        self._reservoir: Optional[np.ndarray] = None
+    
+    def update(self, X: np.ndarray) -> "ReservoirSampler":
+        """
+        Offer a batch of rows to the reservoir.
+        
+        Args:
+            X: 2-D array (rows x columns)
+        
+        Returns:
+            Self for method chaining
+        """
+        if self._reservoir is None:
+            self._reservoir = np.empty((0, X.shape[1]))
+        
+        # Fill the reservoir first
+        free = min(self.size - len(self._reservoir), len(X))
+        if free > 0:
+            self._reservoir = np.vstack([self._reservoir, X[:free]])
+        
+        rest = X[free:]
+        if len(rest):
+            # Row t (1-based over the stream) replaces a random slot with probability size / t
+            positions = self.seen + free + np.arange(1, len(rest) + 1)
+            slots = (self._rng.random(len(rest)) * positions).astype(np.int64)
+            accepted = slots < self.size
+            # Later rows overwrite earlier ones in the same slot, as in the sequential algorithm
+            self._reservoir[slots[accepted]] = rest[accepted]
+        
+        self.seen += len(X)
+        return self
+    
+    @property
+    def sample(self) -> np.ndarray:
+        """Sampled rows (all rows if fewer than ``size`` were seen)."""
+        if self._reservoir is None:
+            return np.empty((0, 0))
+        return self._reservoir
+
+
+class NormalityTester:
+    """
+    Column-wise normality tests for large datasets.
+    
+    - ``dagostino`` (K^2) and ``jarque_bera`` use skewness and kurtosis from
+      the full-data moments, so they need no sample and cost one pass.
+    - ``shapiro`` and ``anderson`` run on a uniform reservoir sample of at
+      most ``sample_size`` rows, with columns tested in parallel.
+    
+    Data can be tested in one call with ``test`` or streamed with
+    ``update`` and ``finalize``. With ``shapiro`` and at most ``sample_size``
+    rows the result matches ``stats.shapiro`` on the whole column, which
+    reports a constant column as normal with a p-value of 1. Constant
+    columns are not normal under the other tests.
+    """
+    
+    def __init__(
+        self,
+        test: str = "shapiro",
+        sample_size: int = 5000,
+        alpha: float = 0.05,
+        n_jobs: int = 1,
+        random_state: int = 42
+    ):
+        """
+        Initialize normality tester.
+        
+        Args:
+            test: Test to run (shapiro, dagostino, jarque_bera, anderson)
+            sample_size: Reservoir size for sample-based tests
+            alpha: Significance level for ``is_normal``
+            n_jobs: Parallel jobs across columns for sample-based tests
+            random_state: Random seed for the reservoir
+        """
+        if test not in TESTS:
+            raise ValueError(f"Unknown normality test: {test}")
+        
+        self.test_name = test
+        self.sample_size = sample_size
+        self.alpha = alpha
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.columns: Optional[List[str]] = None
+        self._moments: Optional[MomentAccumulator] = None
+        self._reservoir: Optional[ReservoirSampler] = None
+    
+    def test(
+        self,
+        X: np.ndarray,
+        columns: List[str],
+        moments: Optional[MomentAccumulator] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Test every column of an in-memory array.
+        
+        Args:
+            X: 2-D float array (rows x columns), NaN for missing values
+            columns: Column names matching the array columns
+            moments: Precomputed moments of X, reused by moment-based tests
+        
+        Returns:
+            Dictionary mapping column to {is_normal, test, statistic, p_value}
+        """
+        self._reset(columns)
+        if moments is not None and self.test_name in MOMENT_TESTS:
+            # Copy so later streaming updates cannot modify the caller's moments
+            self._moments = moments.select(np.arange(len(self.columns)))
+        else:
+            self._consume(X)
+        return self.finalize()
+    
+    def update(self, batch: pd.DataFrame) -> "NormalityTester":
+        """
+        Add a batch of rows in streaming mode.
+        
+        Args:
+            batch: DataFrame batch; numeric columns of the first batch are tracked
+        
+        Returns:
+            Self for method chaining
+        """
+        if self.columns is None:
+            self._reset(batch.select_dtypes(include=[np.number]).columns.tolist())
+        
+        missing = [col for col in self.columns if col not in batch.columns]
+        if missing:
+            raise DataValidationError(f"Batch is missing tracked columns: {missing}")
+        
+        self._consume(batch[self.columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        return self
+    
+    def finalize(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute test results from the accumulated state.
+        
+        Returns:
+            Dictionary mapping column to {is_normal, test, statistic, p_value}
+        """
+        if self.columns is None:
+            return {}
+        
+        if self.test_name in MOMENT_TESTS:
+            statistic, p_value = self._moment_test()
+        else:
+            statistic, p_value = self._sample_test()
+        
+        return {
+            col: {
+                'is_normal': bool(p_value[j] > self.alpha),
+                'test': self.test_name,
+                'statistic': float(statistic[j]),
+                'p_value': float(p_value[j])
+            }
+            for j, col in enumerate(self.columns)
+        }
+    
+    def _reset(self, columns: List[str]) -> None:
+        """Start a new accumulation for the given columns."""
+        self.columns = list(columns)
+        self._moments = MomentAccumulator(len(self.columns))
+        self._reservoir = ReservoirSampler(self.sample_size, self.random_state)
+    
+    def _consume(self, X: np.ndarray) -> None:
+        """Feed rows into the state the selected test needs."""
+        if self.test_name in MOMENT_TESTS:
+            self._moments.update(X)
+        else:
+            self._reservoir.update(X)
+    
+    def _moment_test(self):
+        """D'Agostino K^2 or Jarque-Bera for all columns from the moments."""
+        n = self._moments.n
+        # Constant columns have no defined skewness or kurtosis
+        valid = ~self._moments.is_constant()
+        g1 = self._moments.biased_skewness()
+        b2 = self._moments.biased_kurtosis()
+        
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            if self.test_name == "jarque_bera":
+                statistic = n / 6.0 * (g1 ** 2 + (b2 - 3.0) ** 2 / 4.0)
+                statistic = np.where(valid & (n > 3), statistic, np.nan)
+            else:
+                statistic = _skewtest_z(g1, n) ** 2 + _kurtosistest_z(b2, n) ** 2
+                # scipy.stats.normaltest requires at least 8 observations
+                statistic = np.where(valid & (n >= 8), statistic, np.nan)
+        
+        p_value = stats.chi2.sf(statistic, 2)
+        return statistic, np.where(np.isnan(p_value), 0.0, p_value)
+    
+    def _sample_test(self):
+        """Shapiro-Wilk or Anderson-Darling on the reservoir sample, in parallel."""
+        sample = self._reservoir.sample
+        columns = [sample[:, j] for j in range(len(self.columns))] if sample.size else (
+            [np.empty(0)] * len(self.columns)
+        )
+        
+        if effective_n_jobs(self.n_jobs) > 1 and len(columns) > 1:
+            results = Parallel(n_jobs=self.n_jobs)(
+                delayed(_sample_test)(self.test_name, values) for values in columns
+            )
+        else:
+            results = [_sample_test(self.test_name, values) for values in columns]
+        
+        statistic = np.array([r[0] for r in results], dtype=np.float64)
+        p_value = np.array([r[1] for r in results], dtype=np.float64)
+        return statistic, p_value
+
+
+def _sample_test(test_name: str, values: np.ndarray):
+    """Run a sample-based test on the non-null values of one column."""
+    values = values[~np.isnan(values)]
+    
+    # Too few values cannot be tested
+    if len(values) <= 3:
+        return np.nan, 0.0
+    
+    if values.min() == values.max():
+        # stats.shapiro gives W = 1, p = 1 for a constant column; Anderson-Darling is undefined
+        return (1.0, 1.0) if test_name == "shapiro" else (np.nan, 0.0)
+    
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if test_name == "shapiro":
+                statistic, p_value = stats.shapiro(values)
+            else:
+                statistic, p_value = _anderson_normal(values)
+    except ValueError:
+        return np.nan, 0.0
+    
+    return statistic, p_value
+
+
+def _anderson_normal(values: np.ndarray):
+    """Anderson-Darling statistic and approximate p-value for normality."""
+    n = len(values)
+    statistic = stats.anderson(values, dist='norm').statistic
+    
+    # D'Agostino & Stephens (1986) p-value for estimated mean and variance
+    a2 = statistic * (1 + 0.75 / n + 2.25 / n ** 2)
+    if a2 >= 0.6:
+        p_value = np.exp(1.2937 - 5.709 * a2 + 0.0186 * a2 ** 2)
+    elif a2 >= 0.34:
+        p_value = np.exp(0.9177 - 4.279 * a2 - 1.38 * a2 ** 2)
+    elif a2 >= 0.2:
+        p_value = 1 - np.exp(-8.318 + 42.796 * a2 - 59.938 * a2 ** 2)
+    else:
+        p_value = 1 - np.exp(-13.436 + 101.14 * a2 - 223.73 * a2 ** 2)
+    
+    return statistic, float(np.clip(p_value, 0.0, 1.0))
+
+
+def _skewtest_z(g1: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Z-score of the D'Agostino skewness test (as scipy.stats.skewtest)."""
+    y = g1 * np.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+    beta2 = (
+        3.0 * (n * n + 27 * n - 70) * (n + 1) * (n + 3)
+        / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9))
+    )
+    W2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(W2))
+    alpha = np.sqrt(2.0 / (W2 - 1))
+    y = np.where(y == 0, 1, y)
+    return delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+
+def _kurtosistest_z(b2: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Z-score of the Anscombe-Glynn kurtosis test (as scipy.stats.kurtosistest)."""
+    E = 3.0 * (n - 1) / (n + 1)
+    varb2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+    x = (b2 - E) / np.sqrt(varb2)
+    sqrtbeta1 = (
+        6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9))
+        * np.sqrt((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3)))
+    )
+    A = 6.0 + 8.0 / sqrtbeta1 * (2.0 / sqrtbeta1 + np.sqrt(1 + 4.0 / (sqrtbeta1 ** 2)))
+    term1 = 1 - 2 / (9.0 * A)
+    denom = 1 + x * np.sqrt(2 / (A - 4.0))
+    term2 = np.sign(denom) * np.where(
+        denom == 0.0, np.nan, np.power((1 - 2.0 / A) / np.abs(denom), 1 / 3.0)
+    )
+    return (term1 - term2) / np.sqrt(2 / (9.0 * A))
@@ -0,0 +1,425 @@
+"""
+Analysis sections module.
+Registry of analysis sections and their shared inputs, executed as a DAG.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Hashable, Iterable, List, Optional, Sequence, Tuple
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+from src.core.logger import setup_logger
+from src.core.exceptions import ConfigurationError
+from src.analysis.accumulators import MomentAccumulator
+
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class Section:
+    """
+    An analysis section.
+    
+    Attributes:
+        name: Result key (and section name used to disable it)
+        compute: Function of the AnalysisContext returning the result
+        inputs: Shared inputs the section reads; computed once per run
+        requires: Sections whose results the section reads from ``context.results``
+        outputs: Result keys when compute returns a tuple of several results;
+            None values in the tuple are not stored
+    """
+    name: str
+    compute: Callable[["AnalysisContext"], Any]
+    inputs: Tuple[str, ...] = ()
+    requires: Tuple[str, ...] = ()
+    outputs: Optional[Tuple[str, ...]] = None
+
+
+class AnalysisContext:
+    """
+    Data and shared inputs for one analysis run.
+    
+    Inputs are computed lazily, at most once, on first access; each input has
+    its own lock so different inputs can be prepared concurrently. With the
+    default providers, ``numeric`` and ``moments`` restricted to some
+    columns are built for those columns only unless the full input already
+    exists, so sections that only recompute a few columns never pay for
+    the whole matrix.
+    """
+    
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        providers: Dict[str, Callable[["AnalysisContext"], Any]],
+        **params: Any
+    ):
+        """
+        Initialize analysis context.
+        
+        Args:
+            data: Input DataFrame
+            providers: Functions computing each shared input from the context
+            **params: Run parameters exposed as attributes (target, method, ...)
+        """
+        self.data = data
+        self.results: Dict[str, Any] = {}
+        self._providers = providers
+        self._values: Dict[str, Any] = {}
+        self._locks = {name: threading.Lock() for name in providers}
+        self._memo: Dict[Hashable, Any] = {}
+        self._memo_locks: Dict[Hashable, threading.Lock] = {}
+        self._memo_lock = threading.Lock()
+        
+        for key, value in params.items():
+            setattr(self, key, value)
+    
+    def get(self, name: str) -> Any:
+        """
+        Get a shared input, computing it on first use.
+        
+        Args:
+            name: Input name
+        
+        Returns:
+            Input value
+        """
+        if name not in self._providers:
+            raise ConfigurationError(f"Unknown analysis input: {name}")
+        
+        with self._locks[name]:
+            if name not in self._values:
+                self._values[name] = self._providers[name](self)
+            return self._values[name]
+    
+    def memoize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Compute a value at most once per run, e.g. an input restricted to some columns.
+        
+        Args:
+            key: Key identifying the value
+            compute: Function computing the value
+        
+        Returns:
+            The value
+        """
+        with self._memo_lock:
+            lock = self._memo_locks.setdefault(key, threading.Lock())
+        
+        with lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+            return self._memo[key]
+    
+    @property
+    def numeric_columns(self) -> List[str]:
+        """Names of the numeric columns, in data column order."""
+        if 'numeric' in self._values or self._providers.get('numeric') is not _numeric_input:
+            return self.get('numeric')[0]
+        return self.memoize(
+            'numeric_columns', lambda: self.data.select_dtypes(include=[np.number]).columns.tolist()
+        )
+    
+    def numeric(self, columns: Optional[Iterable[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Numeric block restricted to some columns.
+        
+        Args:
+            columns: Columns wanted (non-numeric ones are ignored); None for all
+        
+        Returns:
+            Tuple of (column names, 2-D float array), in data column order
+        """
+        if columns is None:
+            return self.get('numeric')
+        
+        names = self._numeric_subset(columns)
+        if self._use_full('numeric', names):
+            all_columns, X = self.get('numeric')
+            if len(names) == len(all_columns):
+                return all_columns, X
+            position = {col: i for i, col in enumerate(all_columns)}
+            return names, X[:, [position[col] for col in names]]
+        
+        return self.memoize(('numeric', tuple(names)), lambda: _numeric_block(self.data[names]))
+    
+    def moments(self, columns: Optional[Iterable[str]] = None) -> MomentAccumulator:
+        """
+        Column moments restricted to some columns.
+        
+        Args:
+            columns: Columns wanted (non-numeric ones are ignored); None for all
+        
+        Returns:
+            MomentAccumulator over the selected columns
+        """
+        if columns is None:
+            return self.get('moments')
+        
+        names = self._numeric_subset(columns)
+        if self._use_full('moments', names):
+            moments = self.get('moments')
+            if len(names) == len(moments.n):
+                return moments
+            position = {col: i for i, col in enumerate(self.numeric_columns)}
+            return moments.select([position[col] for col in names])
+        
+        return self.memoize(
+            ('moments', tuple(names)),
+            lambda: MomentAccumulator(len(names)).update(self.numeric(names)[1])
+        )
+    
+    def _numeric_subset(self, columns: Iterable[str]) -> List[str]:
+        """Numeric columns among the requested ones, in data column order."""
+        wanted = set(columns)
+        return [col for col in self.numeric_columns if col in wanted]
+    
+    def _use_full(self, name: str, columns: List[str]) -> bool:
+        """Whether a column subset should be sliced from the full input."""
+        return (
+            name in self._values
+            or self._providers.get(name) is not DEFAULT_INPUTS[name]
+            or len(columns) == len(self.numeric_columns)
+        )
+
+
+def _numeric_block(frame: pd.DataFrame) -> Tuple[List[str], np.ndarray]:
+    """Numeric columns of a frame as a 2-D float array with NaN for missing values."""
+    numeric_data = frame.select_dtypes(include=[np.number])
+    return numeric_data.columns.tolist(), numeric_data.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _numeric_input(context: AnalysisContext) -> Tuple[List[str], np.ndarray]:
+    """Numeric columns as a 2-D float array with NaN for missing values."""
+    return _numeric_block(context.data)
+
+
+def _ranks_input(context: AnalysisContext) -> np.ndarray:
+    """Average ranks of each numeric column over its non-null values."""
+    X = context.get('numeric')[1]
+    if X.size == 0:
+        return X
+    return stats.rankdata(X, axis=0, nan_policy='omit')
+
+
+def _moments_input(context: AnalysisContext) -> MomentAccumulator:
+    """Count, mean and central moment sums of each numeric column."""
+    X = context.get('numeric')[1]
+    return MomentAccumulator(X.shape[1]).update(X)
+
+
+DEFAULT_INPUTS: Dict[str, Callable[[AnalysisContext], Any]] = {
+    'numeric': _numeric_input,
+    'ranks': _ranks_input,
+    'moments': _moments_input
+}
+
+
+class SectionRegistry:
+    """
+    Ordered registry of analysis sections and shared input providers.
+    
+    ``run`` resolves section dependencies into a DAG and executes it in a
+    thread pool: independent sections run concurrently (NumPy and SciPy
+    release the GIL in their heavy loops) while each shared input is
+    computed only once. Results keep registration order.
+    """
+    
+    def __init__(self):
+        self.sections: Dict[str, Section] = {}
+        self.inputs: Dict[str, Callable[[AnalysisContext], Any]] = dict(DEFAULT_INPUTS)
+    
+    def register(
+        self,
+        name: str,
+        compute: Callable[[AnalysisContext], Any],
+        inputs: Sequence[str] = (),
+        requires: Sequence[str] = (),
+        outputs: Optional[Sequence[str]] = None
+    ) -> "SectionRegistry":
+        """
+        Register a section, replacing any section with the same name.
+        
+        Args:
+            name: Section name and result key
+            compute: Function of the AnalysisContext returning the result
+            inputs: Shared inputs the section reads
+            requires: Sections that must finish first
+            outputs: Result keys when compute returns a tuple
+        
+        Returns:
+            Self for method chaining
+        """
+        unknown = [item for item in inputs if item not in self.inputs]
+        if unknown:
+            raise ConfigurationError(f"Unknown analysis inputs: {unknown}")
+        
+        self.sections[name] = Section(
+            name=name,
+            compute=compute,
+            inputs=tuple(inputs),
+            requires=tuple(requires),
+            outputs=tuple(outputs) if outputs is not None else None
+        )
+        return self
+    
+    def unregister(self, name: str) -> "SectionRegistry":
+        """
+        Remove a section.
+        
+        Args:
+            name: Section name
+        
+        Returns:
+            Self for method chaining
+        """
+        self.sections.pop(name, None)
+        return self
+    
+    def register_input(
+        self,
+        name: str,
+        compute: Callable[[AnalysisContext], Any]
+    ) -> "SectionRegistry":
+        """
+        Register a shared input provider.
+        
+        Args:
+            name: Input name
+            compute: Function of the AnalysisContext returning the input
+        
+        Returns:
+            Self for method chaining
+        """
+        self.inputs[name] = compute
+        return self
+    
+    def context(self, data: pd.DataFrame, **params: Any) -> AnalysisContext:
+        """
+        Create a context for one run.
+        
+        Args:
+            data: Input DataFrame
+            **params: Run parameters exposed as context attributes
+        
+        Returns:
+            AnalysisContext using this registry's input providers
+        """
+        return AnalysisContext(data, self.inputs, **params)
+    
+    def run(
+        self,
+        context: AnalysisContext,
+        disabled: Iterable[str] = (),
+        n_jobs: int = 1,
+        prefetch: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run every enabled section.
+        
+        Args:
+            context: Analysis context
+            disabled: Section names to skip; sections requiring them are skipped too
+            n_jobs: Worker threads (1 runs sections sequentially)
+            prefetch: Start computing the declared inputs in full right away
+                when running in parallel; turn off when sections may only
+                need part of them (e.g. cached runs)
+        
+        Returns:
+            Dictionary of section results in registration order
+        """
+        sections = self._enabled(set(disabled))
+        
+        if n_jobs == 1 or len(sections) <= 1:
+            for section in sections:
+                self._execute(section, context)
+        else:
+            self._run_parallel(sections, context, n_jobs, prefetch)
+        
+        # Registration order rather than completion order
+        order = [key for section in sections for key in (section.outputs or (section.name,))]
+        return {key: context.results[key] for key in order if key in context.results}
+    
+    def _enabled(self, disabled: set) -> List[Section]:
+        """Enabled sections in dependency order."""
+        unknown = disabled - set(self.sections)
+        if unknown:
+            logger.warning(f"Ignoring unknown disabled sections: {sorted(unknown)}")
+        
+        ordered: List[Section] = []
+        state: Dict[str, str] = {}
+        
+        def visit(name: str, path: Tuple[str, ...]) -> bool:
+            if state.get(name) == 'done':
+                return True
+            if state.get(name) in ('visiting', 'skipped'):
+                if state[name] == 'visiting':
+                    raise ConfigurationError(f"Circular section dependency: {' -> '.join(path)}")
+                return False
+            
+            if name in disabled or name not in self.sections:
+                state[name] = 'skipped'
+                return False
+            
+            state[name] = 'visiting'
+            section = self.sections[name]
+            for dependency in section.requires:
+                if not visit(dependency, path + (dependency,)):
+                    logger.info(f"Skipping section '{name}': requires '{dependency}'")
+                    state[name] = 'skipped'
+                    return False
+            
+            state[name] = 'done'
+            ordered.append(section)
+            return True
+        
+        for name in self.sections:
+            visit(name, (name,))
+        
+        return ordered
+    
+    def _run_parallel(
+        self,
+        sections: List[Section],
+        context: AnalysisContext,
+        n_jobs: int,
+        prefetch: bool = True
+    ) -> None:
+        """Submit each section as soon as the sections it requires have finished."""
+        pending = {section.name: section for section in sections}
+        finished: set = set()
+        
+        max_workers = None if n_jobs < 1 else n_jobs
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if prefetch:
+                # Shared inputs start computing right away, ahead of the sections using them
+                for name in {item for section in sections for item in section.inputs}:
+                    executor.submit(context.get, name)
+            
+            running = {}
+            while pending or running:
+                for name in [n for n, s in pending.items() if set(s.requires) <= finished]:
+                    section = pending.pop(name)
+                    running[executor.submit(self._execute, section, context)] = name
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # Re-raise section errors in the caller
+                    future.result()
+                    finished.add(running.pop(future))
+    
+    @staticmethod
+    def _execute(section: Section, context: AnalysisContext) -> None:
+        """Run one section and store its results in the context."""
+        # Inputs are fetched by the section itself, in full or for the columns it needs
+        value = section.compute(context)
+        
+        if section.outputs is None:
+            context.results[section.name] = value
+        else:
+            for key, item in zip(section.outputs, value):
+                if item is not None:
+                    context.results[key] = item
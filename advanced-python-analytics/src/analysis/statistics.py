@@ -3,28 +3,102 @@ Statistical analysis module.
 Provides comprehensive statistical analysis capabilities.
 """
 
-from typing import Dict, Any, List, Optional
+import warnings
+from typing import Dict, Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
 import pandas as pd
 import numpy as np
 from scipy import stats
-from sklearn.feature_selection import mutual_info_regression, mutual_info_classif
 
 from src.core.logger import setup_logger
+from src.core.config import AnalysisConfig
+from src.analysis.cache import AnalysisCache
+from src.analysis.correlation import CorrelationEngine
+from src.analysis.grouped import GroupedStatistics
+from src.analysis.importance import MutualInformationImportance
+from src.analysis.normality import NormalityTester, MOMENT_TESTS
+from src.analysis.accumulators import MomentAccumulator
+from src.analysis.sections import AnalysisContext, SectionRegistry
 
 
 logger = setup_logger(__name__)
 
 
 class StatisticalAnalyzer:
-    """Performs statistical analysis on datasets."""
+    """
+    Performs statistical analysis on datasets.
     
-    def __init__(self):
+    ``analyze`` runs the sections in ``self.sections``. Built-in sections
+    share one numeric matrix (and moments or ranks where needed), and
+    independent sections run concurrently when ``n_jobs`` is not 1. Extra
+    sections can be added with ``register_section``.
+    """
+    
+    def __init__(
+        self,
+        correlation_threshold: float = 0.7,
+        max_matrix_columns: int = 1000,
+        top_k_pairs: Optional[int] = None,
+        correlation_block_size: int = 512,
+        kendall_max_rows: Optional[int] = 10000,
+        importance: Optional[MutualInformationImportance] = None,
+        normality: Optional[NormalityTester] = None,
+        grouped: Optional[GroupedStatistics] = None,
+        cache: bool = False,
+        n_jobs: Optional[int] = None,
+        disabled_sections: Optional[Sequence[str]] = None,
+        config: Optional[Any] = None
+    ):
+        """
+        Initialize statistical analyzer.
+        
+        Args:
+            correlation_threshold: Absolute correlation above which a pair is reported
+            max_matrix_columns: Widest dataset for which the full correlation
+                matrix is returned; wider datasets only get pairs
+            top_k_pairs: If set, report only the k strongest correlated pairs
+            correlation_block_size: Columns per block in the correlation engine
+            kendall_max_rows: Row count above which Kendall correlation is
+                computed on a random row sample of this size
+            importance: Feature importance estimator (parallelism, sampling
+                and prefilter settings); defaults to a single full MI pass
+            normality: Normality tester (test, sample size, parallelism);
+                defaults to Shapiro-Wilk on a 5000-row random sample
+            grouped: Per-segment statistics engine used with ``group_by``
+                (process pool size, chunking)
+            cache: Keep per-column results between ``analyze`` calls and only
+                recompute columns whose contents changed
+            n_jobs: Threads running independent sections (1 runs them in order)
+            disabled_sections: Names of sections to skip
+            config: Configuration object
+        
+        n_jobs and disabled_sections left as None come from ``config.analysis``.
+        """
+        analysis_config = config.analysis if config and hasattr(config, 'analysis') else AnalysisConfig()
+        
+        self.correlation_threshold = correlation_threshold
+        self.max_matrix_columns = max_matrix_columns
+        self.top_k_pairs = top_k_pairs
+        self.correlation_block_size = correlation_block_size
+        self.kendall_max_rows = kendall_max_rows
+        self.importance = importance or MutualInformationImportance()
+        self.normality = normality or NormalityTester()
+        self.grouped = grouped or GroupedStatistics()
+        self.cache = AnalysisCache() if cache else None
+        self.n_jobs = n_jobs if n_jobs is not None else analysis_config.n_jobs
+        self.disabled_sections = list(
+            disabled_sections if disabled_sections is not None else analysis_config.disabled_sections
+        )
         self.results: Dict[str, Any] = {}
+        
+        self.sections = SectionRegistry()
+        self._register_default_sections()
     
     def analyze(
         self,
         data: pd.DataFrame,
-        target: Optional[str] = None
+        target: Optional[str] = None,
+        method: str = "pearson",
+        group_by: Optional[Union[str, List[str]]] = None
     ) -> Dict[str, Any]:
         """
         Perform comprehensive statistical analysis.
@@ -32,7 +106,11 @@ class StatisticalAnalyzer:
         Args:
             data: Input DataFrame
             target: Target column for correlation analysis
-            
+            method: Correlation method (pearson, spearman, kendall)
+            group_by: Column or columns defining segments; adds a 'groups'
+                section with descriptive, correlation and outlier results
+                per segment
+        
         Returns:
             Dictionary containing analysis results
         """
@@ -40,41 +118,224 @@ class StatisticalAnalyzer:
         
         results = {}
         
-        # Basic statistics
-        results['descriptive'] = self._descriptive_stats(data)
-        
-        # Correlation analysis
-        results['correlations'] = self._correlation_analysis(data, target)
+        if group_by is not None:
+            results['groups'] = self.grouped.compute(
+                data,
+                group_by,
+                target=target,
+                method=method,
+                correlation_threshold=self.correlation_threshold,
+                top_k_pairs=self.top_k_pairs,
+                correlation_block_size=self.correlation_block_size,
+                kendall_max_rows=self.kendall_max_rows
+            )
+            # Segment keys are not features of the global analysis
+            data = data.drop(columns=[group_by] if isinstance(group_by, str) else group_by)
         
-        # Distribution analysis
-        results['distributions'] = self._distribution_analysis(data)
+        # Column fingerprints drive the cache; None when caching is off
+        fingerprints, appended = None, {}
+        if self.cache is not None:
+            fingerprints, appended = self.cache.scan(data.select_dtypes(include=[np.number]))
+            if appended:
+                logger.info(f"Merging appended rows into cached results for {len(appended)} columns")
         
-        # Feature importance (if target provided)
-        if target and target in data.columns:
-            results['importance'] = self._feature_importance(data, target)
-        else:
-            results['importance'] = {}
-        
-        # Outlier detection
-        results['outliers'] = self._detect_outliers(data)
+        context = self.sections.context(
+            data, target=target, method=method, fingerprints=fingerprints, appended=appended
+        )
+        # Cached runs build shared inputs only for the columns that missed the cache
+        results.update(self.sections.run(
+            context, disabled=self.disabled_sections, n_jobs=self.n_jobs,
+            prefetch=self.cache is None
+        ))
         
         self.results = results
         logger.info("Statistical analysis complete")
         
         return results
     
-    def _descriptive_stats(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def register_section(
+        self,
+        name: str,
+        compute: Callable[[AnalysisContext], Any],
+        inputs: Sequence[str] = (),
+        requires: Sequence[str] = ()
+    ) -> "StatisticalAnalyzer":
+        """
+        Add a section to ``analyze``.
+        
+        Args:
+            name: Section name and result key
+            compute: Function of the AnalysisContext returning the result; the
+                context exposes data, target, method, shared inputs via
+                ``get`` and finished sections via ``results``
+            inputs: Shared inputs used (numeric, ranks, moments)
+            requires: Sections whose results are read
+        
+        Returns:
+            Self for method chaining
+        """
+        self.sections.register(name, compute, inputs=inputs, requires=requires)
+        return self
+    
+    def _register_default_sections(self) -> None:
+        """Register the built-in analysis sections."""
+        self.sections.register(
+            'descriptive', self._descriptive_section, inputs=('numeric', 'moments')
+        )
+        self.sections.register('correlations', self._correlation_section, inputs=('numeric',))
+        self.sections.register('distributions', self._distribution_section, inputs=('numeric',))
+        self.sections.register(
+            'importance', self._importance_section,
+            outputs=('importance', 'importance_details')
+        )
+        self.sections.register(
+            'outliers', self._outlier_section, inputs=('numeric', 'moments')
+        )
+    
+    def _descriptive_section(self, context: AnalysisContext) -> Dict[str, Any]:
+        """Descriptive statistics from the shared matrix and moments."""
+        return self._cached_by_column(
+            'descriptive', context.data, context.fingerprints,
+            lambda frame: self._descriptive_stats(
+                frame, numeric=context.numeric(frame.columns),
+                moments=self._column_moments(context, frame.columns),
+                quartiles=self._column_quartiles(context, frame.columns)
+            ),
+            stat_major=True
+        )
+    
+    def _correlation_section(self, context: AnalysisContext) -> Dict[str, Any]:
+        """Correlations, reusing the shared ranks for rank methods."""
+        def fit_engine() -> CorrelationEngine:
+            ranks = context.get('ranks') if context.method != "pearson" else None
+            return self._fit_correlation_engine(context.get('numeric'), context.method, ranks)
+        
+        return self._correlation_analysis(
+            context.data, context.target, context.method, context.fingerprints,
+            engine=fit_engine, appended=context.appended,
+            moments=lambda: self._column_moments(context, context.fingerprints)
+        )
+    
+    def _distribution_section(self, context: AnalysisContext) -> Dict[str, Any]:
+        """Distribution analysis; moment-based normality tests reuse shared moments."""
+        def compute(frame: pd.DataFrame) -> Dict[str, Any]:
+            moments = None
+            if self.normality.test_name in MOMENT_TESTS:
+                moments = self._column_moments(context, frame.columns)
+            return self._distribution_analysis(
+                frame, numeric=context.numeric(frame.columns), moments=moments,
+                quartiles=self._column_quartiles(context, frame.columns)
+            )
+        
+        return self._cached_by_column(
+            'distributions', context.data, context.fingerprints, compute
+        )
+    
+    def _importance_section(
+        self,
+        context: AnalysisContext
+    ) -> Tuple[Dict[str, float], Optional[Dict[str, Any]]]:
+        """Feature importance (if target provided)."""
+        if not context.target or context.target not in context.data.columns:
+            return {}, None
+        return self._cached_feature_importance(
+            context.data, context.target, context.fingerprints
+        )
+    
+    def _outlier_section(self, context: AnalysisContext) -> Dict[str, Any]:
+        """Outlier detection from the shared matrix and moments."""
+        return self._cached_by_column(
+            'outliers', context.data, context.fingerprints,
+            lambda frame: self._detect_outliers(
+                frame, numeric=context.numeric(frame.columns),
+                moments=self._column_moments(context, frame.columns)
+            )
+        )
+    
+    def _column_moments(self, context: AnalysisContext, columns: Iterable[str]) -> MomentAccumulator:
+        """
+        Moments of some numeric columns, computed once per run.
+        
+        With the cache on, moments are also kept per column: unchanged
+        columns reuse them and columns that only gained rows merge them with
+        the moments of the new rows.
+        """
+        if not context.fingerprints:
+            return context.moments(columns)
+        
+        names = [col for col in columns if col in context.fingerprints]
+        return context.memoize(
+            ('column_moments', tuple(names)), lambda: self._cached_moments(context, names)
+        )
+    
+    def _cached_moments(self, context: AnalysisContext, columns: List[str]) -> MomentAccumulator:
+        """Per-column moments from the cache, merged with appended rows or computed."""
+        fingerprints = {col: context.fingerprints[col] for col in columns}
+        states, missing = self.cache.get_columns('moments', fingerprints)
+        
+        # Columns that only gained rows: cached moments plus those of the new rows
+        appended_by_rows: Dict[int, List[str]] = {}
+        for col in missing:
+            if col in context.appended:
+                previous_fingerprint, previous_rows = context.appended[col]
+                base, _ = self.cache.get_columns('moments', {col: previous_fingerprint})
+                if base:
+                    states[col] = base[col]
+                    appended_by_rows.setdefault(previous_rows, []).append(col)
+        
+        for previous_rows, names in appended_by_rows.items():
+            _, new_rows = self._numeric_matrix(context.data[names].iloc[previous_rows:])
+            added = MomentAccumulator(len(names)).update(new_rows)
+            for j, col in enumerate(names):
+                states[col].merge(added.select([j]))
+        
+        rest = [col for col in columns if col not in states]
+        if rest:
+            computed = context.moments(rest)
+            for j, col in enumerate(rest):
+                states[col] = computed.select([j])
+        
+        self.cache.put_columns('moments', fingerprints, {col: states[col] for col in missing})
+        return MomentAccumulator.concat([states[col] for col in columns])
+    
+    @staticmethod
+    def _column_quartiles(context: AnalysisContext, columns: Iterable[str]) -> np.ndarray:
+        """Quartiles of some numeric columns, shared by the sections of a run."""
+        names, X = context.numeric(columns)
+        return context.memoize(('quartiles', tuple(names)), lambda: _quartiles(X))
+    
+    def _descriptive_stats(
+        self,
+        data: pd.DataFrame,
+        numeric: Optional[Tuple[List[str], np.ndarray]] = None,
+        moments: Optional[MomentAccumulator] = None,
+        quartiles: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
         """Calculate descriptive statistics."""
-        numeric_data = data.select_dtypes(include=[np.number])
+        columns, X = numeric if numeric is not None else self._numeric_matrix(data)
+        if moments is None:
+            moments = MomentAccumulator(len(columns)).update(X)
+        if quartiles is None:
+            quartiles = _quartiles(X)
+        
+        # Order statistics need the values; the rest comes from the moments
+        median = quartiles[1]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            minimum = np.nanmin(X, axis=0) if X.size else np.full(len(columns), np.nan)
+            maximum = np.nanmax(X, axis=0) if X.size else np.full(len(columns), np.nan)
+        
+        def as_dict(values: np.ndarray) -> Dict[str, float]:
+            return dict(zip(columns, values.tolist()))
         
         stats_dict = {
-            'mean': numeric_data.mean().to_dict(),
-            'median': numeric_data.median().to_dict(),
-            'std': numeric_data.std().to_dict(),
-            'min': numeric_data.min().to_dict(),
-            'max': numeric_data.max().to_dict(),
-            'skewness': numeric_data.skew().to_dict(),
-            'kurtosis': numeric_data.kurtosis().to_dict()
+            'mean': as_dict(np.where(moments.n > 0, moments.mean, np.nan)),
+            'median': as_dict(median),
+            'std': as_dict(moments.std()),
+            'min': as_dict(minimum),
+            'max': as_dict(maximum),
+            'skewness': as_dict(moments.sample_skewness()),
+            'kurtosis': as_dict(moments.excess_kurtosis())
         }
         
         return stats_dict
@@ -82,66 +343,242 @@ class StatisticalAnalyzer:
     def _correlation_analysis(
         self,
         data: pd.DataFrame,
-        target: Optional[str] = None
+        target: Optional[str] = None,
+        method: str = "pearson",
+        fingerprints: Optional[Dict[str, str]] = None,
+        engine: Optional[Callable[[], CorrelationEngine]] = None,
+        appended: Optional[Dict[str, Tuple[str, int]]] = None,
+        moments: Optional[Callable[[], MomentAccumulator]] = None
     ) -> Dict[str, Any]:
-        """Analyze correlations between features."""
-        numeric_data = data.select_dtypes(include=[np.number])
+        """
+        Analyze correlations between features.
+        
+        ``engine`` builds the fitted correlation engine; with fingerprints
+        it is only called when some column is missing from the cache.
+        ``appended`` and ``moments`` (all columns) let a cached Pearson
+        matrix absorb appended rows without a recompute.
+        """
+        if engine is None:
+            engine = lambda: self._fit_correlation_engine(self._numeric_matrix(data), method)
         
-        # Pearson correlation
-        corr_matrix = numeric_data.corr()
+        if fingerprints is not None and len(fingerprints) <= self.max_matrix_columns:
+            columns = list(fingerprints)
+            matrix, n_rows = self._cached_correlation_matrix(
+                engine, method, data, fingerprints, appended or {}, moments
+            )
+            fitted = None
+        else:
+            fitted = engine()
+            columns, n_rows = fitted.columns, fitted.n_rows
+            if len(columns) > self.max_matrix_columns:
+                logger.info(
+                    f"Skipping full correlation matrix for {len(columns)} columns "
+                    f"(max_matrix_columns={self.max_matrix_columns})"
+                )
+                matrix = None
+            else:
+                matrix = fitted.matrix().to_numpy()
         
         results = {
-            'matrix': corr_matrix.to_dict(),
+            'method': method,
+            'n_rows': n_rows,
+            'matrix': {},
             'pairs': []
         }
         
-        # Find highly correlated pairs
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i + 1, len(corr_matrix.columns)):
-                col1 = corr_matrix.columns[i]
-                col2 = corr_matrix.columns[j]
-                corr_value = corr_matrix.iloc[i, j]
-                
-                if abs(corr_value) > 0.7:  # High correlation threshold
-                    results['pairs'].append({
-                        'feature1': col1,
-                        'feature2': col2,
-                        'correlation': float(corr_value)
-                    })
+        has_target = bool(target) and target in columns
+        
+        # Highly correlated pairs, taken from the matrix when there is one
+        if matrix is not None:
+            results['matrix'] = pd.DataFrame(matrix, index=columns, columns=columns).to_dict()
+            results['pairs'] = CorrelationEngine(block_size=self.correlation_block_size).pairs_from_matrix(
+                matrix, self.correlation_threshold, top_k=self.top_k_pairs, columns=columns
+            )
+            if has_target:
+                target_corr = pd.Series(matrix[:, columns.index(target)], index=columns)
+        elif has_target:
+            results['pairs'], target_corr = fitted.pairs_with_column(
+                target, self.correlation_threshold, top_k=self.top_k_pairs
+            )
+        else:
+            results['pairs'] = fitted.pairs(self.correlation_threshold, top_k=self.top_k_pairs)
         
         # Target correlations
-        if target and target in numeric_data.columns:
-            target_corr = corr_matrix[target].drop(target).sort_values(ascending=False)
+        if has_target:
+            target_corr = target_corr.drop(target).sort_values(ascending=False)
             results['target_correlations'] = target_corr.to_dict()
         
         return results
     
-    def _distribution_analysis(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def _fit_correlation_engine(
+        self,
+        numeric: Tuple[List[str], np.ndarray],
+        method: str,
+        ranks: Optional[np.ndarray] = None
+    ) -> CorrelationEngine:
+        """Correlation engine fitted on the numeric matrix."""
+        columns, X = numeric
+        engine = CorrelationEngine(
+            block_size=self.correlation_block_size,
+            method=method,
+            kendall_max_rows=self.kendall_max_rows
+        ).fit(X, columns, ranks=ranks)
+        
+        if engine.sampled:
+            logger.info(f"Computing {method} correlation on a sample of {engine.n_rows} rows")
+        
+        return engine
+    
+    def _cached_correlation_matrix(
+        self,
+        engine: Callable[[], CorrelationEngine],
+        method: str,
+        data: pd.DataFrame,
+        fingerprints: Dict[str, str],
+        appended: Dict[str, Tuple[str, int]],
+        moments: Optional[Callable[[], MomentAccumulator]] = None
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Correlation matrix reusing cached entries between unchanged columns.
+        
+        Pearson results on complete columns also keep each column's count,
+        mean and M2; with those, rows appended to every column are merged
+        into the cached co-moments instead of recomputing the matrix.
+        
+        Returns:
+            Tuple of the matrix and the number of rows it was computed on
+        """
+        columns = list(fingerprints)
+        p = len(columns)
+        n_rows = len(data)
+        params = (method, self.kendall_max_rows, n_rows)
+        key = (params, tuple((col, fingerprints[col]) for col in columns))
+        
+        latest = self.cache.get_latest('correlations')
+        merged = self._merge_appended_correlations(latest, method, data, columns, appended)
+        if merged is not None:
+            matrix, state = merged
+            self.cache.put('correlations', key, {'matrix': matrix, 'n_rows': n_rows, 'state': state})
+            return matrix, n_rows
+        
+        matrix = np.empty((p, p))
+        stale = list(range(p))
+        used_rows = None
+        
+        if latest is not None and latest[0][0] == params:
+            (_, previous_fingerprints), previous = latest
+            previous_matrix, used_rows = previous['matrix'], previous['n_rows']
+            position = {col: i for i, (col, _) in enumerate(previous_fingerprints)}
+            fresh = [
+                i for i, col in enumerate(columns)
+                if col in position and previous_fingerprints[position[col]][1] == fingerprints[col]
+            ]
+            if fresh:
+                source = [position[columns[i]] for i in fresh]
+                matrix[np.ix_(fresh, fresh)] = previous_matrix[np.ix_(source, source)]
+                fresh_set = set(fresh)
+                stale = [i for i in range(p) if i not in fresh_set]
+        
+        # Only pairs involving a changed column are recomputed
+        if stale or used_rows is None:
+            logger.info(f"Recomputing correlations for {len(stale)} of {p} columns")
+            fitted = engine()
+            rows = fitted.rows([columns[i] for i in stale])
+            matrix[stale, :] = rows
+            matrix[:, stale] = rows.T
+            used_rows = fitted.n_rows
+        
+        state = None
+        if method == "pearson" and moments is not None:
+            column_moments = moments()
+            # Co-moments only merge exactly when no value is missing
+            if (column_moments.n == n_rows).all():
+                state = {'n': n_rows, 'mean': column_moments.mean, 'M2': column_moments.M2}
+        
+        self.cache.put('correlations', key, {'matrix': matrix, 'n_rows': used_rows, 'state': state})
+        
+        return matrix, used_rows
+    
+    def _merge_appended_correlations(
+        self,
+        latest: Optional[Tuple[Any, Dict[str, Any]]],
+        method: str,
+        data: pd.DataFrame,
+        columns: List[str],
+        appended: Dict[str, Tuple[str, int]]
+    ) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+        """
+        Update a cached Pearson matrix with rows appended to every column.
+        
+        The cached matrix and M2 give the co-moment matrix of the old rows,
+        which is combined with that of the new rows by the pairwise
+        (Chan et al.) update. Returns None when the merge does not apply.
+        """
+        if method != "pearson" or latest is None or not appended:
+            return None
+        
+        (params, previous_fingerprints), previous = latest
+        state = previous.get('state')
+        if params[0] != "pearson" or state is None:
+            return None
+        if [col for col, _ in previous_fingerprints] != columns:
+            return None
+        if any(appended.get(col) != (fp, state['n']) for col, fp in previous_fingerprints):
+            return None
+        
+        _, new_rows = self._numeric_matrix(data[columns].iloc[state['n']:])
+        if np.isnan(new_rows).any():
+            return None
+        
+        n_a, n_b = state['n'], len(new_rows)
+        n = n_a + n_b
+        mean_b = new_rows.mean(axis=0)
+        centered = new_rows - mean_b
+        delta = mean_b - state['mean']
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Constant columns have NaN correlations and no co-moments
+            scale = np.sqrt(state['M2'])
+            comoments = (
+                np.nan_to_num(previous['matrix']) * np.outer(scale, scale)
+                + centered.T @ centered
+                + np.outer(delta, delta) * (n_a * n_b / n)
+            )
+            M2 = np.diag(comoments).copy()
+            norms = np.sqrt(M2)
+            matrix = np.clip(comoments / np.outer(norms, norms), -1.0, 1.0)
+        
+        logger.info(f"Merged {n_b} appended rows into cached correlations")
+        return matrix, {'n': n, 'mean': state['mean'] + delta * (n_b / n), 'M2': M2}
+    
+    def _distribution_analysis(
+        self,
+        data: pd.DataFrame,
+        numeric: Optional[Tuple[List[str], np.ndarray]] = None,
+        moments: Optional[MomentAccumulator] = None,
+        quartiles: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
         """Analyze distribution of numeric features."""
-        numeric_data = data.select_dtypes(include=[np.number])
+        columns, X = numeric if numeric is not None else self._numeric_matrix(data)
+        if quartiles is None:
+            quartiles = _quartiles(X)
+        
+        normality = self.normality.test(X, columns, moments=moments)
         
         distributions = {}
         
-        for col in numeric_data.columns:
-            # Normality test (Shapiro-Wilk)
-            if len(numeric_data[col].dropna()) > 3:
-                try:
-                    statistic, p_value = stats.shapiro(numeric_data[col].dropna()[:5000])
-                    is_normal = p_value > 0.05
-                except:
-                    is_normal = False
-                    p_value = 0.0
-            else:
-                is_normal = False
-                p_value = 0.0
-            
+        for j, col in enumerate(columns):
+            result = normality[col]
             distributions[col] = {
-                'is_normal': bool(is_normal),
-                'shapiro_p_value': float(p_value),
+                'is_normal': result['is_normal'],
+                'normality_test': result['test'],
+                'p_value': result['p_value'],
+                # Historical key, kept as an alias of p_value for every test
+                'shapiro_p_value': result['p_value'],
                 'quartiles': {
-                    'q25': float(numeric_data[col].quantile(0.25)),
-                    'q50': float(numeric_data[col].quantile(0.50)),
-                    'q75': float(numeric_data[col].quantile(0.75))
+                    'q25': float(quartiles[0, j]),
+                    'q50': float(quartiles[1, j]),
+                    'q75': float(quartiles[2, j])
                 }
             }
         
@@ -151,50 +588,110 @@ class StatisticalAnalyzer:
         self,
         data: pd.DataFrame,
         target: str
-    ) -> Dict[str, float]:
+    ) -> Tuple[Dict[str, float], Dict[str, Any]]:
         """Calculate feature importance using mutual information."""
         numeric_data = data.select_dtypes(include=[np.number])
         
         if target not in numeric_data.columns:
-            return {}
+            return {}, {}
         
         X = numeric_data.drop(columns=[target])
         y = numeric_data[target]
         
-        # Determine if regression or classification
-        if y.nunique() <= 20:
-            mi_scores = mutual_info_classif(X, y, random_state=42)
-        else:
-            mi_scores = mutual_info_regression(X, y, random_state=42)
-        
-        importance = dict(zip(X.columns, mi_scores))
-        
-        # Sort by importance
-        importance = dict(sorted(importance.items(), key=lambda x: x[1], reverse=True))
-        
-        return importance
+        return self.importance.compute(X, y)
     
     def _detect_outliers(
         self,
         data: pd.DataFrame,
-        threshold: float = 3.0
+        threshold: float = 3.0,
+        numeric: Optional[Tuple[List[str], np.ndarray]] = None,
+        moments: Optional[MomentAccumulator] = None
     ) -> Dict[str, Any]:
         """Detect outliers using Z-score method."""
-        numeric_data = data.select_dtypes(include=[np.number])
+        columns, X = numeric if numeric is not None else self._numeric_matrix(data)
+        if moments is None:
+            moments = MomentAccumulator(len(columns)).update(X)
+        
+        # Population z-scores over the non-null values of every column at once;
+        # NaN entries and constant columns never compare above the threshold
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(moments.n > 0, moments.mean, np.nan)
+            std = np.where(moments.is_constant(), np.nan, np.sqrt(moments.M2 / moments.n))
+            counts = (np.abs((X - mean) / std) > threshold).sum(axis=0)
         
+        n_rows = len(X)
         outliers = {}
         
-        for col in numeric_data.columns:
-            z_scores = np.abs(stats.zscore(numeric_data[col].dropna()))
-            outlier_indices = np.where(z_scores > threshold)[0]
-            
+        for col, count in zip(columns, counts.tolist()):
             outliers[col] = {
-                'count': int(len(outlier_indices)),
-                'percentage': float(len(outlier_indices) / len(numeric_data) * 100)
+                'count': int(count),
+                'percentage': float(count / n_rows * 100) if n_rows else float('nan')
             }
         
         return outliers
     
+    def _cached_feature_importance(
+        self,
+        data: pd.DataFrame,
+        target: str,
+        fingerprints: Optional[Dict[str, str]]
+    ) -> Tuple[Dict[str, float], Dict[str, Any]]:
+        """Feature importance, reused while no column or setting changed."""
+        if fingerprints is None:
+            return self._feature_importance(data, target)
+        
+        key = (
+            target,
+            tuple(sorted(vars(self.importance).items())),
+            tuple(fingerprints.items())
+        )
+        cached = self.cache.get('importance', key)
+        if cached is not None:
+            return cached
+        
+        result = self._feature_importance(data, target)
+        self.cache.put('importance', key, result)
+        return result
+    
+    def _cached_by_column(
+        self,
+        section: str,
+        data: pd.DataFrame,
+        fingerprints: Optional[Dict[str, str]],
+        compute: Callable[[pd.DataFrame], Dict[str, Any]],
+        stat_major: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run a per-column section, recomputing only columns missing from the cache.
+        
+        Sections return either {column: result} or, with stat_major,
+        {statistic: {column: value}}.
+        """
+        if not fingerprints:
+            return compute(data)
+        
+        hits, misses = self.cache.get_columns(section, fingerprints)
+        
+        if misses:
+            fresh = compute(data[misses])
+            if stat_major:
+                fresh = {col: {name: fresh[name][col] for name in fresh} for col in misses}
+            self.cache.put_columns(section, fingerprints, fresh)
+            hits.update(fresh)
+        
+        if stat_major:
+            names = next(iter(hits.values())).keys()
+            return {name: {col: hits[col][name] for col in fingerprints} for name in names}
+        
+        return {col: hits[col] for col in fingerprints}
+    
+    @staticmethod
+    def _numeric_matrix(data: pd.DataFrame) -> Tuple[List[str], np.ndarray]:
+        """Extract numeric columns as a 2-D float array with NaN for missing values."""
+        numeric_data = data.select_dtypes(include=[np.number])
+        X = numeric_data.to_numpy(dtype=np.float64, na_value=np.nan)
+        return numeric_data.columns.tolist(), X
+    
     def hypothesis_test(
         self,
         group1: pd.Series,
@@ -208,7 +705,7 @@ class StatisticalAnalyzer:
             group1: First group data
             group2: Second group data
             test_type: Type of test ('ttest', 'mannwhitney')
-            
+        
         Returns:
             Dictionary with test results
         """
@@ -224,3 +721,179 @@ class StatisticalAnalyzer:
             'p_value': float(p_value),
             'significant': bool(p_value < 0.05)
         }
+    
+    def hypothesis_test_batch(
+        self,
+        data: pd.DataFrame,
+        group_column: str,
+        value_columns: List[str],
+        test_types: Sequence[str] = ("ttest", "mannwhitney"),
+        reference: Optional[Any] = None,
+        correction: Optional[str] = "fdr_bh",
+        alpha: float = 0.05
+    ) -> pd.DataFrame:
+        """
+        Test every pair of groups on every value column in one call.
+        
+        T-tests are computed in closed form from per-group counts, means and
+        variances for all pairs and columns at once. Mann-Whitney runs one
+        SciPy call per group pair, vectorized across columns. Missing values
+        are dropped within each group. Results match ``hypothesis_test`` on
+        the same pair of Series.
+        
+        Args:
+            data: Input DataFrame
+            group_column: Column defining the groups
+            value_columns: Columns to compare between groups
+            test_types: Tests to run ('ttest', 'mannwhitney')
+            reference: If set, compare every group against this one only
+            correction: Multiple-comparison correction applied within each
+                test type ('bonferroni', 'fdr_bh', or None)
+            alpha: Significance level for the adjusted p-values
+        
+        Returns:
+            DataFrame with one row per (column, group pair, test)
+        """
+        for test_type in test_types:
+            if test_type not in ("ttest", "mannwhitney"):
+                raise ValueError(f"Unknown test type: {test_type}")
+        if correction not in (None, "bonferroni", "fdr_bh"):
+            raise ValueError(f"Unknown correction: {correction}")
+        
+        grouped = data.groupby(group_column, sort=True)[value_columns]
+        groups = list(grouped.groups.keys())
+        
+        if reference is not None:
+            if reference not in groups:
+                raise ValueError(f"Reference group not found: {reference}")
+            pairs = [(reference, g) for g in groups if g != reference]
+        else:
+            pairs = [
+                (groups[a], groups[b])
+                for a in range(len(groups)) for b in range(a + 1, len(groups))
+            ]
+        
+        columns = [
+            'value_column', 'group1', 'group2', 'test',
+            'n1', 'n2', 'statistic', 'p_value', 'p_adjusted', 'significant'
+        ]
+        if not pairs or not value_columns:
+            return pd.DataFrame(columns=columns)
+        
+        # Per-group counts as arrays aligned to the sorted group order
+        counts = grouped.count().to_numpy(dtype=np.float64)
+        position = {g: i for i, g in enumerate(groups)}
+        idx1 = np.array([position[g1] for g1, _ in pairs])
+        idx2 = np.array([position[g2] for _, g2 in pairs])
+        n1, n2 = counts[idx1], counts[idx2]
+        
+        frames = []
+        for test_type in test_types:
+            if test_type == "ttest":
+                statistic, p_value = self._batch_ttest(grouped, idx1, idx2, n1, n2)
+            else:
+                statistic, p_value = self._batch_mannwhitney(grouped, pairs, len(value_columns))
+            
+            frame = pd.DataFrame({
+                'value_column': np.tile(value_columns, len(pairs)),
+                'group1': np.repeat([g1 for g1, _ in pairs], len(value_columns)),
+                'group2': np.repeat([g2 for _, g2 in pairs], len(value_columns)),
+                'test': test_type,
+                'n1': n1.ravel().astype(int),
+                'n2': n2.ravel().astype(int),
+                'statistic': statistic.ravel(),
+                'p_value': p_value.ravel()
+            })
+            frame['p_adjusted'] = _adjust_p_values(frame['p_value'].to_numpy(), correction)
+            frame['significant'] = frame['p_adjusted'] < alpha
+            frames.append(frame)
+        
+        results = pd.concat(frames, ignore_index=True)
+        logger.info(
+            f"Ran {len(results)} hypothesis tests over {len(pairs)} group pairs "
+            f"and {len(value_columns)} columns"
+        )
+        
+        return results[columns]
+    
+    @staticmethod
+    def _batch_ttest(
+        grouped: "pd.core.groupby.DataFrameGroupBy",
+        idx1: np.ndarray,
+        idx2: np.ndarray,
+        n1: np.ndarray,
+        n2: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Student's t-test (pooled variance) for all pairs x columns."""
+        means = grouped.mean().to_numpy(dtype=np.float64)
+        variances = grouped.var(ddof=1).to_numpy(dtype=np.float64)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            dof = n1 + n2 - 2
+            pooled = ((n1 - 1) * variances[idx1] + (n2 - 1) * variances[idx2]) / dof
+            statistic = (means[idx1] - means[idx2]) / np.sqrt(pooled * (1 / n1 + 1 / n2))
+            p_value = 2 * stats.t.sf(np.abs(statistic), dof)
+        
+        return statistic, p_value
+    
+    @staticmethod
+    def _batch_mannwhitney(
+        grouped: "pd.core.groupby.DataFrameGroupBy",
+        pairs: List[Tuple[Any, Any]],
+        n_columns: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Mann-Whitney U for all pairs, vectorized across columns."""
+        values = {
+            name: frame.to_numpy(dtype=np.float64, na_value=np.nan)
+            for name, frame in grouped
+        }
+        statistic = np.full((len(pairs), n_columns), np.nan)
+        p_value = np.full((len(pairs), n_columns), np.nan)
+        
+        for k, (g1, g2) in enumerate(pairs):
+            x, y = values[g1], values[g2]
+            if len(x) == 0 or len(y) == 0:
+                continue
+            has_missing = np.isnan(x).any() or np.isnan(y).any()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                result = stats.mannwhitneyu(
+                    x, y, axis=0, nan_policy='omit' if has_missing else 'propagate'
+                )
+            statistic[k] = result.statistic
+            p_value[k] = result.pvalue
+        
+        return statistic, p_value
+
+
+def _quartiles(X: np.ndarray) -> np.ndarray:
+    """Quartiles (q25, median, q75) of every column in one NaN-aware pass."""
+    if X.size == 0:
+        return np.full((3, X.shape[1]), np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return np.nanquantile(X, [0.25, 0.50, 0.75], axis=0)
+
+
+def _adjust_p_values(p_values: np.ndarray, correction: Optional[str]) -> np.ndarray:
+    """Apply a multiple-comparison correction, ignoring NaN p-values."""
+    adjusted = np.array(p_values, dtype=np.float64)
+    valid = ~np.isnan(adjusted)
+    p = adjusted[valid]
+    m = len(p)
+    
+    if correction is None or m == 0:
+        return adjusted
+    
+    if correction == "bonferroni":
+        adjusted[valid] = np.minimum(p * m, 1.0)
+    else:
+        # Benjamini-Hochberg step-up: cumulative minimum from the largest p-value
+        order = np.argsort(p)
+        scaled = p[order] * m / np.arange(1, m + 1)
+        scaled = np.minimum.accumulate(scaled[::-1])[::-1]
+        bh = np.empty(m)
+        bh[order] = np.minimum(scaled, 1.0)
+        adjusted[valid] = bh
+    
+    return adjusted
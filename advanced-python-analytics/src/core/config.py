@@ -5,7 +5,7 @@ Handles loading and validation of application configuration.
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import yaml
 
 
@@ -57,6 +57,67 @@ class VisualizationConfig:
     ])
 
 
+@dataclass
+class AnalysisConfig:
+    """Statistical analysis configuration."""
+    n_jobs: int = 1
+    disabled_sections: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AnomalyConfig:
+    """Anomaly detection configuration."""
+    contamination: Any = 0.1
+    n_estimators: int = 100
+    max_samples: Any = "auto"
+    n_jobs: int = -1
+    random_state: int = 42
+    chunk_size: int = 100000
+    n_bins: int = 10
+    n_neighbors: int = 20
+    neighbor_algorithm: str = "auto"
+    support_fraction: Any = None
+
+
+@dataclass
+class SearchConfig:
+    """Hyperparameter search configuration."""
+    method: str = "halving"
+    n_trials: int = 27
+    cv: int = 3
+    factor: int = 3
+    resource: str = "n_samples"
+    min_resource: Optional[int] = None
+    n_jobs: int = -1
+    random_state: int = 42
+    spaces: Dict[str, Dict[str, Any]] = field(default_factory=lambda: {
+        "random_forest": {
+            "max_depth": [4, 6, 8, 12, None],
+            "min_samples_leaf": {"low": 1, "high": 20, "type": "int", "log": True},
+            "max_features": ["sqrt", 0.5, 1.0]
+        },
+        "xgboost": {
+            "learning_rate": {"low": 0.01, "high": 0.3, "log": True},
+            "max_depth": {"low": 2, "high": 10, "type": "int"},
+            "subsample": {"low": 0.5, "high": 1.0},
+            "colsample_bytree": {"low": 0.5, "high": 1.0}
+        },
+        "linear": {}
+    })
+
+
+@dataclass
+class IncrementalConfig:
+    """Incremental training configuration."""
+    trees_per_chunk: int = 10
+    max_trees: Optional[int] = None
+    rounds_per_chunk: int = 20
+    sgd: Dict[str, Any] = field(default_factory=lambda: {
+        "alpha": 0.0001,
+        "random_state": 42
+    })
+
+
 class Config:
     """Main configuration class."""
     
@@ -65,6 +126,10 @@ class Config:
         self.logging = LoggingConfig()
         self.models = ModelConfig()
         self.visualization = VisualizationConfig()
+        self.analysis = AnalysisConfig()
+        self.anomaly = AnomalyConfig()
+        self.search = SearchConfig()
+        self.incremental = IncrementalConfig()
     
     @classmethod
     def load(cls, config_path: str = "config.yaml") -> "Config":
@@ -106,6 +171,22 @@ class Config:
                 if 'visualization' in data:
                     for key, value in data['visualization'].items():
                         setattr(config.visualization, key, value)
+                
+                if 'analysis' in data:
+                    for key, value in data['analysis'].items():
+                        setattr(config.analysis, key, value)
+                
+                if 'anomaly' in data:
+                    for key, value in data['anomaly'].items():
+                        setattr(config.anomaly, key, value)
+                
+                if 'search' in data:
+                    for key, value in data['search'].items():
+                        setattr(config.search, key, value)
+                
+                if 'incremental' in data:
+                    for key, value in data['incremental'].items():
+                        setattr(config.incremental, key, value)
         
         except Exception as e:
             print(f"Warning: Could not load config file: {e}")
@@ -141,6 +222,39 @@ class Config:
                 'default_height': self.visualization.default_height,
                 'default_width': self.visualization.default_width,
                 'color_palette': self.visualization.color_palette
+            },
+            'analysis': {
+                'n_jobs': self.analysis.n_jobs,
+                'disabled_sections': self.analysis.disabled_sections
+            },
+            'anomaly': {
+                'contamination': self.anomaly.contamination,
+                'n_estimators': self.anomaly.n_estimators,
+                'max_samples': self.anomaly.max_samples,
+                'n_jobs': self.anomaly.n_jobs,
+                'random_state': self.anomaly.random_state,
+                'chunk_size': self.anomaly.chunk_size,
+                'n_bins': self.anomaly.n_bins,
+                'n_neighbors': self.anomaly.n_neighbors,
+                'neighbor_algorithm': self.anomaly.neighbor_algorithm,
+                'support_fraction': self.anomaly.support_fraction
+            },
+            'search': {
+                'method': self.search.method,
+                'n_trials': self.search.n_trials,
+                'cv': self.search.cv,
+                'factor': self.search.factor,
+                'resource': self.search.resource,
+                'min_resource': self.search.min_resource,
+                'n_jobs': self.search.n_jobs,
+                'random_state': self.search.random_state,
+                'spaces': self.search.spaces
+            },
+            'incremental': {
+                'trees_per_chunk': self.incremental.trees_per_chunk,
+                'max_trees': self.incremental.max_trees,
+                'rounds_per_chunk': self.incremental.rounds_per_chunk,
+                'sgd': self.incremental.sgd
             }
         }
         
@@ -0,0 +1,357 @@
+"""
+Alert dispatch module.
+Delivers alerts asynchronously to pluggable sinks with deduplication and rate limits.
+"""
+
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Callable, List, Optional, TextIO, Tuple
+
+import aiofiles
+import aiohttp
+
+from src.core.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class Alert:
+    """
+    An alert to deliver.
+    
+    Attributes:
+        key: Source of the alert (e.g. detector or series); rate limits apply per key
+        message: Human-readable summary
+        severity: Severity level (info, warning, critical)
+        count: Number of anomalous records behind the alert
+        records: Sample of the anomalous records
+        created_at: Unix time the alert was raised
+        suppressed: Duplicates suppressed since the previous delivery of this alert
+        dedup_key: Identity for deduplication within the key and severity
+            (None to use the message)
+    """
+    key: str
+    message: str
+    severity: str = "warning"
+    count: int = 0
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    suppressed: int = 0
+    dedup_key: Optional[str] = None
+    
+    @property
+    def fingerprint(self) -> str:
+        """Identity used for deduplication: key, severity and dedup key (or message)."""
+        identity = self.message if self.dedup_key is None else self.dedup_key
+        content = f"{self.key}\x1f{self.severity}\x1f{identity}"
+        return hashlib.sha1(content.encode()).hexdigest()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable representation."""
+        return asdict(self)
+
+
+class AlertSink:
+    """Destination for alert batches."""
+    
+    async def send(self, alerts: List[Alert]) -> None:
+        """
+        Deliver a batch of alerts.
+        
+        Args:
+            alerts: Alerts to deliver
+        """
+        raise NotImplementedError
+    
+    async def close(self) -> None:
+        """Release resources held by the sink."""
+
+
+class StdoutSink(AlertSink):
+    """Writes one JSON line per alert to a text stream."""
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Initialize stdout sink.
+        
+        Args:
+            stream: Text stream to write to (standard output by default)
+        """
+        self.stream = stream
+    
+    async def send(self, alerts: List[Alert]) -> None:
+        stream = self.stream or sys.stdout
+        stream.write("".join(json.dumps(alert.to_dict(), default=str) + "\n" for alert in alerts))
+        stream.flush()
+
+
+class FileSink(AlertSink):
+    """Appends one JSON line per alert to a file."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize file sink.
+        
+        Args:
+            path: File the alerts are appended to
+        """
+        self.path = path
+    
+    async def send(self, alerts: List[Alert]) -> None:
+        lines = "".join(json.dumps(alert.to_dict(), default=str) + "\n" for alert in alerts)
+        async with aiofiles.open(self.path, mode='a') as f:
+            await f.write(lines)
+
+
+class WebhookSink(AlertSink):
+    """Posts each batch of alerts as a JSON array to an HTTP endpoint."""
+    
+    def __init__(self, url: str, timeout: float = 5.0):
+        """
+        Initialize webhook sink.
+        
+        Args:
+            url: Endpoint receiving the POST requests
+            timeout: Request timeout in seconds
+        """
+        self.url = url
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def send(self, alerts: List[Alert]) -> None:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        
+        payload = json.dumps([alert.to_dict() for alert in alerts], default=str)
+        async with self._session.post(
+            self.url, data=payload, headers={'Content-Type': 'application/json'}
+        ) as response:
+            response.raise_for_status()
+    
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AlertDispatcher:
+    """
+    Asynchronous alert pipeline.
+    
+    ``submit`` never blocks and never awaits, so it is safe to call from
+    the ingestion loop. An alert is dropped there if an identical alert
+    (same fingerprint) was accepted within ``dedup_window`` seconds, or if
+    its key has used up its ``rate_limit`` alerts per ``rate_period``
+    (token bucket). Accepted alerts wait in a queue of at most
+    ``max_queue`` alerts; when it is full the oldest alert is discarded.
+    A background task delivers them in batches of up to ``batch_size``,
+    waiting at most ``flush_interval`` seconds to fill a batch, to all
+    sinks concurrently. A failing sink is logged and does not stop the
+    others or the pipeline.
+    
+    ``stats`` counts submitted alerts, the reason each rejected alert was
+    dropped, and deliveries (``delivered``/``failed``) per sink.
+    """
+    
+    def __init__(
+        self,
+        sinks: List[AlertSink],
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        dedup_window: float = 300.0,
+        rate_limit: int = 10,
+        rate_period: float = 60.0,
+        max_queue: int = 1000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize alert dispatcher.
+        
+        Args:
+            sinks: Destinations every batch is delivered to
+            batch_size: Maximum alerts per delivery
+            flush_interval: Seconds to wait for a batch to fill
+            dedup_window: Seconds during which identical alerts are suppressed
+            rate_limit: Alerts allowed per key in each ``rate_period``
+            rate_period: Seconds over which ``rate_limit`` applies
+            max_queue: Maximum alerts waiting for delivery
+            clock: Monotonic time source in seconds
+        """
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dedup_window = dedup_window
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self.max_queue = max_queue
+        self.clock = clock
+        
+        self.stats = {
+            'submitted': 0,
+            'deduplicated': 0,
+            'rate_limited': 0,
+            'dropped': 0,
+            'delivered': 0,
+            'failed': 0
+        }
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._last_seen: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+    
+    async def __aenter__(self) -> "AlertDispatcher":
+        self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    def start(self) -> "AlertDispatcher":
+        """
+        Start the delivery task on the running event loop.
+        
+        Returns:
+            Self for method chaining
+        """
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self
+    
+    def submit(self, alert: Alert) -> bool:
+        """
+        Queue an alert for delivery without blocking.
+        
+        Args:
+            alert: Alert to deliver
+        
+        Returns:
+            Whether the alert was queued
+        """
+        if self._worker is None:
+            self.start()
+        
+        self.stats['submitted'] += 1
+        now = self.clock()
+        fingerprint = alert.fingerprint
+        
+        last_seen = self._last_seen.get(fingerprint)
+        if last_seen is not None and now - last_seen < self.dedup_window:
+            self.stats['deduplicated'] += 1
+            self._suppressed[fingerprint] = self._suppressed.get(fingerprint, 0) + 1
+            return False
+        
+        if not self._take_token(alert.key, now):
+            self.stats['rate_limited'] += 1
+            return False
+        
+        if len(self._last_seen) > self.max_queue * 10:
+            self._prune(now)
+        self._last_seen[fingerprint] = now
+        alert.suppressed = self._suppressed.pop(fingerprint, 0)
+        
+        if self._queue.full():
+            # Under an alert storm the freshest alerts are the useful ones
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.stats['dropped'] += 1
+        self._queue.put_nowait(alert)
+        return True
+    
+    async def flush(self) -> None:
+        """Wait until every queued alert has been delivered or has failed."""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def close(self) -> None:
+        """Deliver the queued alerts, stop the delivery task and close the sinks."""
+        if self._worker is not None:
+            await self.flush()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        
+        for sink in self.sinks:
+            await sink.close()
+    
+    def _take_token(self, key: str, now: float) -> bool:
+        """Consume one token from the key's bucket if one is available."""
+        tokens, updated = self._buckets.get(key, (float(self.rate_limit), now))
+        tokens = min(float(self.rate_limit), tokens + (now - updated) * self.rate_limit / self.rate_period)
+        
+        if tokens < 1.0:
+            self._buckets[key] = (tokens, now)
+            return False
+        
+        self._buckets[key] = (tokens - 1.0, now)
+        return True
+    
+    def _prune(self, now: float) -> None:
+        """
+        Forget fingerprints and buckets that no longer affect any decision.
+        
+        Duplicates suppressed under an expired fingerprint are logged, since
+        no later alert will carry their count.
+        """
+        expired = [
+            fingerprint for fingerprint, seen in self._last_seen.items()
+            if now - seen >= self.dedup_window
+        ]
+        for fingerprint in expired:
+            del self._last_seen[fingerprint]
+            suppressed = self._suppressed.pop(fingerprint, 0)
+            if suppressed:
+                logger.info(f"Alert {fingerprint[:12]} expired with {suppressed} suppressed duplicates")
+        
+        self._buckets = {
+            key: (tokens, updated) for key, (tokens, updated) in self._buckets.items()
+            if now - updated < self.rate_period
+        }
+    
+    async def _run(self) -> None:
+        """Collect batches from the queue and deliver them."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _deliver(self, batch: List[Alert]) -> None:
+        """Send a batch to every sink concurrently."""
+        results = await asyncio.gather(
+            *(sink.send(batch) for sink in self.sinks), return_exceptions=True
+        )
+        
+        for sink, result in zip(self.sinks, results):
+            if isinstance(result, Exception):
+                self.stats['failed'] += len(batch)
+                logger.error(f"Alert sink {type(sink).__name__} failed: {result}")
+            else:
+                self.stats['delivered'] += len(batch)
@@ -0,0 +1,177 @@
+"""
+Categorical encoding module.
+Provides a compact store for label-encoded categorical vocabularies.
+"""
+
+from pathlib import Path
+from typing import Dict, List
+import pandas as pd
+import numpy as np
+
+from src.core.logger import setup_logger
+from src.core.exceptions import DataValidationError
+
+
+logger = setup_logger(__name__)
+
+
+# Code assigned to missing values and categories not seen during fitting
+UNKNOWN_CODE = -1
+
+
+class CategoricalEncoderStore:
+    """
+    Registry of label encodings for categorical columns.
+    
+    Each column's vocabulary is kept as one contiguous NumPy array, with a
+    hash-based ``pd.Index`` over it for lookups. Values are encoded through
+    pandas categorical codes, so columns are never copied to strings.
+    """
+    
+    def __init__(self):
+        self._vocabularies: Dict[str, np.ndarray] = {}
+        self._indexes: Dict[str, pd.Index] = {}
+    
+    def __contains__(self, column: str) -> bool:
+        return column in self._vocabularies
+    
+    def __len__(self) -> int:
+        return len(self._vocabularies)
+    
+    @property
+    def columns(self) -> List[str]:
+        """Names of the columns with a fitted vocabulary."""
+        return list(self._vocabularies)
+    
+    def vocabulary(self, column: str) -> np.ndarray:
+        """
+        Get the fitted vocabulary for a column.
+        
+        Args:
+            column: Column name
+        
+        Returns:
+            Array of categories; a category's position is its code
+        """
+        self._check_fitted(column)
+        return self._vocabularies[column]
+    
+    def fit_transform(self, column: str, values: pd.Series) -> np.ndarray:
+        """
+        Learn the vocabulary of a column and encode it.
+        
+        Args:
+            column: Column name to register the vocabulary under
+            values: Column values
+        
+        Returns:
+            Array of integer codes (UNKNOWN_CODE for missing values)
+        """
+        categorical = pd.Categorical(values)
+        self._register(column, categorical.categories)
+        return categorical.codes.astype(self._codes_dtype(column), copy=False)
+    
+    def transform(self, column: str, values: pd.Series) -> np.ndarray:
+        """
+        Encode a column with a previously fitted vocabulary.
+        
+        Args:
+            column: Column name
+            values: Column values
+        
+        Returns:
+            Array of integer codes (UNKNOWN_CODE for unseen or missing values)
+        """
+        self._check_fitted(column)
+        index = self._indexes[column]
+        
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Look up each distinct category once, then map through the codes
+            mapping = index.get_indexer(values.cat.categories)
+            source_codes = values.cat.codes.to_numpy()
+            codes = np.where(source_codes >= 0, mapping[source_codes], UNKNOWN_CODE)
+        else:
+            codes = index.get_indexer(values)
+        
+        return codes.astype(self._codes_dtype(column), copy=False)
+    
+    def inverse_transform(self, column: str, codes: np.ndarray) -> np.ndarray:
+        """
+        Map integer codes back to their categories.
+        
+        Args:
+            column: Column name
+            codes: Array of codes
+        
+        Returns:
+            Object array of categories (None where the code is UNKNOWN_CODE)
+        """
+        vocabulary = self.vocabulary(column).astype(object)
+        codes = np.asarray(codes)
+        result = np.full(len(codes), None, dtype=object)
+        known = codes != UNKNOWN_CODE
+        result[known] = vocabulary[codes[known]]
+        return result
+    
+    def save(self, path: str) -> None:
+        """
+        Save all vocabularies to a binary ``.npz`` file.
+        
+        Args:
+            path: File path to save the store
+        """
+        arrays = {'columns': np.array(self.columns, dtype=str)}
+        for i, (column, vocabulary) in enumerate(self._vocabularies.items()):
+            arrays[f'vocab_{i}'] = self._to_storable(column, vocabulary)
+        
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+        
+        logger.info(f"Saved {len(self)} categorical vocabularies to: {path}")
+    
+    @classmethod
+    def load(cls, path: str) -> "CategoricalEncoderStore":
+        """
+        Load vocabularies saved with ``save``.
+        
+        Args:
+            path: File path to load the store from
+        
+        Returns:
+            CategoricalEncoderStore instance
+        """
+        store = cls()
+        
+        with np.load(path, allow_pickle=False) as archive:
+            for i, column in enumerate(archive['columns'].tolist()):
+                store._register(column, pd.Index(archive[f'vocab_{i}']))
+        
+        logger.info(f"Loaded {len(store)} categorical vocabularies from: {path}")
+        return store
+    
+    def _register(self, column: str, categories: pd.Index) -> None:
+        """Store a vocabulary and its hash index."""
+        self._vocabularies[column] = np.ascontiguousarray(categories.to_numpy())
+        self._indexes[column] = categories
+    
+    def _codes_dtype(self, column: str) -> np.dtype:
+        """Smallest signed integer type able to hold every code of a column."""
+        return np.result_type(np.int8, np.min_scalar_type(len(self._vocabularies[column])))
+    
+    def _check_fitted(self, column: str) -> None:
+        if column not in self._vocabularies:
+            raise DataValidationError(f"No categorical vocabulary fitted for column: {column}")
+    
+    @staticmethod
+    def _to_storable(column: str, vocabulary: np.ndarray) -> np.ndarray:
+        """Convert a vocabulary to an array that can be saved without pickling."""
+        if vocabulary.dtype != object:
+            return vocabulary
+        
+        if pd.api.types.infer_dtype(vocabulary, skipna=False) in ('string', 'empty'):
+            return vocabulary.astype(str)
+        
+        raise DataValidationError(
+            f"Vocabulary for column '{column}' mixes types and cannot be saved"
+        )
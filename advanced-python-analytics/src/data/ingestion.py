@@ -4,6 +4,7 @@ Handles loading data from various sources (CSV, JSON, Excel, APIs).
 """
 
 import asyncio
+import json
 from pathlib import Path
 from typing import Optional, AsyncGenerator, Dict, Any
 import pandas as pd
@@ -11,6 +12,7 @@ import aiofiles
 
 from src.core.logger import setup_logger
 from src.core.exceptions import DataLoadError
+from src.data.alerts import Alert, AlertDispatcher
 
 
 logger = setup_logger(__name__)
@@ -102,9 +104,24 @@ class DataLoader:
 class StreamProcessor:
     """Handles real-time data stream processing."""
     
-    def __init__(self, batch_size: int = 100):
+    def __init__(
+        self,
+        batch_size: int = 100,
+        dispatcher: Optional[AlertDispatcher] = None,
+        max_alert_records: int = 5
+    ):
+        """
+        Initialize stream processor.
+        
+        Args:
+            batch_size: Records per streamed batch
+            dispatcher: Alert pipeline used by ``alert`` (None only logs alerts)
+            max_alert_records: Anomalous records included in each alert
+        """
         self.batch_size = batch_size
         self.buffer = []
+        self.dispatcher = dispatcher
+        self.max_alert_records = max_alert_records
     
     async def stream_data(
         self,
@@ -153,12 +170,44 @@ class StreamProcessor:
                 }
                 yield pd.DataFrame(data)
     
-    async def alert(self, data: pd.DataFrame) -> None:
+    async def alert(
+        self,
+        data: pd.DataFrame,
+        key: str = "anomaly",
+        severity: str = "warning",
+        dedup_key: Optional[str] = None
+    ) -> bool:
         """
         Send alert for anomalous data.
         
+        The alert is handed to the dispatcher without waiting for delivery,
+        so the ingestion loop is never blocked by slow or failing sinks.
+        
         Args:
             data: DataFrame containing anomalous records
+            key: Alert source; deduplication and rate limits apply per key
+            severity: Severity level (info, warning, critical)
+            dedup_key: Alerts of a key and severity with the same dedup key
+                are duplicates (None: same power-of-two bucket of record count)
+        
+        Returns:
+            Whether the alert was queued for delivery
         """
         logger.warning(f"ALERT: Detected {len(data)} anomalous records")
-        # In production, this would send actual notifications
+        
+        if self.dispatcher is None or data.empty:
+            return False
+        
+        if dedup_key is None:
+            # A batch twice as large as the last alerted one is news, similar sizes are not
+            dedup_key = f"records:{len(data).bit_length()}"
+        
+        sample = data.head(self.max_alert_records)
+        return self.dispatcher.submit(Alert(
+            key=key,
+            message=f"{len(data)} anomalous records detected by {key}",
+            severity=severity,
+            count=len(data),
+            records=json.loads(sample.to_json(orient='records', date_format='iso')),
+            dedup_key=dedup_key
+        ))
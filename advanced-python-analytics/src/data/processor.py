@@ -11,6 +11,7 @@ from sklearn.model_selection import train_test_split
 
 from src.core.logger import setup_logger
 from src.core.exceptions import DataValidationError
+from src.data.encoders import CategoricalEncoderStore
 
 
 logger = setup_logger(__name__)
@@ -21,8 +22,26 @@ class DataProcessor:
     
     def __init__(self):
         self.scaler = StandardScaler()
-        self.label_encoders: Dict[str, LabelEncoder] = {}
+        self.encoders = CategoricalEncoderStore()
         self.feature_columns: Optional[List[str]] = None
+        self._label_encoders: Dict[str, LabelEncoder] = {}
+    
+    @property
+    def label_encoders(self) -> Dict[str, LabelEncoder]:
+        """
+        Fitted label encodings as sklearn LabelEncoder objects.
+        
+        The view is cached, so the same encoder objects are returned until a
+        column is refitted in the encoder store.
+        """
+        for column in self.encoders.columns:
+            vocabulary = self.encoders.vocabulary(column)
+            encoder = self._label_encoders.get(column)
+            if encoder is None or getattr(encoder, 'classes_', None) is not vocabulary:
+                encoder = LabelEncoder()
+                encoder.classes_ = vocabulary
+                self._label_encoders[column] = encoder
+        return self._label_encoders
     
     def process(
         self,
@@ -153,9 +172,28 @@ class DataProcessor:
                     df.drop(col, axis=1, inplace=True)
                 else:
                     # Label encoding
-                    le = LabelEncoder()
-                    df[col] = le.fit_transform(df[col].astype(str))
-                    self.label_encoders[col] = le
+                    df[col] = self.encoders.fit_transform(col, df[col])
+        
+        return df
+    
+    def transform_categorical(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Encode new data with the label encodings fitted by ``process``.
+        
+        Categories not seen during fitting, and missing values, are encoded
+        as ``UNKNOWN_CODE``.
+        
+        Args:
+            df: DataFrame with the same label-encoded columns as the fitted data
+            
+        Returns:
+            DataFrame with those columns replaced by their integer codes
+        """
+        df = df.copy()
+        
+        for col in self.encoders.columns:
+            if col in df.columns:
+                df[col] = self.encoders.transform(col, df[col])
         
         return df
     
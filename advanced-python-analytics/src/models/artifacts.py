@@ -0,0 +1,391 @@
+"""
+Model artifact module.
+Saves MLPipeline models with memory-mapped arrays, lazy loading and versioned metadata.
+"""
+
+import io
+import json
+import pickle
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+
+try:
+    import xgboost as xgb
+    XGBOOST_AVAILABLE = True
+except ImportError:
+    XGBOOST_AVAILABLE = False
+
+from src.core.logger import setup_logger
+from src.core.exceptions import DataLoadError, ModelTrainingError
+from src.models.compiled import BatchRoutedModel, CompiledTreeEnsemble, compile_model
+from src.models.ml_pipeline import MLPipeline, FoldEnsemble
+
+
+logger = setup_logger(__name__)
+
+
+ARTIFACT_VERSION = 1
+METADATA_FILE = "metadata.json"
+MODEL_FILE = "model.pkl"
+COMPILED_FILE = "compiled.pkl"
+ARRAYS_FILE = "arrays.bin"
+# Arrays from this size on go to the mapped file; smaller ones stay in the pickle
+MIN_MAPPED_BYTES = 4096
+ALIGNMENT = 64
+
+
+def library_versions() -> Dict[str, str]:
+    """Versions of the libraries an artifact's estimator depends on."""
+    versions = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scikit-learn': sklearn.__version__
+    }
+    if XGBOOST_AVAILABLE:
+        versions['xgboost'] = xgb.__version__
+    return versions
+
+
+class _ArrayPickler(pickle.Pickler):
+    """Pickler writing large NumPy arrays to a separate binary file."""
+    
+    def __init__(
+        self,
+        file: io.BufferedIOBase,
+        arrays_file: io.BufferedIOBase,
+        manifest: Optional[List[Dict[str, Any]]] = None
+    ):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays_file = arrays_file
+        # Pickles sharing one arrays file share its manifest
+        self.manifest: List[Dict[str, Any]] = manifest if manifest is not None else []
+    
+    def persistent_id(self, obj: Any) -> Optional[int]:
+        if (
+            type(obj) is not np.ndarray
+            or obj.nbytes < MIN_MAPPED_BYTES
+            or obj.dtype.hasobject
+        ):
+            return None
+        
+        # Aligned offsets keep every mapped view properly aligned for its dtype
+        offset = self.arrays_file.tell()
+        padding = -offset % ALIGNMENT
+        self.arrays_file.write(b"\0" * padding)
+        self.arrays_file.write(np.ascontiguousarray(obj).tobytes())
+        
+        self.manifest.append({
+            'offset': offset + padding,
+            'dtype': np.lib.format.dtype_to_descr(obj.dtype),
+            'shape': list(obj.shape)
+        })
+        return len(self.manifest) - 1
+
+
+class _ArrayUnpickler(pickle.Unpickler):
+    """Unpickler resolving array references to views of the mapped file."""
+    
+    def __init__(self, file: io.BufferedIOBase, mapped: np.memmap, manifest: List[Dict[str, Any]]):
+        super().__init__(file)
+        self.mapped = mapped
+        self.manifest = manifest
+    
+    def persistent_load(self, pid: int) -> np.ndarray:
+        return _mapped_array(self.mapped, self.manifest[pid])
+
+
+def _mapped_array(mapped: np.memmap, entry: Dict[str, Any]) -> np.ndarray:
+    """Read-only view of one array in the mapped file."""
+    dtype = np.lib.format.descr_to_dtype(entry['dtype'])
+    shape = tuple(entry['shape'])
+    size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    return mapped[entry['offset']:entry['offset'] + size].view(dtype).reshape(shape).view(np.ndarray)
+
+
+class ArtifactArrays:
+    """
+    Memory-mapped arrays of an artifact.
+    
+    Opening maps ``arrays.bin`` read-only; arrays are views into the
+    mapping, so processes loading the same artifact share its pages
+    through the OS page cache instead of holding private copies.
+    """
+    
+    def __init__(self, path: str, manifest: List[Dict[str, Any]]):
+        """
+        Map the arrays file of an artifact.
+        
+        Args:
+            path: Artifact directory
+            manifest: Array entries from the artifact metadata
+        """
+        arrays_path = Path(path) / ARRAYS_FILE
+        self.manifest = manifest
+        if manifest and arrays_path.stat().st_size:
+            self.mapped = np.memmap(arrays_path, dtype=np.uint8, mode='r')
+        else:
+            self.mapped = np.zeros(0, dtype=np.uint8)
+    
+    def __len__(self) -> int:
+        return len(self.manifest)
+    
+    def __getitem__(self, index: int) -> np.ndarray:
+        return _mapped_array(self.mapped, self.manifest[index])
+
+
+class LazyModel:
+    """
+    Stand-in for an artifact's estimator that loads it on first use.
+    
+    Any attribute access (``predict``, ``classes_``, ...) loads the
+    estimator and delegates to it. Pickling the stand-in, e.g. to send it
+    to worker processes, keeps only the path, so each worker loads the
+    artifact itself instead of receiving a pickled copy.
+    
+    Arrays the estimator keeps as they were unpickled (compiled node
+    arrays, linear coefficients) stay views of the mapping and are shared
+    between processes. scikit-learn trees copy their nodes into private
+    memory when unpickled and XGBoost boosters are rebuilt from bytes, so
+    a forest or booster loaded from ``model.pkl`` is one copy per process;
+    load the compiled model (``load_artifact(..., compiled=True)``) to
+    share one physical copy of the trees for small batches.
+    """
+    
+    def __init__(self, path: str, manifest: List[Dict[str, Any]], file: str = MODEL_FILE):
+        """
+        Initialize lazy model.
+        
+        Args:
+            path: Artifact directory
+            manifest: Array entries from the artifact metadata
+            file: Pickle of the model within the artifact
+        """
+        self._path = str(path)
+        self._manifest = manifest
+        self._file = file
+        self._model = None
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether the estimator has been loaded."""
+        return self._model is not None
+    
+    def load(self) -> Any:
+        """
+        Load the estimator, mapping its large arrays.
+        
+        Returns:
+            The estimator
+        """
+        if self._model is None:
+            arrays = ArtifactArrays(self._path, self._manifest)
+            with open(Path(self._path) / self._file, 'rb') as f:
+                self._model = _ArrayUnpickler(f, arrays.mapped, self._manifest).load()
+            logger.debug(f"Loaded estimator from artifact: {self._path}")
+        return self._model
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__') or name in ('_path', '_manifest', '_file', '_model'):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+    
+    def __reduce__(self):
+        return (LazyModel, (self._path, self._manifest, self._file))
+
+
+def _loaded(model: Any) -> Any:
+    """The model itself, loading it first if it is a LazyModel."""
+    return model.load() if isinstance(model, LazyModel) else model
+
+
+def _native_batch_rows(compiled: Any) -> int:
+    """Batch rows from which a compiled model's source predicts faster."""
+    if isinstance(compiled, FoldEnsemble):
+        return min(_native_batch_rows(fold_model) for fold_model in compiled.models)
+    return compiled.native_batch_rows
+
+
+def _compiled_model(model: Any, problem_type: str) -> Optional[Any]:
+    """Compiled form of a tree ensemble or fold ensemble of them; None for other models."""
+    if isinstance(model, FoldEnsemble):
+        members = [_compiled_model(fold_model, problem_type) for fold_model in model.models]
+        return FoldEnsemble(members, problem_type) if all(m is not None for m in members) else None
+    if isinstance(model, (RandomForestRegressor, RandomForestClassifier)) or (
+        XGBOOST_AVAILABLE and isinstance(model, (xgb.XGBRegressor, xgb.XGBClassifier))
+    ):
+        return compile_model(model)
+    return None
+
+
+def save_artifact(
+    pipeline: MLPipeline,
+    path: str,
+    compiled: Optional[bool] = None,
+    batch_rows: int = 1
+) -> Dict[str, Any]:
+    """
+    Save a trained pipeline as an artifact directory.
+    
+    The directory holds ``metadata.json`` (format version, features,
+    target, problem type, estimator class, library versions, training
+    data fingerprint and the array manifest), ``model.pkl`` with the
+    estimator, and ``arrays.bin`` with every NumPy array of at least
+    ``MIN_MAPPED_BYTES`` (tree nodes, coefficients) stored raw at aligned
+    offsets so loading can memory-map them.
+    
+    Random forests and XGBoost models can also be stored compiled
+    (``compiled.pkl``, see CompiledTreeEnsemble), whose node arrays stay
+    mapped after loading; the estimators themselves copy their trees
+    into each loading process. The compiled form only pays off below its
+    ``native_batch_rows``, so by default it is stored when the expected
+    ``batch_rows`` per prediction call is below that cutoff.
+    
+    Args:
+        pipeline: Trained pipeline
+        path: Artifact directory (created if missing)
+        compiled: Whether to also store the compiled form of tree ensembles
+            (None to decide from ``batch_rows``)
+        batch_rows: Expected rows per prediction call when serving
+    
+    Returns:
+        The artifact metadata
+    """
+    if pipeline.model is None:
+        raise ModelTrainingError("No model to save")
+    
+    model = _loaded(pipeline.model)
+    if isinstance(model, BatchRoutedModel):
+        model, compiled_model = _loaded(model.source), _loaded(model.compiled)
+    else:
+        compiled_model = _compiled_model(model, pipeline.problem_type)
+    
+    native_batch_rows = None
+    if compiled_model is not None:
+        native_batch_rows = _native_batch_rows(compiled_model)
+    elif isinstance(model, CompiledTreeEnsemble):
+        native_batch_rows = model.native_batch_rows
+    
+    if compiled is None:
+        compiled = native_batch_rows is not None and batch_rows < native_batch_rows
+    if not compiled:
+        compiled_model = None
+    
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / COMPILED_FILE).unlink(missing_ok=True)
+    
+    with open(directory / MODEL_FILE, 'wb') as f, open(directory / ARRAYS_FILE, 'wb') as arrays_file:
+        pickler = _ArrayPickler(f, arrays_file)
+        pickler.dump(model)
+        if compiled_model is not None:
+            with open(directory / COMPILED_FILE, 'wb') as compiled_file:
+                _ArrayPickler(compiled_file, arrays_file, pickler.manifest).dump(compiled_model)
+        arrays_bytes = arrays_file.tell()
+    
+    metadata = {
+        'format_version': ARTIFACT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'model_type': pipeline.model_type,
+        'problem_type': pipeline.problem_type,
+        'feature_columns': pipeline.feature_columns,
+        'target_column': pipeline.target_column,
+        'estimator': f"{type(model).__module__}.{type(model).__qualname__}",
+        'data_fingerprint': pipeline.data_fingerprint,
+        'compiled': compiled_model is not None or isinstance(model, CompiledTreeEnsemble),
+        'native_batch_rows': native_batch_rows,
+        'versions': library_versions(),
+        'arrays_bytes': arrays_bytes,
+        'arrays': pickler.manifest
+    }
+    with open(directory / METADATA_FILE, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    
+    logger.info(f"Artifact saved to: {path} ({len(pickler.manifest)} mapped arrays, {arrays_bytes} bytes)")
+    return metadata
+
+
+def read_metadata(path: str) -> Dict[str, Any]:
+    """
+    Read and check the metadata of an artifact.
+    
+    Args:
+        path: Artifact directory
+    
+    Returns:
+        The artifact metadata
+    """
+    metadata_path = Path(path) / METADATA_FILE
+    if not metadata_path.exists():
+        raise DataLoadError(f"No model artifact found at: {path}")
+    
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+    
+    version = metadata.get('format_version')
+    if not isinstance(version, int) or version > ARTIFACT_VERSION:
+        raise DataLoadError(
+            f"Artifact format version {version} is not supported (latest is {ARTIFACT_VERSION})"
+        )
+    
+    current = library_versions()
+    for library, saved in metadata.get('versions', {}).items():
+        if library != 'python' and current.get(library) != saved:
+            logger.warning(f"Artifact was saved with {library} {saved}, running {current.get(library)}")
+    
+    return metadata
+
+
+def load_artifact(path: str, lazy: bool = True, compiled: bool = False) -> MLPipeline:
+    """
+    Load a pipeline from an artifact directory.
+    
+    Only the metadata is read up front; with ``lazy=True`` the estimator is
+    unpickled on first use, with its large arrays mapped from
+    ``arrays.bin`` rather than read into memory.
+    
+    Unpickling copies scikit-learn tree nodes and XGBoost boosters into
+    the loading process, so every process loading an estimator holds its
+    own copy of the trees. With ``compiled=True`` batches below the
+    artifact's ``native_batch_rows`` are predicted by the stored
+    CompiledTreeEnsemble, whose node arrays remain read-only views of the
+    mapping shared by every process serving the artifact; the estimator
+    is only loaded once a larger batch arrives (BatchRoutedModel).
+    
+    Args:
+        path: Artifact directory
+        lazy: Whether to defer loading the model until first use
+        compiled: Whether to predict small batches with the compiled tree ensemble
+    
+    Returns:
+        MLPipeline instance with the artifact's model
+    """
+    metadata = read_metadata(path)
+    if compiled and not metadata.get('compiled'):
+        raise DataLoadError(f"Artifact has no compiled model: {path}")
+    
+    pipeline = MLPipeline(model_type=metadata['model_type'], problem_type=metadata['problem_type'])
+    pipeline.feature_columns = metadata['feature_columns']
+    pipeline.target_column = metadata['target_column']
+    pipeline.data_fingerprint = metadata.get('data_fingerprint')
+    
+    model = LazyModel(path, metadata['arrays'])
+    if compiled and (Path(path) / COMPILED_FILE).exists():
+        compiled_model = LazyModel(path, metadata['arrays'], COMPILED_FILE)
+        # The estimator stays lazy either way; it is only needed for large batches
+        pipeline.model = BatchRoutedModel(
+            compiled_model if lazy else compiled_model.load(), model, metadata['native_batch_rows']
+        )
+    else:
+        # An artifact saved from a bare compiled ensemble holds it in model.pkl
+        pipeline.model = model if lazy else model.load()
+    
+    logger.info(f"Model artifact loaded from: {path}")
+    return pipeline
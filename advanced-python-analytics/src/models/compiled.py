@@ -0,0 +1,454 @@
+"""
+Compiled model module.
+Flattens tree ensembles into contiguous node arrays for vectorized NumPy inference.
+"""
+
+import json
+from typing import Optional, Dict, Any, List, Tuple
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+
+try:
+    import xgboost as xgb
+    XGBOOST_AVAILABLE = True
+except ImportError:
+    XGBOOST_AVAILABLE = False
+
+from src.core.logger import setup_logger
+from src.core.exceptions import ModelTrainingError, PredictionError
+
+
+logger = setup_logger(__name__)
+
+
+# (row, tree) pairs traversed together; small enough to stay in cache
+BLOCK_CELLS = 1 << 16
+# Share of pairs still inside the trees below which the rest is compacted
+COMPACT_FRACTION = 0.5
+
+# Batch rows from which the source library's native traversal is faster,
+# by (kind, problem type); crossovers measured with
+# examples/compiled_benchmark.py on one core, rounded down
+NATIVE_BATCH_ROWS = {
+    ('forest', 'regression'): 2048,
+    ('forest', 'classification'): 512,
+    ('boosting', 'regression'): 64,
+    ('boosting', 'classification'): 16
+}
+
+LINK_FUNCTIONS = {
+    'reg:squarederror': 'identity',
+    'reg:squaredlogerror': 'identity',
+    'reg:pseudohubererror': 'identity',
+    'reg:absoluteerror': 'identity',
+    'reg:quantileerror': 'identity',
+    'reg:logistic': 'logistic',
+    'binary:logistic': 'logistic',
+    'multi:softprob': 'softmax',
+    'multi:softmax': 'softmax'
+}
+
+
+class CompiledTreeEnsemble:
+    """
+    Tree ensemble stored as flat node arrays.
+    
+    All trees share one set of arrays (children, split feature, threshold,
+    missing-value direction, leaf value) and start at ``roots``. A batch is
+    traversed by rounds of vectorized NumPy gathers that move every
+    (row, tree) pair one level down at once, with no per-sample or per-tree
+    Python work; pairs that reached a leaf are dropped once they are the
+    majority, so deep trees do not cost full rounds for shallow paths.
+    
+    Splits follow the source library exactly. Inputs are cast to float32
+    like sklearn and XGBoost do, and a pair goes right when
+    ``x > threshold``, with thresholds stored as float32: sklearn's float64
+    ``x <= threshold`` becomes the largest float32 not above it, and
+    XGBoost's strict ``x < split`` the next float32 below the split.
+    Forests average leaf values (class probabilities for classifiers);
+    boosted models add leaf values to a per-output margin and apply the
+    objective's link function.
+    
+    Per call the cost is a few dozen NumPy operations rather than the
+    source library's per-call setup, which makes single rows and small
+    batches (the serving case) several times to tens of times cheaper.
+    From ``native_batch_rows`` rows on the source library's native
+    traversal is faster (see examples/compiled_benchmark.py);
+    BatchRoutedModel sends such batches to the source model.
+    """
+    
+    def __init__(
+        self,
+        arrays: Dict[str, np.ndarray],
+        kind: str,
+        problem_type: str,
+        n_features: int,
+        max_depth: int,
+        classes: Optional[np.ndarray] = None,
+        link: str = "identity",
+        feature_importances: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize compiled ensemble; use ``compile_model`` to build one.
+        
+        Args:
+            arrays: Node arrays 'children' (2 per node), 'feature',
+                'is_leaf', 'threshold', 'missing_left', 'value' (nodes x outputs),
+                'roots' and, for boosting, 'tree_output' and 'intercept'
+            kind: 'forest' (averaged trees) or 'boosting' (summed trees)
+            problem_type: 'regression' or 'classification'
+            n_features: Number of input features
+            max_depth: Depth of the deepest tree
+            classes: Class labels (classification)
+            link: 'identity', 'logistic' or 'softmax' (boosting)
+            feature_importances: Importances of the source model
+        """
+        self.arrays = arrays
+        self.kind = kind
+        self.problem_type = problem_type
+        self.n_features = n_features
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.link = link
+        self.feature_importances_ = feature_importances
+    
+    @property
+    def n_trees(self) -> int:
+        """Number of trees."""
+        return len(self.arrays['roots'])
+    
+    @property
+    def n_nodes(self) -> int:
+        """Number of nodes over all trees."""
+        return len(self.arrays['feature'])
+    
+    @property
+    def native_batch_rows(self) -> int:
+        """Batch rows from which the source model predicts faster."""
+        return NATIVE_BATCH_ROWS[(self.kind, self.problem_type)]
+    
+    def apply(self, X: Any) -> np.ndarray:
+        """
+        Leaf reached in every tree.
+        
+        Args:
+            X: Feature matrix (array or DataFrame in training column order)
+        
+        Returns:
+            Array of global node indices, rows x trees
+        """
+        X = self._check_input(X)
+        block = max(1, BLOCK_CELLS // self.n_trees)
+        leaves = np.empty((len(X), self.n_trees), dtype=np.intp)
+        for start in range(0, len(X), block):
+            leaves[start:start + block] = self._traverse(X[start:start + block])
+        return leaves
+    
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predict targets (regression) or class labels (classification).
+        
+        Args:
+            X: Feature matrix
+        
+        Returns:
+            Array of predictions
+        """
+        output = self._output(X)
+        if self.problem_type == "regression":
+            return output[:, 0]
+        if output.shape[1] == 1:
+            return self.classes_[(output[:, 0] > 0.5).astype(np.intp)]
+        return self.classes_[np.argmax(output, axis=1)]
+    
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Predict class probabilities (classification only).
+        
+        Args:
+            X: Feature matrix
+        
+        Returns:
+            Array of probabilities, rows x classes
+        """
+        if self.problem_type != "classification":
+            raise PredictionError("predict_proba only available for classification")
+        output = self._output(X)
+        if output.shape[1] == 1:
+            return np.column_stack([1 - output[:, 0], output[:, 0]])
+        return output
+    
+    def _check_input(self, X: Any) -> np.ndarray:
+        """Convert inputs to the float32 matrix the source models split on."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise PredictionError(f"Expected {self.n_features} features, got shape {X.shape}")
+        return X
+    
+    def _traverse(self, X: np.ndarray) -> np.ndarray:
+        """Walk a block of rows down every tree at once."""
+        a = self.arrays
+        n_rows, n_trees = len(X), self.n_trees
+        flat_X = X.ravel()
+        has_missing = bool(np.isnan(flat_X).any())
+        
+        # One cell per (row, tree) pair; offsets index each row in flat_X
+        nodes = np.tile(a['roots'], n_rows)
+        offsets = np.repeat(np.arange(n_rows, dtype=np.intp) * X.shape[1], n_trees)
+        leaves = np.empty(n_rows * n_trees, dtype=np.intp)
+        cells = np.arange(n_rows * n_trees)
+        
+        for _ in range(self.max_depth):
+            x = flat_X[offsets + a['feature'][nodes]]
+            go_right = x > a['threshold'][nodes]
+            if has_missing:
+                go_right |= np.isnan(x) & ~a['missing_left'][nodes]
+            nodes = a['children'][2 * nodes + go_right]
+            
+            active = ~a['is_leaf'][nodes]
+            n_active = np.count_nonzero(active)
+            if n_active < COMPACT_FRACTION * len(nodes):
+                leaves[cells] = nodes
+                if not n_active:
+                    return leaves.reshape(n_rows, n_trees)
+                cells, nodes, offsets = cells[active], nodes[active], offsets[active]
+        
+        leaves[cells] = nodes
+        return leaves.reshape(n_rows, n_trees)
+    
+    def _output(self, X: Any) -> np.ndarray:
+        """Averaged leaf values (forest) or linked margins (boosting), rows x outputs."""
+        leaves = self.apply(X)
+        value = self.arrays['value']
+        
+        if self.kind == "forest":
+            return value[leaves].sum(axis=1) / self.n_trees
+        
+        # Each boosted tree adds its single leaf value to one output's margin
+        n_outputs = len(self.arrays['intercept'])
+        tree_weights = np.zeros((self.n_trees, n_outputs))
+        tree_weights[np.arange(self.n_trees), self.arrays['tree_output']] = 1.0
+        margin = value[leaves, 0] @ tree_weights + self.arrays['intercept']
+        
+        if self.link == "logistic":
+            return 1.0 / (1.0 + np.exp(-margin))
+        if self.link == "softmax":
+            exp = np.exp(margin - margin.max(axis=1, keepdims=True))
+            return exp / exp.sum(axis=1, keepdims=True)
+        return margin
+
+
+class BatchRoutedModel:
+    """
+    Compiled model for small batches, source model for large ones.
+    
+    Batches below ``native_batch_rows`` rows go to the compiled model,
+    larger ones to the source model, so each batch size gets the faster
+    path. Both give the same predictions.
+    """
+    
+    def __init__(self, compiled: Any, source: Any, native_batch_rows: int):
+        """
+        Initialize batch-routed model.
+        
+        Args:
+            compiled: Compiled model (or fold ensemble of compiled models)
+            source: Model it was compiled from
+            native_batch_rows: Batch rows from which the source model is used
+        """
+        self.compiled = compiled
+        self.source = source
+        self.native_batch_rows = native_batch_rows
+    
+    def predict(self, X: Any) -> np.ndarray:
+        """Predict with the model that is faster for the batch size."""
+        return self._route(X).predict(X)
+    
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Predict class probabilities with the model that is faster for the batch size."""
+        return self._route(X).predict_proba(X)
+    
+    @property
+    def classes_(self) -> np.ndarray:
+        """Class labels (classification)."""
+        return self.compiled.classes_
+    
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        """Feature importances of the source model."""
+        return self.compiled.feature_importances_
+    
+    def _route(self, X: Any) -> Any:
+        """Model predicting a batch of ``len(X)`` rows."""
+        return self.source if len(X) >= self.native_batch_rows else self.compiled
+
+
+def compile_model(model: Any) -> CompiledTreeEnsemble:
+    """
+    Compile a fitted random forest or XGBoost model.
+    
+    Args:
+        model: Fitted RandomForestRegressor, RandomForestClassifier,
+            XGBRegressor or XGBClassifier
+    
+    Returns:
+        Compiled ensemble predicting like the model
+    """
+    if isinstance(model, (RandomForestRegressor, RandomForestClassifier)):
+        compiled = _compile_forest(model)
+    elif XGBOOST_AVAILABLE and isinstance(model, (xgb.XGBRegressor, xgb.XGBClassifier)):
+        compiled = _compile_xgboost(model)
+    else:
+        raise ModelTrainingError(f"Cannot compile {type(model).__name__}; only random forests and XGBoost models")
+    
+    logger.info(
+        f"Compiled {type(model).__name__}: {compiled.n_trees} trees, "
+        f"{compiled.n_nodes} nodes, depth {compiled.max_depth}"
+    )
+    return compiled
+
+
+def _flatten(
+    trees: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Concatenate per-tree node arrays, making leaves point to themselves.
+    
+    Args:
+        trees: Per tree (left, right, feature, float32 threshold with
+            right meaning ``x > threshold``, missing_left, value) with -1
+            children marking leaves
+    
+    Returns:
+        Tuple of the flat arrays and the depth of the deepest tree
+    """
+    sizes = np.array([len(tree[0]) for tree in trees])
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+    
+    children, features, depths = [], [], []
+    for (left, right, feature, _, _, _), root in zip(trees, roots):
+        index = np.arange(len(left), dtype=np.intp) + root
+        is_leaf = left < 0
+        children.append(np.column_stack([
+            np.where(is_leaf, index, left + root),
+            np.where(is_leaf, index, right + root)
+        ]).ravel())
+        features.append(np.where(is_leaf, 0, feature).astype(np.intp))
+        depths.append(_tree_depth(left, right))
+    
+    arrays = {
+        'children': np.concatenate(children),
+        'feature': np.concatenate(features),
+        'is_leaf': np.concatenate([tree[0] < 0 for tree in trees]),
+        'threshold': np.concatenate([tree[3] for tree in trees]).astype(np.float32),
+        'missing_left': np.concatenate([tree[4] for tree in trees]).astype(bool),
+        'value': np.concatenate([tree[5] for tree in trees]).astype(np.float64),
+        'roots': roots
+    }
+    return arrays, max(depths)
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Depth of a tree given its child arrays."""
+    depth, level = 0, np.array([0])
+    while True:
+        level = level[left[level] >= 0]
+        if not len(level):
+            return depth
+        level = np.concatenate([left[level], right[level]])
+        depth += 1
+
+
+def _compile_forest(model: Any) -> CompiledTreeEnsemble:
+    """Flatten the trees of a fitted sklearn random forest."""
+    if model.n_outputs_ != 1:
+        raise ModelTrainingError("Only single-output forests can be compiled")
+    
+    trees = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :]
+        if isinstance(model, RandomForestClassifier):
+            # Leaf class fractions, as DecisionTreeClassifier.predict_proba normalizes them
+            value = value / value.sum(axis=1, keepdims=True)
+        # x <= t for float32 x and float64 t holds exactly when x <= the float32 floor of t
+        threshold = tree.threshold.astype(np.float32)
+        threshold = np.where(threshold > tree.threshold, np.nextafter(threshold, np.float32(-np.inf)), threshold)
+        trees.append((
+            tree.children_left, tree.children_right, tree.feature,
+            threshold, tree.missing_go_to_left, value
+        ))
+    
+    arrays, max_depth = _flatten(trees)
+    is_classifier = isinstance(model, RandomForestClassifier)
+    return CompiledTreeEnsemble(
+        arrays,
+        kind="forest",
+        problem_type="classification" if is_classifier else "regression",
+        n_features=model.n_features_in_,
+        max_depth=max_depth,
+        classes=model.classes_ if is_classifier else None,
+        feature_importances=model.feature_importances_
+    )
+
+
+def _compile_xgboost(model: Any) -> CompiledTreeEnsemble:
+    """Flatten the trees of a fitted XGBoost scikit-learn model."""
+    booster = model.get_booster()
+    learner = json.loads(booster.save_raw('json'))['learner']
+    objective = learner['objective']['name']
+    if objective not in LINK_FUNCTIONS:
+        raise ModelTrainingError(f"Cannot compile XGBoost objective: {objective}")
+    
+    forest = learner['gradient_booster']['model']
+    n_trees = len(forest['trees'])
+    best_iteration = getattr(model, 'best_iteration', None)
+    if best_iteration is not None:
+        # The scikit-learn wrapper predicts with the trees up to the best iteration
+        n_trees = forest['iteration_indptr'][best_iteration + 1]
+    
+    trees = []
+    for tree in forest['trees'][:n_trees]:
+        if any(tree['split_type']):
+            raise ModelTrainingError("XGBoost models with categorical splits cannot be compiled")
+        left = np.array(tree['left_children'], dtype=np.intp)
+        split = np.array(tree['split_conditions'], dtype=np.float32)
+        # x >= split on float32 inputs equals x > the next float32 below split
+        threshold = np.nextafter(split, np.float32(-np.inf))
+        trees.append((
+            left, np.array(tree['right_children'], dtype=np.intp),
+            np.array(tree['split_indices'], dtype=np.intp), threshold,
+            np.array(tree['default_left'], dtype=bool),
+            # A leaf's value is stored in its split condition
+            np.where(left < 0, split, 0.0)[:, None]
+        ))
+    
+    arrays, max_depth = _flatten(trees)
+    n_outputs = max(1, int(learner['learner_model_param'].get('num_class', '0')))
+    arrays['tree_output'] = np.array(forest['tree_info'][:n_trees], dtype=np.intp)
+    arrays['intercept'] = np.zeros(n_outputs)
+    
+    is_classifier = isinstance(model, xgb.XGBClassifier)
+    compiled = CompiledTreeEnsemble(
+        arrays,
+        kind="boosting",
+        problem_type="classification" if is_classifier else "regression",
+        n_features=model.n_features_in_,
+        max_depth=max_depth,
+        classes=model.classes_ if is_classifier else None,
+        link=LINK_FUNCTIONS[objective],
+        feature_importances=model.feature_importances_
+    )
+    
+    # The base margin is the booster's margin less the trees' sum on any row;
+    # reading it back avoids depending on how each version stores base_score
+    probe = np.zeros((1, compiled.n_features), dtype=np.float32)
+    margin = booster.predict(
+        xgb.DMatrix(probe, feature_names=booster.feature_names),
+        output_margin=True,
+        iteration_range=(0, 0 if best_iteration is None else best_iteration + 1)
+    )
+    tree_sum = arrays['value'][compiled.apply(probe), 0] @ np.eye(n_outputs)[arrays['tree_output']]
+    arrays['intercept'] = np.asarray(margin, dtype=np.float64).reshape(n_outputs) - tree_sum[0]
+    
+    return compiled
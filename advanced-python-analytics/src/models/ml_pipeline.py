@@ -3,16 +3,21 @@ Machine Learning Pipeline module.
 Provides end-to-end ML training, prediction, and evaluation.
 """
 
-from typing import Optional, Dict, Any, List
+import asyncio
+import hashlib
+from typing import Optional, Dict, Any, List, Tuple, Iterable, AsyncIterable
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone, is_classifier
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
-from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.linear_model import LinearRegression, LogisticRegression, SGDRegressor, SGDClassifier
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import (
     mean_squared_error, mean_absolute_error, r2_score,
     accuracy_score, precision_score, recall_score, f1_score
 )
-from sklearn.model_selection import cross_val_score
+from sklearn.model_selection import check_cv
 import joblib
 
 try:
@@ -22,12 +27,153 @@ except ImportError:
     XGBOOST_AVAILABLE = False
 
 from src.core.logger import setup_logger
+from src.core.config import IncrementalConfig
 from src.core.exceptions import ModelTrainingError, PredictionError
+from src.analysis.cache import AnalysisCache
+from src.models.compiled import BatchRoutedModel, compile_model
 
 
 logger = setup_logger(__name__)
 
 
+def _fit_fold(
+    model: Any,
+    X: pd.DataFrame,
+    y: pd.Series,
+    train: np.ndarray,
+    test: Optional[np.ndarray]
+) -> Tuple[Any, Optional[np.ndarray], Optional[float]]:
+    """Fit a model on the training rows and predict and score the held-out rows."""
+    model.fit(X.iloc[train], y.iloc[train])
+    if test is None:
+        return model, None, None
+    
+    predictions = model.predict(X.iloc[test])
+    y_test = y.iloc[test]
+    # The estimators' default score: accuracy for classifiers, R^2 for regressors
+    if is_classifier(model):
+        score = accuracy_score(y_test, predictions)
+    else:
+        score = r2_score(y_test, predictions)
+    return model, predictions, float(score)
+
+
+class FoldEnsemble:
+    """
+    Final model made of the fold models of a cross-validation run.
+    
+    Reuses the k models cross-validation already trained instead of fitting
+    one more on all rows: regressors average their predictions, classifiers
+    average their class probabilities (or vote without ``predict_proba``).
+    """
+    
+    def __init__(self, models: List[Any], problem_type: str):
+        """
+        Initialize fold ensemble.
+        
+        Args:
+            models: Fitted fold models
+            problem_type: 'regression' or 'classification'
+        """
+        self.models = models
+        self.problem_type = problem_type
+        if problem_type == "classification":
+            self.classes_ = np.unique(np.concatenate([model.classes_ for model in models]))
+    
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        """Average prediction (regression) or most probable class (classification)."""
+        if self.problem_type == "regression":
+            return np.mean([model.predict(X) for model in self.models], axis=0)
+        
+        if all(hasattr(model, 'predict_proba') for model in self.models):
+            return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+        
+        # Majority vote, ties going to the first class
+        votes = np.zeros((len(X), len(self.classes_)))
+        for model in self.models:
+            votes[np.arange(len(X)), np.searchsorted(self.classes_, model.predict(X))] += 1
+        return self.classes_[np.argmax(votes, axis=1)]
+    
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        """Class probabilities averaged over the fold models."""
+        proba = np.zeros((len(X), len(self.classes_)))
+        for model in self.models:
+            # A fold may have missed a rare class; align columns to all classes
+            proba[:, np.searchsorted(self.classes_, model.classes_)] += model.predict_proba(X)
+        return proba / len(self.models)
+    
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        """Feature importances averaged over the fold models."""
+        return np.mean([model.feature_importances_ for model in self.models], axis=0)
+
+
+class IncrementalLinearModel:
+    """
+    Linear model trained chunk by chunk with stochastic gradient descent.
+    
+    Features are standardized with statistics from the first chunk, then
+    frozen, so the weights learned from later chunks keep their meaning.
+    Regression uses SGDRegressor, classification a logistic SGDClassifier.
+    """
+    
+    def __init__(self, problem_type: str, params: Dict[str, Any]):
+        """
+        Initialize incremental linear model.
+        
+        Args:
+            problem_type: 'regression' or 'classification'
+            params: SGD estimator parameters
+        """
+        self.problem_type = problem_type
+        self.scaler = StandardScaler()
+        if problem_type == "regression":
+            self.model = SGDRegressor(**params)
+        else:
+            self.model = SGDClassifier(**{'loss': 'log_loss', **params})
+        self.n_chunks = 0
+    
+    def partial_fit(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        classes: Optional[np.ndarray] = None
+    ) -> "IncrementalLinearModel":
+        """Take one pass of SGD over a chunk."""
+        if self.n_chunks == 0:
+            self.scaler.fit(X)
+        
+        X_scaled = self.scaler.transform(X)
+        if self.problem_type == "regression":
+            self.model.partial_fit(X_scaled, y)
+        else:
+            # The first call fixes the classes; default to those in the first chunk
+            if self.n_chunks == 0 and classes is None:
+                classes = np.unique(y)
+            self.model.partial_fit(X_scaled, y, classes=classes)
+        
+        self.n_chunks += 1
+        return self
+    
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        """Predict targets or class labels."""
+        return self.model.predict(self.scaler.transform(X))
+    
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        """Predict class probabilities."""
+        return self.model.predict_proba(self.scaler.transform(X))
+    
+    @property
+    def classes_(self) -> np.ndarray:
+        """Class labels (classification)."""
+        return self.model.classes_
+    
+    @property
+    def coef_(self) -> np.ndarray:
+        """Weights on the standardized features."""
+        return self.model.coef_
+
+
 class MLPipeline:
     """
     Machine Learning pipeline for training and prediction.
@@ -38,7 +184,8 @@ class MLPipeline:
         self,
         model_type: str = "random_forest",
         config: Optional[Any] = None,
-        problem_type: str = "auto"
+        problem_type: str = "auto",
+        model_params: Optional[Dict[str, Any]] = None
     ):
         """
         Initialize ML pipeline.
@@ -47,13 +194,50 @@ class MLPipeline:
             model_type: Type of model (random_forest, xgboost, linear)
             config: Configuration object
             problem_type: 'regression', 'classification', or 'auto'
+            model_params: Model parameters overriding those from the config
         """
         self.model_type = model_type
         self.config = config
         self.problem_type = problem_type
+        self.model_params = model_params or {}
         self.model = None
         self.feature_columns: Optional[List[str]] = None
         self.target_column: Optional[str] = None
+        self.cv_results: Optional[Dict[str, Any]] = None
+        self._data_fingerprint: Optional[str] = None
+        # Fingerprints of the feature and target columns of the last training
+        # data, and the fingerprint of the chunks trained on before it
+        self._column_fingerprints: Optional[List[str]] = None
+        self._previous_fingerprint: Optional[str] = None
+    
+    @property
+    def data_fingerprint(self) -> Optional[str]:
+        """
+        Fingerprint identifying the training data, recorded in saved models.
+        
+        Training keeps only the fingerprint of each feature and target
+        column, never the data; they are combined on first access (usually
+        when saving). After incremental training it covers every chunk.
+        """
+        if self._column_fingerprints is not None:
+            digest = hashlib.blake2b(digest_size=16)
+            for column_fingerprint in self._column_fingerprints:
+                digest.update(column_fingerprint.encode())
+            fingerprint = digest.hexdigest()
+            
+            if self._previous_fingerprint is not None:
+                digest = hashlib.blake2b(digest_size=16)
+                digest.update(f"{self._previous_fingerprint}{fingerprint}".encode())
+                fingerprint = digest.hexdigest()
+            
+            self._data_fingerprint = fingerprint
+            self._column_fingerprints, self._previous_fingerprint = None, None
+        return self._data_fingerprint
+    
+    @data_fingerprint.setter
+    def data_fingerprint(self, value: Optional[str]) -> None:
+        self._data_fingerprint = value
+        self._column_fingerprints, self._previous_fingerprint = None, None
     
     def fit(
         self,
@@ -74,6 +258,266 @@ class MLPipeline:
         """
         logger.info(f"Training {self.model_type} model")
         
+        X, y = self._prepare(data, target, features)
+        
+        # Initialize and train model
+        try:
+            self.model = self._create_model()
+            self.model.fit(X, y)
+            logger.info("Model training completed successfully")
+        
+        except Exception as e:
+            raise ModelTrainingError(f"Error during model training: {str(e)}")
+        
+        return self
+    
+    def cross_validate(
+        self,
+        data: pd.DataFrame,
+        target: str,
+        features: Optional[List[str]] = None,
+        cv: int = 5,
+        n_jobs: Optional[int] = -1,
+        refit: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Train with k-fold cross-validation and keep a final model.
+        
+        Folds match ``cross_val_score`` (stratified for classification) and
+        train in parallel; while they do, each fold model trains with
+        ``n_jobs=1`` and gets its configured ``n_jobs`` back afterwards, so
+        fold processes and estimator threads do not oversubscribe the cores.
+        Each fold model predicts its held-out rows, which
+        gives an out-of-fold prediction for every row. With ``refit=False``
+        the fold models become the final model (a FoldEnsemble), so the
+        whole run costs k fits; with ``refit=True`` a model on all rows is
+        trained as one more parallel job, as ``fit`` would train it.
+        
+        Args:
+            data: Training data
+            target: Target column name
+            features: List of feature column names (if None, use all except target)
+            cv: Number of folds
+            n_jobs: Parallel fold jobs (-1 for all cores, None for one)
+            refit: Whether the final model is refitted on all rows
+            
+        Returns:
+            Dictionary with per-fold 'scores' (R^2 for regression, accuracy
+            for classification), their 'mean' and 'std', and
+            'oof_predictions' (Series aligned with the data index)
+        """
+        logger.info(f"Cross-validating {self.model_type} model with {cv} folds")
+        
+        X, y = self._prepare(data, target, features)
+        
+        try:
+            model = self._create_model()
+            folds = list(check_cv(cv, y, classifier=is_classifier(model)).split(X, y))
+            jobs = folds + ([(np.arange(len(X)), None)] if refit else [])
+            
+            model_n_jobs = model.get_params().get('n_jobs')
+            nested = 'n_jobs' in model.get_params() and effective_n_jobs(n_jobs) > 1
+            if nested:
+                model.set_params(n_jobs=1)
+            
+            outputs = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_fold)(clone(model), X, y, train, test) for train, test in jobs
+            )
+            
+            if nested:
+                # The final model predicts with the configured parallelism
+                for fold_model, _, _ in outputs:
+                    fold_model.set_params(n_jobs=model_n_jobs)
+        except Exception as e:
+            raise ModelTrainingError(f"Error during cross-validation: {str(e)}")
+        
+        fold_outputs = outputs[:len(folds)]
+        oof = np.empty(len(X), dtype=np.result_type(*(predictions for _, predictions, _ in fold_outputs)))
+        for (_, test), (_, predictions, _) in zip(folds, fold_outputs):
+            oof[test] = predictions
+        
+        scores = np.array([score for _, _, score in fold_outputs])
+        self.model = outputs[-1][0] if refit else FoldEnsemble(
+            [fold_model for fold_model, _, _ in fold_outputs], self.problem_type
+        )
+        
+        self.cv_results = {
+            'scores': scores,
+            'mean': float(scores.mean()),
+            'std': float(scores.std()),
+            'oof_predictions': pd.Series(oof, index=data.index, name=target)
+        }
+        logger.info(f"Cross-validation scores: {scores.mean():.4f} (+/- {scores.std():.4f})")
+        
+        return self.cv_results
+    
+    def partial_fit(
+        self,
+        data: pd.DataFrame,
+        target: str,
+        features: Optional[List[str]] = None,
+        classes: Optional[List[Any]] = None
+    ) -> "MLPipeline":
+        """
+        Train the model further on one chunk of data.
+        
+        The first chunk creates the model; later chunks, or a model loaded
+        with ``load_model``, continue from it. Linear models take one SGD
+        pass per chunk; random forests grow ``trees_per_chunk`` more trees
+        on the chunk (warm start), keeping only the newest ``max_trees`` if
+        set; XGBoost boosts ``rounds_per_chunk`` more rounds from the
+        current booster. Settings come from ``config.incremental``.
+        
+        Args:
+            data: Chunk of training data
+            target: Target column name
+            features: List of feature column names (if None, those of the
+                first chunk, or all except target)
+            classes: All class labels (classification), needed when the
+                first chunk may not contain every class
+            
+        Returns:
+            Self for method chaining
+        """
+        # The fingerprint covers every chunk the model has seen
+        previous_fingerprint = self.data_fingerprint if self.model is not None else None
+        X, y = self._prepare(data, target, features or self.feature_columns)
+        self._previous_fingerprint = previous_fingerprint
+        
+        settings = (
+            self.config.incremental
+            if self.config and hasattr(self.config, 'incremental') else IncrementalConfig()
+        )
+        # A lazily loaded artifact model is loaded first
+        model = self.model.load() if hasattr(type(self.model), 'load') else self.model
+        
+        try:
+            self.model = self._partial_fit_model(model, X, y, classes, settings)
+        except ModelTrainingError:
+            raise
+        except Exception as e:
+            raise ModelTrainingError(f"Error during incremental training: {str(e)}")
+        
+        return self
+    
+    def fit_incremental(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        target: str,
+        features: Optional[List[str]] = None,
+        classes: Optional[List[Any]] = None
+    ) -> "MLPipeline":
+        """
+        Train on an iterator of chunks without holding them all in memory.
+        
+        Args:
+            chunks: DataFrame chunks, e.g. ``pd.read_csv(..., chunksize=n)``
+            target: Target column name
+            features: List of feature column names (if None, use all except target)
+            classes: All class labels (classification)
+            
+        Returns:
+            Self for method chaining
+        """
+        n_chunks, n_rows = 0, 0
+        for chunk in chunks:
+            self.partial_fit(chunk, target, features, classes)
+            n_chunks += 1
+            n_rows += len(chunk)
+        
+        if n_chunks == 0:
+            raise ModelTrainingError("No training chunks provided")
+        
+        logger.info(f"Incremental training on {n_rows} rows in {n_chunks} chunks completed")
+        return self
+    
+    async def fit_stream(
+        self,
+        chunks: AsyncIterable[pd.DataFrame],
+        target: str,
+        features: Optional[List[str]] = None,
+        classes: Optional[List[Any]] = None
+    ) -> "MLPipeline":
+        """
+        Train on an asynchronous stream of chunks, e.g. ``StreamProcessor.stream_data``.
+        
+        Each chunk is trained on in a worker thread so the event loop keeps
+        receiving the next one.
+        
+        Args:
+            chunks: Asynchronous iterator of DataFrame chunks
+            target: Target column name
+            features: List of feature column names (if None, use all except target)
+            classes: All class labels (classification)
+            
+        Returns:
+            Self for method chaining
+        """
+        n_chunks = 0
+        async for chunk in chunks:
+            await asyncio.to_thread(self.partial_fit, chunk, target, features, classes)
+            n_chunks += 1
+        
+        if n_chunks == 0:
+            raise ModelTrainingError("No training chunks provided")
+        
+        logger.info(f"Stream training on {n_chunks} chunks completed")
+        return self
+    
+    def _partial_fit_model(
+        self,
+        model: Any,
+        X: pd.DataFrame,
+        y: pd.Series,
+        classes: Optional[List[Any]],
+        settings: IncrementalConfig
+    ) -> Any:
+        """Create or continue training the incremental model on one chunk."""
+        if model is None and self.model_type == "linear":
+            model = IncrementalLinearModel(self.problem_type, {**settings.sgd, **self.model_params})
+        
+        if isinstance(model, IncrementalLinearModel):
+            return model.partial_fit(X, y, classes)
+        
+        if self.model_type == "random_forest" and (model is None or isinstance(model, (RandomForestRegressor, RandomForestClassifier))):
+            if model is None:
+                model = self._create_model()
+                n_trees = 0
+            else:
+                n_trees = len(model.estimators_)
+                if self.problem_type == "classification" and not np.isin(model.classes_, y).all():
+                    raise ModelTrainingError(
+                        "Every chunk must contain all classes to grow a random forest incrementally"
+                    )
+            
+            model.set_params(warm_start=True, n_estimators=n_trees + settings.trees_per_chunk)
+            model.fit(X, y)
+            
+            if settings.max_trees and len(model.estimators_) > settings.max_trees:
+                # Forget the trees grown on the oldest chunks
+                model.estimators_ = model.estimators_[-settings.max_trees:]
+                model.set_params(n_estimators=settings.max_trees)
+            return model
+        
+        if self.model_type == "xgboost" and (model is None or isinstance(model, (xgb.XGBRegressor, xgb.XGBClassifier))):
+            booster = model.get_booster() if model is not None else None
+            model = model if model is not None else self._create_model()
+            model.set_params(n_estimators=settings.rounds_per_chunk)
+            model.fit(X, y, xgb_model=booster)
+            return model
+        
+        raise ModelTrainingError(
+            f"{type(model).__name__} cannot be trained incrementally; "
+            f"train {self.model_type} models with partial_fit from the first chunk"
+        )
+    
+    def _prepare(
+        self,
+        data: pd.DataFrame,
+        target: str,
+        features: Optional[List[str]]
+    ) -> Tuple[pd.DataFrame, pd.Series]:
+        """Set feature and target columns, detect the problem type and split X and y."""
         self.target_column = target
         
         if target not in data.columns:
@@ -89,6 +533,12 @@ class MLPipeline:
         X = data[self.feature_columns]
         y = data[target]
         
+        # Identifies the training data in saved models; only the used columns are hashed
+        self.data_fingerprint = None
+        self._column_fingerprints = [
+            AnalysisCache.fingerprint(data[col]) for col in [*self.feature_columns, target]
+        ]
+        
         # Auto-detect problem type
         if self.problem_type == "auto":
             unique_values = y.nunique()
@@ -98,20 +548,7 @@ class MLPipeline:
                 self.problem_type = "regression"
             logger.info(f"Auto-detected problem type: {self.problem_type}")
         
-        # Initialize and train model
-        try:
-            self.model = self._create_model()
-            self.model.fit(X, y)
-            logger.info("Model training completed successfully")
-            
-            # Cross-validation
-            cv_scores = cross_val_score(self.model, X, y, cv=5)
-            logger.info(f"Cross-validation scores: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
-            
-        except Exception as e:
-            raise ModelTrainingError(f"Error during model training: {str(e)}")
-        
-        return self
+        return X, y
     
     def _create_model(self):
         """Create model instance based on type and problem."""
@@ -119,6 +556,7 @@ class MLPipeline:
         
         if self.config and hasattr(self.config, 'models'):
             model_params = getattr(self.config.models, self.model_type, {})
+        model_params = {**model_params, **self.model_params}
         
         if self.model_type == "random_forest":
             if self.problem_type == "regression":
@@ -144,6 +582,36 @@ class MLPipeline:
         else:
             raise ModelTrainingError(f"Unknown model type: {self.model_type}")
     
+    def compile(self) -> "MLPipeline":
+        """
+        Replace a trained tree ensemble with its compiled form.
+        
+        Random forests and XGBoost models (or fold ensembles of them) are
+        flattened into node arrays and predict through vectorized NumPy
+        traversal, with the same predictions and far less per-call overhead.
+        The source model is kept for batches of ``native_batch_rows`` rows
+        or more, where its native traversal is faster (BatchRoutedModel).
+        
+        Returns:
+            Self for method chaining
+        """
+        if self.model is None:
+            raise PredictionError("Model has not been trained yet")
+        if isinstance(self.model, BatchRoutedModel):
+            return self
+        
+        # A lazily loaded artifact model is loaded first
+        model = self.model.load() if hasattr(type(self.model), 'load') else self.model
+        if isinstance(model, FoldEnsemble):
+            compiled = FoldEnsemble([compile_model(fold_model) for fold_model in model.models], self.problem_type)
+            native_batch_rows = min(fold_model.native_batch_rows for fold_model in compiled.models)
+        else:
+            compiled = compile_model(model)
+            native_batch_rows = compiled.native_batch_rows
+        
+        self.model = BatchRoutedModel(compiled, model, native_batch_rows)
+        return self
+    
     def predict(self, data: pd.DataFrame) -> np.ndarray:
         """
         Make predictions on new data.
@@ -260,7 +728,8 @@ class MLPipeline:
             'feature_columns': self.feature_columns,
             'target_column': self.target_column,
             'model_type': self.model_type,
-            'problem_type': self.problem_type
+            'problem_type': self.problem_type,
+            'data_fingerprint': self.data_fingerprint
         }, path)
         
         logger.info(f"Model saved to: {path}")
@@ -283,6 +752,7 @@ class MLPipeline:
         pipeline.feature_columns = data['feature_columns']
         pipeline.target_column = data['target_column']
         pipeline.problem_type = data['problem_type']
+        pipeline.data_fingerprint = data.get('data_fingerprint')
         
         logger.info(f"Model loaded from: {path}")
         return pipeline
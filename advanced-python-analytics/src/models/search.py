@@ -0,0 +1,341 @@
+"""
+Hyperparameter search module.
+Random search and successive halving over parameter spaces declared in the config.
+"""
+
+import math
+import time
+from typing import Optional, Dict, Any, List, Tuple
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone, is_classifier
+from sklearn.model_selection import check_cv
+
+from src.core.logger import setup_logger
+from src.core.config import SearchConfig
+from src.core.exceptions import ConfigurationError, ModelTrainingError
+from src.models.ml_pipeline import MLPipeline
+
+
+logger = setup_logger(__name__)
+
+
+SEARCH_METHODS = ('halving', 'random')
+RESOURCES = ('n_samples', 'n_estimators')
+MIN_ROWS_PER_FOLD = 10
+
+
+def sample_params(
+    space: Dict[str, Any],
+    n_trials: int,
+    rng: np.random.Generator
+) -> List[Dict[str, Any]]:
+    """
+    Draw parameter sets from a search space.
+    
+    A list is a set of choices drawn uniformly. A dict with 'low' and
+    'high' is a range, drawn uniformly or, with 'log': true, log-uniformly;
+    'type': 'int' draws integers with both ends included.
+    
+    Args:
+        space: Parameter name to list of choices or range
+        n_trials: Number of parameter sets
+        rng: Random generator
+    
+    Returns:
+        List of parameter dictionaries
+    """
+    return [
+        {name: _sample_value(name, spec, rng) for name, spec in space.items()}
+        for _ in range(n_trials)
+    ]
+
+
+def _sample_value(name: str, spec: Any, rng: np.random.Generator) -> Any:
+    """Draw one value of a parameter."""
+    if isinstance(spec, (list, tuple)):
+        if not spec:
+            raise ConfigurationError(f"Search space for '{name}' has no choices")
+        # Index rather than rng.choice, which would coerce mixed choices to strings
+        return spec[int(rng.integers(len(spec)))]
+    
+    if not isinstance(spec, dict) or 'low' not in spec or 'high' not in spec:
+        raise ConfigurationError(
+            f"Search space for '{name}' must be a list of choices or a dict with low and high"
+        )
+    
+    is_int = spec.get('type', 'float') == 'int'
+    low, high = float(spec['low']), float(spec['high']) + (1 if is_int else 0)
+    if spec.get('log', False):
+        if low <= 0:
+            raise ConfigurationError(f"Log-scaled search space for '{name}' needs low > 0")
+        value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    else:
+        value = rng.uniform(low, high)
+    
+    return min(int(value), int(spec['high'])) if is_int else float(value)
+
+
+def _score_fold(
+    model: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    train: np.ndarray,
+    test: np.ndarray
+) -> Tuple[float, float]:
+    """Fit on the training rows and return the held-out score and fit time."""
+    start = time.perf_counter()
+    model.fit(X[train], y[train])
+    fit_time = time.perf_counter() - start
+    # The estimators' default score: accuracy for classifiers, R^2 for regressors
+    return float(model.score(X[test], y[test])), fit_time
+
+
+def _stratified_order(y: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Random row order whose every prefix keeps the class proportions of ``y``.
+    
+    Each class is shuffled and its rows are spread evenly over [0, 1) from a
+    random offset; sorting by that position interleaves the classes, so a
+    subsample of the first n rows holds about n * share rows of each class.
+    """
+    _, labels = np.unique(y, return_inverse=True)
+    position = np.empty(len(y))
+    
+    for label in range(labels.max() + 1):
+        rows = rng.permutation(np.flatnonzero(labels == label))
+        position[rows] = (np.arange(len(rows)) + rng.random()) / len(rows)
+    
+    return np.argsort(position, kind='stable')
+
+
+class HyperparameterSearch:
+    """
+    Hyperparameter search for an MLPipeline model.
+    
+    Trials sample the model's parameter space from ``config.search.spaces``
+    and are scored by cross-validation, one process-pool job per trial and
+    fold. With ``method='random'`` every trial is scored on the full
+    budget. With ``method='halving'`` (successive halving) all trials start
+    on a small budget and only the best ``1 / factor`` of them advance to
+    the next round, whose budget is ``factor`` times larger, until the last
+    round uses the full budget. The budget is either the number of training
+    rows (``n_samples``, a fixed random subsample per round, stratified on
+    the target for classification) or the number of trees
+    (``n_estimators``), so poor trials stop after cheap fits.
+    
+    Fold splits are computed once per budget and shared by every trial, so
+    trials in a round are compared on the same rows. After the search the
+    best parameters are refitted on all rows as ``best_pipeline_``.
+    """
+    
+    def __init__(
+        self,
+        model_type: str = "random_forest",
+        config: Optional[Any] = None,
+        problem_type: str = "auto",
+        method: Optional[str] = None,
+        n_trials: Optional[int] = None,
+        space: Optional[Dict[str, Any]] = None,
+        cv: Optional[int] = None,
+        factor: Optional[int] = None,
+        resource: Optional[str] = None,
+        min_resource: Optional[int] = None,
+        n_jobs: Optional[int] = None,
+        random_state: Optional[int] = None
+    ):
+        """
+        Initialize hyperparameter search.
+        
+        Args:
+            model_type: Type of model (random_forest, xgboost, linear)
+            config: Configuration object
+            problem_type: 'regression', 'classification', or 'auto'
+            method: 'halving' or 'random' (defaults to the config)
+            n_trials: Number of sampled parameter sets (defaults to the config)
+            space: Parameter space (defaults to the config's space for the model)
+            cv: Number of folds
+            factor: Budget growth and inverse share of trials kept per round
+            resource: Budget grown between rounds ('n_samples' or 'n_estimators')
+            min_resource: Budget of the first round (derived when unset)
+            n_jobs: Parallel trial processes (-1 for all cores)
+            random_state: Seed for parameter sampling and row subsampling
+        
+        Settings left as None come from ``config.search``.
+        """
+        search_config = config.search if config and hasattr(config, 'search') else SearchConfig()
+        
+        self.model_type = model_type
+        self.config = config
+        self.problem_type = problem_type
+        self.method = method or search_config.method
+        self.n_trials = n_trials or search_config.n_trials
+        self.space = space if space is not None else search_config.spaces.get(model_type, {})
+        self.cv = cv or search_config.cv
+        self.factor = factor or search_config.factor
+        self.resource = resource or search_config.resource
+        self.min_resource = min_resource or search_config.min_resource
+        self.n_jobs = n_jobs if n_jobs is not None else search_config.n_jobs
+        self.random_state = random_state if random_state is not None else search_config.random_state
+        
+        if self.method not in SEARCH_METHODS:
+            raise ValueError(f"Unknown search method: {self.method}")
+        if self.resource not in RESOURCES:
+            raise ValueError(f"Unknown search resource: {self.resource}")
+        if self.resource in self.space:
+            raise ConfigurationError(
+                f"'{self.resource}' is the search budget and cannot be in the search space"
+            )
+        
+        self.leaderboard_: Optional[pd.DataFrame] = None
+        self.best_params_: Optional[Dict[str, Any]] = None
+        self.best_score_: Optional[float] = None
+        self.best_pipeline_: Optional[MLPipeline] = None
+        self._folds: Dict[int, List[Tuple[np.ndarray, np.ndarray]]] = {}
+    
+    def fit(
+        self,
+        data: pd.DataFrame,
+        target: str,
+        features: Optional[List[str]] = None
+    ) -> "HyperparameterSearch":
+        """
+        Run the search and refit the best parameters on all rows.
+        
+        Args:
+            data: Training data
+            target: Target column name
+            features: List of feature column names (if None, use all except target)
+        
+        Returns:
+            Self for method chaining
+        """
+        pipeline = MLPipeline(self.model_type, self.config, self.problem_type)
+        X, y = pipeline._prepare(data, target, features)
+        self.problem_type = pipeline.problem_type
+        base_model = pipeline._create_model()
+        
+        if self.resource == "n_estimators" and 'n_estimators' not in base_model.get_params():
+            raise ConfigurationError(f"{self.model_type} model has no n_estimators to use as budget")
+        if 'n_jobs' in base_model.get_params() and self.n_jobs != 1:
+            # Parallelism comes from the trial pool; threads per trial would oversubscribe
+            base_model.set_params(n_jobs=1)
+        
+        # Plain arrays are memory-mapped into the worker processes instead of copied
+        X_values, y_values = X.to_numpy(), y.to_numpy()
+        rng = np.random.default_rng(self.random_state)
+        candidates = sample_params(self.space, self.n_trials, rng)
+        if is_classifier(base_model):
+            row_order = _stratified_order(y_values, rng)
+        else:
+            row_order = rng.permutation(len(X_values))
+        budgets = self._budgets(len(X_values), base_model)
+        
+        logger.info(
+            f"Searching {self.n_trials} {self.model_type} trials with {self.method} "
+            f"over {self.resource} budgets {budgets}"
+        )
+        
+        self._folds = {}
+        records = [
+            {'trial': trial, 'round': 0, self.resource: budgets[0], 'fit_time': 0.0, 'params': params}
+            for trial, params in enumerate(candidates)
+        ]
+        alive = records
+        
+        try:
+            with Parallel(n_jobs=self.n_jobs) as parallel:
+                for round_index, budget in enumerate(budgets):
+                    folds = self._round_folds(budget, X_values, y_values, row_order, base_model)
+                    resource_params = {'n_estimators': budget} if self.resource == "n_estimators" else {}
+                    
+                    outputs = parallel(
+                        delayed(_score_fold)(
+                            clone(base_model).set_params(**record['params'], **resource_params),
+                            X_values, y_values, train, test
+                        )
+                        for record in alive for train, test in folds
+                    )
+                    
+                    for i, record in enumerate(alive):
+                        fold_outputs = outputs[i * len(folds):(i + 1) * len(folds)]
+                        scores = np.array([score for score, _ in fold_outputs])
+                        record.update({
+                            'round': round_index,
+                            self.resource: budget,
+                            'mean_score': float(scores.mean()),
+                            'std_score': float(scores.std()),
+                            'fit_time': record['fit_time'] + sum(fit for _, fit in fold_outputs)
+                        })
+                    
+                    logger.info(
+                        f"Round {round_index}: {len(alive)} trials at {self.resource}={budget}, "
+                        f"best score {max(record['mean_score'] for record in alive):.4f}"
+                    )
+                    
+                    if round_index < len(budgets) - 1:
+                        ranked = sorted(alive, key=lambda record: record['mean_score'], reverse=True)
+                        alive = ranked[:max(1, math.ceil(len(alive) / self.factor))]
+        except Exception as e:
+            raise ModelTrainingError(f"Error during hyperparameter search: {str(e)}")
+        
+        leaderboard = pd.DataFrame([
+            {**{key: value for key, value in record.items() if key != 'params'},
+             **{f"param_{name}": value for name, value in record['params'].items()}}
+            for record in records
+        ])
+        self.leaderboard_ = leaderboard.sort_values(
+            ['round', 'mean_score'], ascending=False, kind='stable'
+        ).reset_index(drop=True)
+        
+        best = self.leaderboard_.iloc[0]
+        self.best_params_ = records[int(best['trial'])]['params']
+        self.best_score_ = float(best['mean_score'])
+        logger.info(f"Best trial {int(best['trial'])}: {self.best_score_:.4f} with {self.best_params_}")
+        
+        self.best_pipeline_ = MLPipeline(
+            self.model_type, self.config, self.problem_type, model_params=self.best_params_
+        ).fit(data, target, features)
+        
+        return self
+    
+    def _budgets(self, n_rows: int, base_model: Any) -> List[int]:
+        """Budget of each round, growing by ``factor`` up to the full budget."""
+        if self.resource == "n_samples":
+            max_resource = n_rows
+            floor = MIN_ROWS_PER_FOLD * self.cv
+        else:
+            max_resource = base_model.get_params()['n_estimators']
+            floor = 1
+        
+        if self.method == "random":
+            return [max_resource]
+        
+        n_rounds = 1 + int(math.floor(math.log(self.n_trials) / math.log(self.factor)))
+        min_resource = self.min_resource or max_resource // self.factor ** (n_rounds - 1)
+        min_resource = min(max(min_resource, floor), max_resource)
+        # Fewer rounds when the first budget leaves no room to grow
+        n_rounds = min(n_rounds, 1 + int(math.floor(math.log(max_resource / min_resource) / math.log(self.factor))))
+        
+        return [min_resource * self.factor ** i for i in range(n_rounds - 1)] + [max_resource]
+    
+    def _round_folds(
+        self,
+        budget: int,
+        X: np.ndarray,
+        y: np.ndarray,
+        row_order: np.ndarray,
+        base_model: Any
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Fold splits of a round's rows, computed once per row count."""
+        n_rows = budget if self.resource == "n_samples" else len(X)
+        
+        if n_rows not in self._folds:
+            rows = np.sort(row_order[:n_rows])
+            splitter = check_cv(self.cv, y[rows], classifier=is_classifier(base_model))
+            self._folds[n_rows] = [
+                (rows[train], rows[test]) for train, test in splitter.split(X[rows], y[rows])
+            ]
+        
+        return self._folds[n_rows]
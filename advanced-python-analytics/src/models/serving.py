@@ -0,0 +1,312 @@
+"""
+Model serving module.
+Micro-batched, low-latency predictions from trained MLPipeline artifacts.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from src.core.logger import setup_logger
+from src.core.exceptions import PredictionError
+from src.models.ml_pipeline import MLPipeline
+
+
+logger = setup_logger(__name__)
+
+
+Instance = Union[np.ndarray, List[Any], Dict[str, Any]]
+
+SERVING_METHODS = ('predict', 'predict_proba')
+
+
+class ModelServer:
+    """
+    Micro-batching front end for a trained MLPipeline.
+    
+    ``predict`` accepts one instance or several: a NumPy array (or list)
+    with the features in training order, a dict keyed by feature name, or
+    a list of such dicts. The feature order is resolved once, so requests
+    skip the DataFrame column lookup and per-call logging of
+    ``MLPipeline.predict``. Concurrent requests wait in a queue and are
+    scored together: a batch closes once it holds ``max_batch_size`` rows
+    or ``max_wait`` seconds after its first request. The model runs in a
+    worker thread so the event loop keeps accepting requests meanwhile.
+    
+    ``stats`` reports request, row and batch counts and the p50/p99
+    latency, from submission to result, over the last ``latency_window``
+    requests.
+    """
+    
+    def __init__(
+        self,
+        pipeline: MLPipeline,
+        max_batch_size: int = 64,
+        max_wait: float = 0.002,
+        method: str = "predict",
+        latency_window: int = 10000
+    ):
+        """
+        Initialize model server.
+        
+        Args:
+            pipeline: Trained pipeline, e.g. from ``load_artifact``
+            max_batch_size: Maximum rows scored per model call
+            max_wait: Seconds a batch waits for more requests
+            method: 'predict' or 'predict_proba'
+            latency_window: Number of recent requests the latency percentiles cover
+        """
+        if pipeline.model is None or pipeline.feature_columns is None:
+            raise PredictionError("Model has not been trained yet")
+        if method not in SERVING_METHODS:
+            raise ValueError(f"Unknown serving method: {method}")
+        if method == "predict_proba" and not hasattr(pipeline.model, 'predict_proba'):
+            raise PredictionError("Model does not support probability predictions")
+        
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.method = method
+        self.features = list(pipeline.feature_columns)
+        self._predict = getattr(pipeline.model, method)
+        
+        self._latencies: deque = deque(maxlen=latency_window)
+        self._counts = {'requests': 0, 'rows': 0, 'batches': 0, 'errors': 0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def __aenter__(self) -> "ModelServer":
+        self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    def start(self) -> "ModelServer":
+        """
+        Start the batching task on the running event loop.
+        
+        Returns:
+            Self for method chaining
+        """
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self
+    
+    async def close(self) -> None:
+        """Score the queued requests and stop the batching task."""
+        if self._worker is not None:
+            await self._queue.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+    
+    async def predict(self, instances: Instance) -> Any:
+        """
+        Score one instance or several as part of the next batch.
+        
+        Args:
+            instances: Feature vector or dict for one row, or a 2D array or
+                list of dicts for several rows
+        
+        Returns:
+            Prediction for a single instance, array of predictions otherwise
+        """
+        start = time.perf_counter()
+        rows, single = self.to_matrix(instances)
+        
+        if self._worker is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((rows, future))
+        
+        result = await future
+        self._latencies.append(time.perf_counter() - start)
+        return result[0] if single else result
+    
+    def predict_batch(self, instances: Instance) -> np.ndarray:
+        """
+        Score instances synchronously in one model call, without queueing.
+        
+        Args:
+            instances: Same forms as ``predict``
+        
+        Returns:
+            Array of predictions
+        """
+        rows, _ = self.to_matrix(instances)
+        return self._score(rows)
+    
+    def to_matrix(self, instances: Instance) -> Tuple[np.ndarray, bool]:
+        """
+        Convert instances to a 2D float array in training feature order.
+        
+        Requests are validated here, before they are queued, so a bad
+        request fails on its own instead of failing the batch it joins.
+        
+        Args:
+            instances: Same forms as ``predict``
+        
+        Returns:
+            Tuple of the row matrix and whether a single instance was given
+        """
+        if isinstance(instances, dict):
+            rows, single = self._from_records([instances]), True
+        elif isinstance(instances, list) and instances and isinstance(instances[0], dict):
+            rows, single = self._from_records(instances), False
+        else:
+            rows = instances
+            single = np.ndim(instances) == 1
+        
+        try:
+            rows = np.asarray(rows, dtype=np.float64)
+        except (ValueError, TypeError) as e:
+            raise PredictionError(f"Feature values must be numbers: {e}")
+        
+        rows = rows.reshape(1, -1) if single else rows
+        if rows.ndim != 2 or rows.shape[1] != len(self.features):
+            raise PredictionError(
+                f"Expected rows of {len(self.features)} features {self.features}, got shape {rows.shape}"
+            )
+        if not np.isfinite(rows).all():
+            raise PredictionError("Feature values must be finite numbers, not null, NaN or infinite")
+        return rows, single
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Request, row and batch counts and latency percentiles in milliseconds."""
+        stats: Dict[str, Any] = dict(self._counts)
+        stats['mean_batch_rows'] = self._counts['rows'] / self._counts['batches'] if self._counts['batches'] else 0.0
+        if self._latencies:
+            p50, p99 = np.percentile(np.fromiter(self._latencies, dtype=float), [50, 99]) * 1000
+            stats.update({'p50_ms': float(p50), 'p99_ms': float(p99)})
+        else:
+            stats.update({'p50_ms': None, 'p99_ms': None})
+        return stats
+    
+    def _from_records(self, records: List[Dict[str, Any]]) -> List[List[Any]]:
+        """Arrange dict instances in training feature order."""
+        try:
+            return [[record[name] for name in self.features] for record in records]
+        except KeyError as e:
+            raise PredictionError(f"Missing feature {e} in request")
+    
+    def _score(self, rows: np.ndarray) -> np.ndarray:
+        """Run the model on a row matrix."""
+        # Models fitted on DataFrames check the column names; one frame per batch is cheap
+        return self._predict(pd.DataFrame(rows, columns=self.features))
+    
+    async def _run(self) -> None:
+        """Collect requests into batches and score them."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            n_rows = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            
+            while n_rows < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(request)
+                n_rows += len(request[0])
+            
+            try:
+                await self._score_batch(loop, batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _score_batch(self, loop: asyncio.AbstractEventLoop, batch: List[Tuple[np.ndarray, asyncio.Future]]) -> None:
+        """Score a batch in a worker thread and resolve each request's future."""
+        sizes = [len(rows) for rows, _ in batch]
+        try:
+            rows = np.concatenate([rows for rows, _ in batch])
+            predictions = await loop.run_in_executor(None, self._score, rows)
+        except Exception as e:
+            self._counts['errors'] += len(batch)
+            logger.error(f"Batch of {len(batch)} requests failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(PredictionError(f"Error during prediction: {str(e)}"))
+            return
+        
+        self._counts['requests'] += len(batch)
+        self._counts['rows'] += sum(sizes)
+        self._counts['batches'] += 1
+        
+        offsets = np.cumsum([0] + sizes)
+        for (_, future), start, stop in zip(batch, offsets[:-1], offsets[1:]):
+            # The caller may have been cancelled while the batch was scored
+            if not future.done():
+                future.set_result(predictions[start:stop])
+
+
+def create_app(server: ModelServer) -> web.Application:
+    """
+    HTTP front end for a model server.
+    
+    ``POST /predict`` takes ``{"instances": [...]}`` (feature lists or
+    dicts, or a single instance) and always returns a list,
+    ``{"predictions": [...]}``; invalid instances get a 400 response
+    without affecting other requests. ``GET /stats`` returns
+    the server's counters. The batching task starts and stops with the app.
+    
+    Args:
+        server: Model server handling the requests
+    
+    Returns:
+        aiohttp application
+    """
+    async def predict(request: web.Request) -> web.Response:
+        try:
+            body = await request.json()
+            predictions = await server.predict(body['instances'])
+        except (ValueError, KeyError, TypeError) as e:
+            return web.json_response({'error': f"Invalid request: {e}"}, status=400)
+        except PredictionError as e:
+            return web.json_response({'error': str(e)}, status=400)
+        return web.json_response({'predictions': np.atleast_1d(predictions).tolist()})
+    
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response(server.stats)
+    
+    async def on_startup(app: web.Application) -> None:
+        server.start()
+    
+    async def on_cleanup(app: web.Application) -> None:
+        await server.close()
+    
+    app = web.Application()
+    app.router.add_post('/predict', predict)
+    app.router.add_get('/stats', stats)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def serve(server: ModelServer, host: str = "127.0.0.1", port: int = 8080) -> None:
+    """
+    Serve a model over HTTP until interrupted.
+    
+    Args:
+        server: Model server handling the requests
+        host: Interface to bind
+        port: Port to listen on
+    """
+    logger.info(f"Serving {server.pipeline.model_type} model on http://{host}:{port}")
+    web.run_app(create_app(server), host=host, port=port, print=None)
@@ -0,0 +1,105 @@
+"""
+Tests for streaming statistics accumulators.
+"""
+
+import pickle
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.analysis.accumulators import StatisticsAccumulator, QuantileSketch
+from src.analysis.statistics import StatisticalAnalyzer
+from src.core.exceptions import DataValidationError
+
+
+class TestStatisticsAccumulator:
+    """Test suite for StatisticsAccumulator class."""
+    
+    def test_batches_match_descriptive_stats(self, sample_dataframe):
+        """Test batched updates reproduce the in-memory statistics."""
+        df = sample_dataframe.copy()
+        df.loc[3:8, 'feature2'] = np.nan
+        
+        accumulator = StatisticsAccumulator()
+        for start in range(0, len(df), 30):
+            accumulator.update(df.iloc[start:start + 30])
+        
+        expected = StatisticalAnalyzer()._descriptive_stats(df)
+        result = accumulator.finalize()
+        
+        assert result.keys() == expected.keys()
+        for key in expected:
+            for col in expected[key]:
+                assert result[key][col] == pytest.approx(expected[key][col], rel=1e-9)
+    
+    def test_merge_partitions(self, sample_dataframe):
+        """Test accumulators from separate partitions merge to the global result."""
+        partitions = [sample_dataframe.iloc[:20], sample_dataframe.iloc[20:]]
+        accumulators = [StatisticsAccumulator().update(part) for part in partitions]
+        
+        # Accumulators must survive a round trip to worker processes
+        merged = StatisticsAccumulator()
+        for accumulator in pickle.loads(pickle.dumps(accumulators)):
+            merged.merge(accumulator)
+        
+        expected = StatisticsAccumulator().update(sample_dataframe).finalize()
+        result = merged.finalize()
+        
+        for key in expected:
+            for col in expected[key]:
+                assert result[key][col] == pytest.approx(expected[key][col], rel=1e-9)
+    
+    def test_tiny_scale_and_constant_columns(self):
+        """Test small-scale columns keep their spread while constant columns have none."""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'tiny': rng.standard_normal(200) * 1e-9,
+            'constant': np.full(200, 0.1),
+            'offset': 1e6 + rng.standard_normal(200) * 1e-3
+        })
+        
+        accumulator = StatisticsAccumulator()
+        for start in range(0, len(df), 70):
+            accumulator.update(df.iloc[start:start + 70])
+        result = accumulator.finalize()
+        
+        for col in ['tiny', 'offset']:
+            assert result['std'][col] == pytest.approx(df[col].std(), rel=1e-6)
+            assert result['skewness'][col] == pytest.approx(df[col].skew(), rel=1e-6)
+            assert result['kurtosis'][col] == pytest.approx(df[col].kurtosis(), rel=1e-6)
+        assert result['skewness']['constant'] == 0.0
+        assert result['kurtosis']['constant'] == 0.0
+        assert result['std']['constant'] == pytest.approx(0.0, abs=1e-15)
+        
+        analysis = StatisticalAnalyzer().analyze(df)
+        scaled = StatisticalAnalyzer().analyze(df.assign(tiny=df['tiny'] * 1e9))
+        assert analysis['descriptive']['skewness']['tiny'] == pytest.approx(df['tiny'].skew())
+        assert analysis['outliers']['tiny'] == scaled['outliers']['tiny']
+        assert analysis['outliers']['constant']['count'] == 0
+    
+    def test_merge_different_columns(self, sample_dataframe):
+        """Test merging accumulators over different columns raises error."""
+        first = StatisticsAccumulator(columns=['feature1'])
+        second = StatisticsAccumulator(columns=['feature2'])
+        
+        with pytest.raises(DataValidationError):
+            first.merge(second)
+
+
+class TestQuantileSketch:
+    """Test suite for QuantileSketch class."""
+    
+    def test_compressed_quantiles(self):
+        """Test compressed sketch stays close to exact quantiles."""
+        values = np.random.default_rng(0).standard_normal(50000)
+        
+        sketch = QuantileSketch(compression=200)
+        for chunk in np.array_split(values, 50):
+            sketch.update(chunk)
+        
+        assert len(sketch.means) < 2000
+        for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+            assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), abs=0.02)
+        assert sketch.quantile(0.0) == values.min()
+        assert sketch.quantile(1.0) == values.max()
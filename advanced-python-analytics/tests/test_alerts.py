@@ -0,0 +1,232 @@
+"""
+Tests for alert dispatch module.
+"""
+
+import asyncio
+import io
+import json
+
+import pytest
+import pandas as pd
+from aiohttp import web
+
+from src.data.alerts import Alert, AlertDispatcher, AlertSink, FileSink, StdoutSink, WebhookSink
+from src.data.ingestion import StreamProcessor
+
+
+class RecordingSink(AlertSink):
+    """Sink keeping every delivered batch, optionally held until released."""
+    
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.alerts = []
+        self.fail = fail
+        self.release = asyncio.Event()
+        self.release.set()
+    
+    async def send(self, alerts):
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("sink unavailable")
+        self.batches.append([alert.key for alert in alerts])
+        self.alerts.extend(alerts)
+
+
+class FakeClock:
+    """Manually advanced time source."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestAlertDispatcher:
+    """Test suite for AlertDispatcher class."""
+    
+    @pytest.mark.asyncio
+    async def test_deduplication_window(self):
+        """Test identical alerts are suppressed within the window and counted."""
+        clock = FakeClock()
+        sink = RecordingSink()
+        dispatcher = AlertDispatcher([sink], dedup_window=60, clock=clock)
+        
+        assert dispatcher.submit(Alert(key='cpu', message='high'))
+        assert not dispatcher.submit(Alert(key='cpu', message='high'))
+        assert not dispatcher.submit(Alert(key='cpu', message='high'))
+        assert dispatcher.submit(Alert(key='cpu', message='other'))
+        
+        clock.now = 61
+        repeated = Alert(key='cpu', message='high')
+        assert dispatcher.submit(repeated)
+        assert repeated.suppressed == 2
+        
+        await dispatcher.close()
+        assert dispatcher.stats['deduplicated'] == 2
+        assert sum(len(batch) for batch in sink.batches) == 3
+    
+    @pytest.mark.asyncio
+    async def test_dedup_key_overrides_message(self):
+        """Test alerts sharing a dedup key are duplicates whatever their message."""
+        dispatcher = AlertDispatcher([RecordingSink()], clock=FakeClock())
+        
+        assert dispatcher.submit(Alert(key='cpu', message='91%', dedup_key='high'))
+        assert not dispatcher.submit(Alert(key='cpu', message='93%', dedup_key='high'))
+        assert dispatcher.submit(Alert(key='cpu', message='99%', dedup_key='critical'))
+        
+        await dispatcher.close()
+        assert dispatcher.stats['deduplicated'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_prune_forgets_expired_suppressed_fingerprints(self):
+        """Test expired fingerprints are pruned even when duplicates were suppressed."""
+        clock = FakeClock()
+        dispatcher = AlertDispatcher([RecordingSink()], dedup_window=60, max_queue=1, clock=clock)
+        
+        for i in range(11):
+            dispatcher.submit(Alert(key=f"k{i}", message='x'))
+            dispatcher.submit(Alert(key=f"k{i}", message='x'))
+        assert len(dispatcher._suppressed) == 11
+        
+        clock.now = 61
+        for i in range(11, 22):
+            dispatcher.submit(Alert(key=f"k{i}", message='x'))
+        
+        assert len(dispatcher._last_seen) <= 11
+        assert dispatcher._suppressed == {}
+        await dispatcher.close()
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_per_key(self):
+        """Test each key gets its own token bucket that refills over time."""
+        clock = FakeClock()
+        dispatcher = AlertDispatcher([RecordingSink()], rate_limit=2, rate_period=10, clock=clock)
+        
+        accepted = [dispatcher.submit(Alert(key='a', message=str(i))) for i in range(4)]
+        assert accepted == [True, True, False, False]
+        assert dispatcher.submit(Alert(key='b', message='0'))
+        
+        clock.now = 5
+        assert dispatcher.submit(Alert(key='a', message='4'))
+        assert not dispatcher.submit(Alert(key='a', message='5'))
+        
+        await dispatcher.close()
+        assert dispatcher.stats['rate_limited'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_bounded_queue_drops_oldest(self):
+        """Test an alert storm never blocks submit and keeps the newest alerts."""
+        sink = RecordingSink()
+        sink.release.clear()
+        dispatcher = AlertDispatcher([sink], batch_size=10, flush_interval=0.01, max_queue=2)
+        
+        for i in range(5):
+            dispatcher.submit(Alert(key=f"k{i}", message='storm'))
+        
+        sink.release.set()
+        await dispatcher.close()
+        
+        assert dispatcher.stats['dropped'] == 3
+        assert sink.batches == [['k3', 'k4']]
+    
+    @pytest.mark.asyncio
+    async def test_failing_sink_does_not_stop_delivery(self):
+        """Test a failing sink is counted while other sinks still receive alerts."""
+        healthy, broken = RecordingSink(), RecordingSink(fail=True)
+        
+        async with AlertDispatcher([healthy, broken], flush_interval=0.01) as dispatcher:
+            dispatcher.submit(Alert(key='a', message='x'))
+            await dispatcher.flush()
+            dispatcher.submit(Alert(key='b', message='x'))
+        
+        assert healthy.batches == [['a'], ['b']]
+        assert dispatcher.stats['failed'] == 2
+        assert dispatcher.stats['delivered'] == 2
+
+
+class TestAlertSinks:
+    """Test suite for alert sinks."""
+    
+    @pytest.mark.asyncio
+    async def test_stdout_and_file_sinks(self, tmp_path):
+        """Test stream and file sinks write one JSON line per alert."""
+        stream = io.StringIO()
+        path = tmp_path / "alerts.jsonl"
+        
+        async with AlertDispatcher([StdoutSink(stream), FileSink(str(path))], flush_interval=0.01) as dispatcher:
+            dispatcher.submit(Alert(key='a', message='x', count=3))
+            dispatcher.submit(Alert(key='b', message='y'))
+        
+        for text in [stream.getvalue(), path.read_text()]:
+            lines = [json.loads(line) for line in text.splitlines()]
+            assert [line['key'] for line in lines] == ['a', 'b']
+            assert lines[0]['count'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_webhook_sink_posts_batches(self):
+        """Test the webhook sink posts each batch as a JSON array to a local stub."""
+        received = []
+        
+        async def handler(request):
+            received.append(await request.json())
+            return web.Response()
+        
+        app = web.Application()
+        app.router.add_post('/alerts', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        
+        try:
+            sink = WebhookSink(f"http://127.0.0.1:{port}/alerts")
+            async with AlertDispatcher([sink], flush_interval=0.05) as dispatcher:
+                dispatcher.submit(Alert(key='a', message='x'))
+                dispatcher.submit(Alert(key='b', message='x'))
+        finally:
+            await runner.cleanup()
+        
+        assert [[alert['key'] for alert in batch] for batch in received] == [['a', 'b']]
+        assert dispatcher.stats['failed'] == 0
+
+
+class TestStreamProcessorAlert:
+    """Test suite for StreamProcessor.alert."""
+    
+    @pytest.mark.asyncio
+    async def test_alert_is_dispatched(self):
+        """Test alerts carry a sample of records and are deduplicated per key."""
+        sink = RecordingSink()
+        dispatcher = AlertDispatcher([sink], flush_interval=0.01)
+        processor = StreamProcessor(dispatcher=dispatcher, max_alert_records=2)
+        anomalies = pd.DataFrame({
+            'timestamp': pd.date_range('2024-01-01', periods=4, freq='1min'),
+            'value': [1.0, 2.0, 3.0, 4.0]
+        })
+        
+        assert await processor.alert(anomalies, key='sensor-1')
+        assert not await processor.alert(anomalies, key='sensor-1')
+        assert await processor.alert(anomalies, key='sensor-2')
+        await dispatcher.close()
+        
+        assert sink.batches == [['sensor-1', 'sensor-2']]
+        assert sink.alerts[0].count == 4
+        assert [record['value'] for record in sink.alerts[0].records] == [1.0, 2.0]
+        assert not await StreamProcessor().alert(anomalies)
+    
+    @pytest.mark.asyncio
+    async def test_larger_batch_is_not_deduplicated(self):
+        """Test a batch in a higher record-count bucket is alerted again."""
+        sink = RecordingSink()
+        dispatcher = AlertDispatcher([sink], flush_interval=0.01)
+        processor = StreamProcessor(dispatcher=dispatcher)
+        
+        assert await processor.alert(pd.DataFrame({'value': [1.0, 2.0]}), key='sensor-1')
+        assert not await processor.alert(pd.DataFrame({'value': [3.0, 4.0, 5.0]}), key='sensor-1')
+        assert await processor.alert(pd.DataFrame({'value': range(10)}), key='sensor-1')
+        await dispatcher.close()
+        
+        assert [alert.count for alert in sink.alerts] == [2, 10]
+        assert sink.alerts[1].message == "10 anomalous records detected by sensor-1"
@@ -0,0 +1,326 @@
+"""
+Tests for anomaly detection module.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from scipy import stats
+from sklearn.neighbors import LocalOutlierFactor
+from sklearn.preprocessing import StandardScaler
+
+from src.analysis.anomaly import (
+    AnomalyDetector, EnsembleAnomalyDetector, HistogramOutlierModel, StreamingAnomalyDetector
+)
+from src.core.config import Config
+from src.core.exceptions import ConfigurationError, DataValidationError, PredictionError
+
+
+@pytest.fixture
+def stream_dataframe():
+    """Two normal features with one injected spike."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'value': rng.normal(size=3000),
+        'load': rng.normal(size=3000)
+    })
+    df.loc[2500, 'value'] = 12.0
+    return df
+
+
+class TestAnomalyDetector:
+    """Test suite for AnomalyDetector class."""
+    
+    def test_zscore_matches_per_feature_reference(self, sample_dataframe):
+        """Test vectorized z-score detection matches per-column scipy z-scores."""
+        df = sample_dataframe.copy()
+        df.loc[5, 'feature1'] = 8.0
+        df.loc[0:9, 'feature2'] = np.nan
+        features = ['feature1', 'feature2', 'feature3', 'target']
+        
+        expected = np.zeros(len(df), dtype=bool)
+        for feature in features:
+            z_scores = np.abs(stats.zscore(df[feature].fillna(df[feature].mean())))
+            expected |= z_scores > 2.5
+        
+        anomalies = AnomalyDetector(method='zscore', threshold=2.5).detect(df)
+        
+        assert anomalies.index.equals(df.index[expected])
+        assert 5 in anomalies.index
+    
+    def test_iqr_matches_per_feature_reference(self, sample_dataframe):
+        """Test vectorized IQR detection matches per-column quantile fences."""
+        df = sample_dataframe.copy()
+        df.loc[7, 'target'] = 500.0
+        df.loc[0:9, 'feature1'] = np.nan
+        
+        expected = np.zeros(len(df), dtype=bool)
+        for feature in ['feature1', 'feature2', 'feature3', 'target']:
+            q1, q3 = df[feature].quantile(0.25), df[feature].quantile(0.75)
+            expected |= (df[feature] < q1 - 1.5 * (q3 - q1)) | (df[feature] > q3 + 1.5 * (q3 - q1))
+        
+        anomalies = AnomalyDetector(method='iqr').detect(df)
+        
+        assert anomalies.index.equals(df.index[expected])
+    
+    def test_detect_details(self, sample_dataframe):
+        """Test details report row scores and the features out of range."""
+        df = sample_dataframe.copy()
+        df.loc[3, 'feature2'] = 9.0
+        
+        details = AnomalyDetector(method='zscore', threshold=3.0).detect_details(df)
+        
+        assert details['is_anomaly'][3]
+        assert details['scores'][3] == details['scores'].max()
+        assert details['offending_features'].loc[3].tolist() == [False, True, False, False]
+        assert list(details['offending_features'].index) == list(df.index[details['is_anomaly']])
+        assert AnomalyDetector(method='zscore').get_anomaly_scores(df) == pytest.approx(details['scores'])
+    
+    @pytest.mark.parametrize("method", ["isolation_forest", "hbos", "mcd", "lof", "zscore", "iqr"])
+    def test_save_load_round_trip(self, sample_dataframe, tmp_path, method):
+        """Test a loaded detector scores exactly like the fitted one."""
+        detector = AnomalyDetector(method=method).fit(sample_dataframe)
+        path = tmp_path / "detector.joblib"
+        detector.save(str(path))
+        
+        loaded = AnomalyDetector.load(str(path))
+        
+        assert loaded.features == detector.features
+        assert loaded.get_anomaly_scores(sample_dataframe) == pytest.approx(
+            detector.get_anomaly_scores(sample_dataframe)
+        )
+        assert loaded.detect(sample_dataframe).index.equals(detector.detect(sample_dataframe).index)
+    
+    def test_fitted_state_is_reused(self, sample_dataframe):
+        """Test fitted parameters score new batches without refitting."""
+        detector = AnomalyDetector(method='zscore', threshold=3.0).fit(sample_dataframe)
+        mean = detector.parameters['mean'].copy()
+        
+        # A shifted batch is anomalous against the training data, not against itself
+        shifted = sample_dataframe.head(10).copy()
+        shifted['target'] += 1000
+        
+        assert len(detector.detect(shifted)) == 10
+        assert len(AnomalyDetector(method='zscore', threshold=3.0).detect(shifted)) == 0
+        assert detector.parameters['mean'] == pytest.approx(mean)
+        
+        # Features follow the fitted order regardless of column order
+        reordered = shifted[list(reversed(shifted.columns))]
+        assert detector.get_anomaly_scores(reordered) == pytest.approx(
+            detector.get_anomaly_scores(shifted)
+        )
+    
+    def test_missing_fitted_features(self, sample_dataframe):
+        """Test scoring data without a fitted feature raises a prediction error."""
+        detector = AnomalyDetector(method='iqr').fit(sample_dataframe)
+        
+        with pytest.raises(PredictionError):
+            detector.detect(sample_dataframe.drop(columns=['feature1']))
+    
+    def test_config_settings(self, sample_dataframe):
+        """Test anomaly config settings reach the Isolation Forest model."""
+        config = Config()
+        config.anomaly.n_estimators = 20
+        config.anomaly.max_samples = 50
+        config.anomaly.contamination = 0.05
+        config.anomaly.n_jobs = 2
+        
+        detector = AnomalyDetector(config=config).fit(sample_dataframe)
+        
+        assert detector.model.n_estimators == 20
+        assert detector.model.max_samples == 50
+        assert detector.model.n_jobs == 2
+        assert len(detector.detect(sample_dataframe)) == 5
+    
+    @pytest.mark.parametrize("method", ["isolation_forest", "zscore", "iqr"])
+    def test_chunked_scores_match_single_block(self, sample_dataframe, method):
+        """Test scoring in parallel row blocks matches scoring in one block."""
+        config = Config()
+        config.anomaly.chunk_size = len(sample_dataframe)
+        detector = AnomalyDetector(method=method, config=config).fit(sample_dataframe)
+        expected = detector.get_anomaly_scores(sample_dataframe)
+        
+        detector.chunk_size = 7
+        detector.n_jobs = 4
+        
+        assert detector.get_anomaly_scores(sample_dataframe) == pytest.approx(expected)
+        assert detector.detect_details(sample_dataframe)['scores'] == pytest.approx(expected)
+    
+    
+    def test_hbos_matches_histogram_reference(self, sample_dataframe):
+        """Test HBOS scores are summed log heights of numpy histograms."""
+        X = sample_dataframe[['feature1', 'feature2']].to_numpy(dtype=np.float64)
+        
+        expected = np.zeros(len(X))
+        for j in range(X.shape[1]):
+            counts, edges = np.histogram(X[:, j], bins=5)
+            bins = np.clip(np.digitize(X[:, j], edges) - 1, 0, 4)
+            expected += np.log((counts[bins] + 0.1) / (counts.max() + 0.1))
+        
+        model = HistogramOutlierModel(n_bins=5).fit(X)
+        
+        assert model.score_samples(X) == pytest.approx(expected)
+        assert model.score_samples(np.array([[1e6, np.nan]]))[0] < expected.min()
+    
+    def test_hbos_contamination(self, sample_dataframe):
+        """Test HBOS maps auto contamination to the default share and rejects invalid values."""
+        X = sample_dataframe[['feature1', 'feature2']].to_numpy(dtype=np.float64)
+        
+        auto = HistogramOutlierModel(contamination='auto').fit(X)
+        default = HistogramOutlierModel(contamination=0.1).fit(X)
+        
+        assert auto.offset_ == pytest.approx(default.offset_)
+        for contamination in ['high', 0.0, 0.8]:
+            with pytest.raises(ConfigurationError):
+                HistogramOutlierModel(contamination=contamination).fit(X)
+    
+    @pytest.mark.parametrize("method", ["mcd", "lof"])
+    def test_multivariate_methods_find_correlation_breaks(self, method):
+        """Test density and covariance methods flag rows that break a correlation."""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            rng.multivariate_normal([0, 0], [[1, 0.9], [0.9, 1]], size=1000),
+            columns=['a', 'b']
+        )
+        df.loc[:4, ['a', 'b']] = [[2.0, -2.0]] * 5
+        
+        is_anomaly = AnomalyDetector(method=method).fit(df).detect_details(df)['is_anomaly']
+        
+        assert is_anomaly[:5].all()
+        # Each value is within two standard deviations on its own
+        assert not AnomalyDetector(method='zscore', threshold=3.0).detect_details(df)['is_anomaly'][:5].any()
+    
+    def test_lof_scores_new_rows(self, sample_dataframe):
+        """Test LOF scores new rows like a LocalOutlierFactor fitted on the training rows."""
+        config = Config()
+        config.anomaly.n_neighbors = 10
+        train, new = sample_dataframe.head(80), sample_dataframe.tail(20)
+        detector = AnomalyDetector(method='lof', config=config).fit(train)
+        
+        scaler = StandardScaler().fit(train[detector.features])
+        reference = LocalOutlierFactor(n_neighbors=10, novelty=True).fit(
+            scaler.transform(train[detector.features])
+        )
+        expected = -reference.score_samples(scaler.transform(new[detector.features]))
+        
+        assert detector.get_anomaly_scores(new) == pytest.approx(expected)
+        # Scoring again reuses the fitted index and gives the same scores
+        assert detector.get_anomaly_scores(new) == pytest.approx(expected)
+
+
+class TestEnsembleAnomalyDetector:
+    """Test suite for EnsembleAnomalyDetector class."""
+    
+    @pytest.mark.parametrize("combine", ["rank", "max"])
+    def test_combines_member_percentiles(self, stream_dataframe, combine):
+        """Test combined scores come from member scores normalized to percentiles."""
+        ensemble = EnsembleAnomalyDetector(methods=['hbos', 'zscore', 'iqr'], combine=combine)
+        details = ensemble.fit(stream_dataframe).detect_details(stream_dataframe)
+        contributions = details['contributions']
+        
+        expected = contributions.max(axis=1) if combine == "max" else contributions.mean(axis=1)
+        assert details['scores'] == pytest.approx(expected.values)
+        assert contributions.values.min() >= 0 and contributions.values.max() <= 1
+        assert details['is_anomaly'][2500]
+        
+        # Normalization preserves each member's ordering of rows
+        for method in ['hbos', 'zscore', 'iqr']:
+            raw = AnomalyDetector(method=method).fit(stream_dataframe).get_anomaly_scores(stream_dataframe)
+            order = np.argsort(raw, kind='stable')
+            assert (np.diff(contributions[method].values[order]) >= 0).all()
+    
+    def test_features_extracted_once(self, sample_dataframe, monkeypatch):
+        """Test numeric features are selected once per fit and never per member."""
+        calls = []
+        original = pd.DataFrame.select_dtypes
+        monkeypatch.setattr(
+            pd.DataFrame, 'select_dtypes',
+            lambda self, *args, **kwargs: calls.append(1) or original(self, *args, **kwargs)
+        )
+        
+        ensemble = EnsembleAnomalyDetector(methods=['isolation_forest', 'hbos', 'zscore'])
+        ensemble.fit(sample_dataframe)
+        assert len(calls) == 1
+        
+        scores = ensemble.get_anomaly_scores(sample_dataframe.head(10))
+        assert len(calls) == 1
+        assert len(scores) == 10
+    
+    def test_invalid_settings(self):
+        """Test unknown methods and combination rules are rejected."""
+        with pytest.raises(ValueError):
+            EnsembleAnomalyDetector(methods=['zscore', 'unknown'])
+        with pytest.raises(ValueError):
+            EnsembleAnomalyDetector(combine='median')
+    
+    def test_contamination_from_config(self, sample_dataframe):
+        """Test the cut-off follows the configured contamination, with auto as the default share."""
+        config = Config()
+        assert EnsembleAnomalyDetector(config=config).contamination == config.anomaly.contamination
+        
+        config.anomaly.contamination = 'auto'
+        ensemble = EnsembleAnomalyDetector(methods=['hbos', 'zscore'], config=config)
+        expected = EnsembleAnomalyDetector(methods=['hbos', 'zscore']).fit(sample_dataframe)
+        
+        assert ensemble.fit(sample_dataframe).offset_ == pytest.approx(expected.offset_)
+
+
+class TestStreamingAnomalyDetector:
+    """Test suite for StreamingAnomalyDetector class."""
+    
+    def test_matches_exponential_moving_statistics(self, stream_dataframe):
+        """Test batched updates reproduce pandas exponentially weighted statistics."""
+        detector = StreamingAnomalyDetector(halflife=50)
+        for start in range(0, len(stream_dataframe), 7):
+            detector.update(stream_dataframe.iloc[start:start + 7])
+        
+        ewm = stream_dataframe.ewm(halflife=50)
+        assert detector._mean == pytest.approx(ewm.mean().iloc[-1].values)
+        assert detector._var == pytest.approx(ewm.var(bias=True).iloc[-1].values)
+    
+    @pytest.mark.parametrize("method", ["zscore", "iqr"])
+    def test_small_batches_use_accumulated_state(self, stream_dataframe, method):
+        """Test a spike is found even when every batch holds a single row."""
+        detector = StreamingAnomalyDetector(method=method, threshold=5.0, iqr_multiplier=3.0)
+        
+        flagged = []
+        for start in range(len(stream_dataframe)):
+            flagged.extend(detector.detect(stream_dataframe.iloc[start:start + 1]).index)
+        
+        assert 2500 in flagged
+        assert len(flagged) < 10
+    
+    def test_warmup_and_nan(self, stream_dataframe):
+        """Test rows are not flagged during warmup and NaN values never score."""
+        detector = StreamingAnomalyDetector(warmup=100)
+        batch = stream_dataframe.iloc[:50].copy()
+        batch.loc[0, 'value'] = 1e6
+        
+        assert len(detector.detect(batch)) == 0
+        detector.update(stream_dataframe.iloc[50:200])
+        
+        batch = stream_dataframe.iloc[200:210].copy()
+        batch.loc[200, 'value'] = np.nan
+        assert detector.score(batch)[0] < 3.0
+    
+    def test_drift_adaptation(self):
+        """Test a decaying state follows a level shift while a static one lags behind."""
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame({'value': np.r_[rng.normal(size=2000), rng.normal(size=1000) + 8]})
+        
+        adaptive = StreamingAnomalyDetector(halflife=100, learn_anomalies=True)
+        static = StreamingAnomalyDetector(halflife=None, learn_anomalies=True)
+        for start in range(0, len(df), 20):
+            adaptive.update(df.iloc[start:start + 20])
+            static.update(df.iloc[start:start + 20])
+        
+        assert adaptive._mean[0] == pytest.approx(8.0, abs=0.3)
+        assert static._mean[0] == pytest.approx(df['value'].mean())
+        assert len(adaptive.detect(df.iloc[-100:])) == 0
+    
+    def test_missing_features(self, stream_dataframe):
+        """Test batches without the tracked features are rejected."""
+        detector = StreamingAnomalyDetector().update(stream_dataframe)
+        
+        with pytest.raises(DataValidationError):
+            detector.detect(stream_dataframe[['value']])
@@ -0,0 +1,123 @@
+"""
+Tests for model artifact module.
+"""
+
+import json
+import pickle
+
+import pytest
+import numpy as np
+
+from src.models.ml_pipeline import MLPipeline
+from src.models.compiled import CompiledTreeEnsemble
+from src.models.artifacts import (
+    ARTIFACT_VERSION, ArtifactArrays, LazyModel, save_artifact, load_artifact, read_metadata
+)
+from src.core.exceptions import DataLoadError
+
+
+@pytest.fixture
+def numeric_data(sample_dataframe):
+    """Sample data without the string column."""
+    return sample_dataframe.drop(columns=['category'])
+
+
+class TestModelArtifacts:
+    """Test suite for model artifacts."""
+    
+    @pytest.mark.parametrize('model_type', ['random_forest', 'linear', 'xgboost'])
+    def test_round_trip(self, tmp_path, numeric_data, model_type):
+        """Test an artifact predicts like the pipeline it was saved from."""
+        pipeline = MLPipeline(model_type=model_type, problem_type='regression').fit(numeric_data, target='target')
+        save_artifact(pipeline, str(tmp_path / 'model'))
+        
+        loaded = load_artifact(str(tmp_path / 'model'))
+        
+        assert isinstance(loaded.model, LazyModel) and not loaded.model.loaded
+        assert loaded.feature_columns == pipeline.feature_columns
+        assert loaded.predict(numeric_data) == pytest.approx(pipeline.predict(numeric_data))
+        assert loaded.model.loaded
+    
+    def test_metadata(self, tmp_path, numeric_data):
+        """Test the metadata records features, versions and the training data fingerprint."""
+        pipeline = MLPipeline(model_type='random_forest', problem_type='regression').fit(numeric_data, target='target')
+        save_artifact(pipeline, str(tmp_path / 'model'))
+        metadata = read_metadata(str(tmp_path / 'model'))
+        
+        assert metadata['format_version'] == ARTIFACT_VERSION
+        assert metadata['feature_columns'] == ['feature1', 'feature2', 'feature3']
+        assert metadata['problem_type'] == 'regression'
+        assert metadata['estimator'].endswith('RandomForestRegressor')
+        assert metadata['versions']['numpy'] == np.__version__
+        
+        same = MLPipeline(model_type='linear').fit(numeric_data, target='target')
+        changed_data = numeric_data.copy()
+        changed_data.loc[0, 'feature1'] += 1
+        changed = MLPipeline(model_type='linear').fit(changed_data, target='target')
+        assert metadata['data_fingerprint'] == same.data_fingerprint
+        assert metadata['data_fingerprint'] != changed.data_fingerprint
+    
+    def test_tree_arrays_are_memory_mapped(self, tmp_path, numeric_data):
+        """Test tree node arrays are stored raw and read back as read-only mapped views."""
+        pipeline = MLPipeline(model_type='random_forest', problem_type='regression').fit(numeric_data, target='target')
+        metadata = save_artifact(pipeline, str(tmp_path / 'model'))
+        arrays = ArtifactArrays(str(tmp_path / 'model'), metadata['arrays'])
+        
+        nodes = pipeline.model.estimators_[0].tree_.__getstate__()['nodes']
+        matches = [i for i in range(len(arrays)) if arrays[i].dtype == nodes.dtype and len(arrays[i]) == len(nodes)]
+        
+        assert len(arrays) >= len(pipeline.model.estimators_)
+        assert matches
+        assert isinstance(arrays.mapped, np.memmap)
+        assert not arrays[matches[0]].flags.writeable
+        assert (arrays[matches[0]]['threshold'] == nodes['threshold']).all()
+    
+    @pytest.mark.parametrize('model_type', ['random_forest', 'xgboost'])
+    def test_compiled_model_stays_mapped(self, tmp_path, numeric_data, model_type):
+        """Test a compiled load predicts from node arrays that remain views of the mapped file."""
+        pipeline = MLPipeline(model_type=model_type, problem_type='regression').fit(numeric_data, target='target')
+        metadata = save_artifact(pipeline, str(tmp_path / 'model'))
+        
+        loaded = load_artifact(str(tmp_path / 'model'), compiled=True)
+        compiled = loaded.model.compiled.load()
+        
+        assert metadata['compiled']
+        assert isinstance(compiled, CompiledTreeEnsemble)
+        for name in ['children', 'threshold', 'value']:
+            assert not compiled.arrays[name].flags.writeable
+            assert not compiled.arrays[name].flags.owndata
+        assert loaded.predict(numeric_data) == pytest.approx(pipeline.predict(numeric_data), rel=1e-5)
+        
+        linear = MLPipeline(model_type='linear').fit(numeric_data, target='target')
+        save_artifact(linear, str(tmp_path / 'linear'))
+        with pytest.raises(DataLoadError):
+            load_artifact(str(tmp_path / 'linear'), compiled=True)
+    
+    def test_lazy_model_pickles_by_path(self, tmp_path, numeric_data):
+        """Test pickling a lazy model ships the path, not the arrays."""
+        pipeline = MLPipeline(model_type='random_forest', problem_type='regression').fit(numeric_data, target='target')
+        save_artifact(pipeline, str(tmp_path / 'model'))
+        loaded = load_artifact(str(tmp_path / 'model'))
+        loaded.predict(numeric_data)
+        
+        payload = pickle.dumps(loaded.model)
+        restored = pickle.loads(payload)
+        
+        assert len(payload) < 100000 < len(pickle.dumps(pipeline.model))
+        assert not restored.loaded
+        assert restored.predict(numeric_data[pipeline.feature_columns]) == pytest.approx(pipeline.predict(numeric_data))
+    
+    def test_invalid_artifacts(self, tmp_path, numeric_data):
+        """Test missing artifacts and newer format versions are rejected."""
+        with pytest.raises(DataLoadError):
+            load_artifact(str(tmp_path / 'missing'))
+        
+        pipeline = MLPipeline(model_type='linear').fit(numeric_data, target='target')
+        save_artifact(pipeline, str(tmp_path / 'model'))
+        metadata_path = tmp_path / 'model' / 'metadata.json'
+        metadata = json.loads(metadata_path.read_text())
+        metadata['format_version'] = ARTIFACT_VERSION + 1
+        metadata_path.write_text(json.dumps(metadata))
+        
+        with pytest.raises(DataLoadError):
+            load_artifact(str(tmp_path / 'model'))
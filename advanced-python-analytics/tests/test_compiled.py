@@ -0,0 +1,197 @@
+"""
+Tests for compiled model module.
+"""
+
+import time
+
+import pytest
+import numpy as np
+import xgboost as xgb
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.linear_model import LinearRegression
+
+from src.models.compiled import BatchRoutedModel, CompiledTreeEnsemble, compile_model
+from src.models.ml_pipeline import MLPipeline, FoldEnsemble
+from src.models.artifacts import save_artifact, load_artifact
+from src.core.exceptions import ModelTrainingError, PredictionError
+
+
+def make_data(n_rows=600, n_features=6, seed=0):
+    """Float32-exact features with a regression, binary and three-class target."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features)).astype(np.float32).astype(np.float64)
+    signal = X[:, 0] + np.sin(2 * X[:, 1]) + 0.5 * X[:, 2] * X[:, 3]
+    return X, {
+        'regression': signal + 0.1 * rng.normal(size=n_rows),
+        'binary': (signal > 0).astype(int),
+        'multiclass': np.digitize(signal, [-0.5, 0.5])
+    }
+
+
+def boundary_rows(X, thresholds, seed=1):
+    """Rows whose features sit exactly on split thresholds and their float32 neighbours."""
+    rng = np.random.default_rng(seed)
+    rows = X[rng.integers(len(X), size=300)].copy()
+    values = thresholds[np.isfinite(thresholds)].astype(np.float32)
+    for j in range(X.shape[1]):
+        picked = values[rng.integers(len(values), size=len(rows))]
+        step = rng.choice([-1, 0, 1], size=len(rows))
+        rows[:, j] = np.where(step < 0, np.nextafter(picked, np.float32(-np.inf)),
+                              np.where(step > 0, np.nextafter(picked, np.float32(np.inf)), picked))
+    return np.vstack([X, rows])
+
+
+MODELS = {
+    'forest_regression': (lambda: RandomForestRegressor(n_estimators=30, random_state=0), 'regression'),
+    'forest_binary': (lambda: RandomForestClassifier(n_estimators=30, random_state=0), 'binary'),
+    'forest_multiclass': (lambda: RandomForestClassifier(n_estimators=30, max_depth=6, random_state=0), 'multiclass'),
+    'xgboost_regression': (lambda: xgb.XGBRegressor(n_estimators=40, max_depth=4), 'regression'),
+    'xgboost_binary': (lambda: xgb.XGBClassifier(n_estimators=40, max_depth=4), 'binary'),
+    'xgboost_multiclass': (lambda: xgb.XGBClassifier(n_estimators=40, max_depth=4), 'multiclass')
+}
+
+
+class TestCompiledTreeEnsemble:
+    """Parity test suite for compiled tree ensembles."""
+    
+    @pytest.mark.parametrize('name', list(MODELS))
+    def test_prediction_parity(self, name):
+        """Test compiled models predict like the source model, including at split thresholds."""
+        make_model, target = MODELS[name]
+        X, targets = make_data()
+        model = make_model().fit(X, targets[target])
+        compiled = compile_model(model)
+        
+        X_test = boundary_rows(X, compiled.arrays['threshold'])
+        X_test[::17, 2] = np.nan
+        
+        # XGBoost accumulates leaf values in float32
+        tolerance = 1e-5 if name.startswith('xgboost') else 1e-12
+        if target == 'regression':
+            assert compiled.predict(X_test) == pytest.approx(model.predict(X_test), rel=tolerance, abs=tolerance)
+        else:
+            assert (compiled.predict(X_test) == model.predict(X_test)).all()
+            assert compiled.predict_proba(X_test) == pytest.approx(model.predict_proba(X_test), abs=tolerance)
+    
+    def test_leaves_match_sklearn_apply(self):
+        """Test every (row, tree) pair reaches the leaf sklearn reaches."""
+        X, targets = make_data()
+        model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, targets['regression'])
+        compiled = compile_model(model)
+        X_test = boundary_rows(X, compiled.arrays['threshold'])
+        
+        expected = model.apply(X_test) + compiled.arrays['roots']
+        assert (compiled.apply(X_test) == expected).all()
+    
+    def test_missing_values_follow_training_direction(self):
+        """Test NaN inputs go where trees trained with missing values send them."""
+        X, targets = make_data()
+        X[::5, 0] = np.nan
+        model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, targets['regression'])
+        
+        assert compile_model(model).predict(X) == pytest.approx(model.predict(X), rel=1e-12)
+    
+    def test_unsupported_inputs(self):
+        """Test other models and wrongly shaped inputs are rejected."""
+        X, targets = make_data()
+        with pytest.raises(ModelTrainingError):
+            compile_model(LinearRegression().fit(X, targets['regression']))
+        
+        compiled = compile_model(RandomForestRegressor(n_estimators=5).fit(X, targets['regression']))
+        with pytest.raises(PredictionError):
+            compiled.predict(X[:, :3])
+        with pytest.raises(PredictionError):
+            compiled.predict_proba(X)
+
+
+class TestPipelineCompile:
+    """Test suite for MLPipeline.compile."""
+    
+    def test_compile_pipeline(self, sample_dataframe):
+        """Test a compiled pipeline and fold ensemble predict like the originals."""
+        data = sample_dataframe.drop(columns=['category'])
+        pipeline = MLPipeline(model_type='random_forest', problem_type='regression').fit(data, target='target')
+        expected = pipeline.predict(data)
+        
+        assert pipeline.compile().predict(data) == pytest.approx(expected, rel=1e-12)
+        assert isinstance(pipeline.model, BatchRoutedModel)
+        assert isinstance(pipeline.model.compiled, CompiledTreeEnsemble)
+        assert len(pipeline.get_feature_importance()) == 3
+        
+        folds = MLPipeline(model_type='xgboost', problem_type='regression')
+        folds.cross_validate(data, target='target', cv=3)
+        expected = folds.predict(data)
+        folds.compile()
+        
+        assert isinstance(folds.model.compiled, FoldEnsemble)
+        assert folds.model.native_batch_rows == 64
+        # Above the cutoff the source models predict, below it the compiled ones
+        assert folds.predict(data) == pytest.approx(expected, rel=1e-5)
+        assert folds.predict(data.head(10)) == pytest.approx(expected[:10], rel=1e-5)
+    
+    def test_batches_are_routed_by_size(self, monkeypatch):
+        """Test batches from native_batch_rows rows on go to the source model."""
+        X, targets = make_data()
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, targets['binary'])
+        routed = MLPipeline(model_type='random_forest', problem_type='classification')
+        routed.model = model
+        routed.compile()
+        
+        calls = []
+        for name in ['compiled', 'source']:
+            target = getattr(routed.model, name)
+            original = target.predict_proba
+            monkeypatch.setattr(
+                target, 'predict_proba',
+                lambda X, name=name, original=original: calls.append((name, len(X))) or original(X)
+            )
+        
+        cutoff = routed.model.native_batch_rows
+        rows = np.tile(X, (cutoff // len(X) + 1, 1))
+        routed.model.predict_proba(rows[:cutoff - 1])
+        routed.model.predict_proba(rows[:cutoff])
+        
+        assert calls == [('compiled', cutoff - 1), ('source', cutoff)]
+    
+    @pytest.mark.parametrize('name', ['forest_multiclass', 'xgboost_regression'])
+    def test_cutoff_matches_throughput(self, name):
+        """Test the compiled model wins on single rows and the source well above the cutoff."""
+        make_model, target = MODELS[name]
+        X, targets = make_data(n_rows=2000)
+        model = make_model().set_params(n_estimators=100, n_jobs=1).fit(X, targets[target])
+        compiled = compile_model(model)
+        
+        def best_time(predict, batch):
+            times = []
+            for _ in range(5):
+                start = time.perf_counter()
+                predict(batch)
+                times.append(time.perf_counter() - start)
+            return min(times)
+        
+        single = X[:1]
+        large = np.tile(X, (8 * compiled.native_batch_rows // len(X) + 1, 1))
+        
+        assert best_time(compiled.predict, single) < best_time(model.predict, single)
+        assert best_time(model.predict, large) < best_time(compiled.predict, large)
+    
+    def test_compiled_artifact_is_memory_mapped(self, tmp_path, sample_dataframe):
+        """Test a compiled model saved as an artifact predicts from mapped node arrays."""
+        data = sample_dataframe.drop(columns=['category'])
+        pipeline = MLPipeline(model_type='random_forest', problem_type='regression').fit(data, target='target').compile()
+        metadata = save_artifact(pipeline, str(tmp_path / 'model'))
+        
+        loaded = load_artifact(str(tmp_path / 'model'), compiled=True)
+        
+        assert metadata['native_batch_rows'] == 2048
+        assert loaded.predict(data) == pytest.approx(pipeline.predict(data))
+        assert isinstance(loaded.model.compiled.arrays['children'].base, np.memmap)
+        # Small batches never load the estimator
+        assert not loaded.model.source.loaded
+        
+        # Serving large batches gains nothing from the compiled form
+        metadata = save_artifact(pipeline, str(tmp_path / 'batch'), batch_rows=10000)
+        assert not metadata['compiled']
+        
+        with pytest.raises(PredictionError):
+            MLPipeline().compile()
@@ -0,0 +1,124 @@
+"""
+Tests for correlation engine module.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.analysis import correlation
+from src.analysis.correlation import CorrelationEngine
+from src.analysis.statistics import StatisticalAnalyzer
+
+
+@pytest.fixture
+def correlated_data():
+    """Create data with known correlated column pairs."""
+    rng = np.random.default_rng(0)
+    base = rng.standard_normal((500, 6))
+    noisy = base[:, :3] + 0.2 * rng.standard_normal((500, 3))
+    columns = [f'x{i}' for i in range(6)] + ['y0', 'y1', 'y2']
+    return pd.DataFrame(np.hstack([base, noisy]), columns=columns)
+
+
+class TestCorrelationEngine:
+    """Test suite for CorrelationEngine class."""
+    
+    @pytest.mark.parametrize('with_missing', [False, True])
+    def test_matrix_matches_pandas(self, correlated_data, with_missing):
+        """Test blocked matrix matches DataFrame.corr."""
+        df = correlated_data.copy()
+        if with_missing:
+            df.iloc[::7, 1] = np.nan
+            df.iloc[::5, 7] = np.nan
+        
+        engine = CorrelationEngine(block_size=4).fit(df.to_numpy(), df.columns.tolist())
+        
+        np.testing.assert_allclose(engine.matrix().values, df.corr().values, atol=1e-12)
+    
+    def test_pairs_above_threshold(self, correlated_data):
+        """Test only strongly correlated pairs are reported."""
+        df = correlated_data
+        engine = CorrelationEngine(block_size=2).fit(df.to_numpy(), df.columns.tolist())
+        
+        pairs = engine.pairs(threshold=0.7)
+        
+        assert [(p['feature1'], p['feature2']) for p in pairs] == [
+            ('x0', 'y0'), ('x1', 'y1'), ('x2', 'y2')
+        ]
+    
+    def test_top_k_pairs(self, correlated_data):
+        """Test top-k keeps the strongest pairs in decreasing order."""
+        df = correlated_data
+        engine = CorrelationEngine(block_size=3).fit(df.to_numpy(), df.columns.tolist())
+        
+        pairs = engine.pairs(threshold=0.0, top_k=2)
+        strengths = [abs(p['correlation']) for p in pairs]
+        
+        all_pairs = engine.pairs(threshold=0.0)
+        expected = sorted((abs(p['correlation']) for p in all_pairs), reverse=True)[:2]
+        assert strengths == pytest.approx(expected)
+    
+    def test_with_column(self, correlated_data):
+        """Test single-column correlations."""
+        df = correlated_data
+        engine = CorrelationEngine().fit(df.to_numpy(), df.columns.tolist())
+        
+        target_corr = engine.with_column('y0')
+        
+        np.testing.assert_allclose(target_corr.values, df.corr()['y0'].values, atol=1e-12)
+    
+    @pytest.mark.parametrize('method', ['spearman', 'kendall'])
+    def test_rank_methods_match_pandas(self, correlated_data, method):
+        """Test rank correlations match DataFrame.corr."""
+        df = np.exp(correlated_data)
+        engine = CorrelationEngine(block_size=4, method=method)
+        engine.fit(df.to_numpy(), df.columns.tolist())
+        
+        np.testing.assert_allclose(
+            engine.matrix().values, df.corr(method=method).values, atol=1e-12
+        )
+    
+    def test_kendall_sampling(self, correlated_data):
+        """Test Kendall samples rows above the row threshold."""
+        df = correlated_data
+        engine = CorrelationEngine(method='kendall', kendall_max_rows=100)
+        engine.fit(df.to_numpy(), df.columns.tolist())
+        
+        assert engine.sampled
+        assert engine.n_rows == 100
+        assert [(p['feature1'], p['feature2']) for p in engine.pairs(threshold=0.5)] == [
+            ('x0', 'y0'), ('x1', 'y1'), ('x2', 'y2')
+        ]
+    
+    @pytest.mark.parametrize('block_size', [2, 4, 16])
+    def test_pairs_with_column(self, correlated_data, block_size):
+        """Test pairs and one column's correlations come from a single pass."""
+        engine = CorrelationEngine(block_size=block_size).fit(
+            correlated_data.to_numpy(), list(correlated_data.columns)
+        )
+        
+        pairs, column = engine.pairs_with_column('x2', threshold=0.5)
+        
+        assert pairs == engine.pairs(threshold=0.5)
+        assert column.to_numpy() == pytest.approx(engine.with_column('x2').to_numpy())
+    
+    def test_kendall_pairs_computed_once(self, correlated_data, monkeypatch):
+        """Test Kendall pairs and target correlations correlate each pair once."""
+        calls = []
+        original = correlation.stats.kendalltau
+        monkeypatch.setattr(
+            correlation.stats, 'kendalltau', lambda *args: calls.append(1) or original(*args)
+        )
+        p = correlated_data.shape[1]
+        
+        for max_matrix_columns in [p, 2]:
+            calls.clear()
+            analyzer = StatisticalAnalyzer(max_matrix_columns=max_matrix_columns, correlation_block_size=4)
+            analyzer._correlation_analysis(correlated_data, target='y0', method='kendall')
+            assert len(calls) == p * (p - 1) // 2
+    
+    def test_unknown_method(self):
+        """Test unknown correlation method raises error."""
+        with pytest.raises(ValueError):
+            CorrelationEngine(method='unknown')
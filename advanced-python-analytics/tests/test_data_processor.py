@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 
 from src.data.processor import DataProcessor
+from src.data.encoders import UNKNOWN_CODE
 
 
 class TestDataProcessor:
@@ -63,3 +64,32 @@ class TestDataProcessor:
         assert 'n_columns' in summary
         assert summary['n_rows'] == len(sample_dataframe)
         assert summary['n_columns'] == len(sample_dataframe.columns)
+    
+    def test_label_encoding_mixed_types(self):
+        """Test mixed-type columns are encoded by their original values."""
+        values = ['a', 1, '1', 2.5, 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i']
+        df = pd.DataFrame({
+            'code': pd.Series(values * 2, dtype=object),
+            'target': np.arange(24, dtype=float)
+        })
+        
+        processor = DataProcessor()
+        encoded = processor._encode_categorical(df.copy(), target='target')
+        
+        assert encoded['code'].iloc[1] != encoded['code'].iloc[2]
+        encoder = processor.label_encoders['code']
+        assert list(encoder.inverse_transform(encoded['code'].iloc[:4])) == ['a', 1, '1', 2.5]
+        assert processor.label_encoders['code'] is encoder
+    
+    def test_transform_categorical_unseen(self):
+        """Test new data is encoded with the fitted vocabulary and unseen values get UNKNOWN_CODE."""
+        df = pd.DataFrame({
+            'city': [f"city_{i}" for i in range(12)] * 2,
+            'target': np.arange(24, dtype=float)
+        })
+        
+        processor = DataProcessor()
+        encoded = processor._encode_categorical(df.copy(), target='target')
+        new = processor.transform_categorical(pd.DataFrame({'city': ['city_3', 'city_99', None]}))
+        
+        assert new['city'].tolist() == [encoded['city'].iloc[3], UNKNOWN_CODE, UNKNOWN_CODE]
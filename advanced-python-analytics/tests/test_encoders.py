@@ -0,0 +1,71 @@
+"""
+Tests for categorical encoder store.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.data.encoders import CategoricalEncoderStore, UNKNOWN_CODE
+from src.core.exceptions import DataValidationError
+
+
+class TestCategoricalEncoderStore:
+    """Test suite for CategoricalEncoderStore class."""
+    
+    def test_fit_transform_sorted_codes(self):
+        """Test codes follow the sorted vocabulary."""
+        store = CategoricalEncoderStore()
+        codes = store.fit_transform('city', pd.Series(['b', 'a', 'c', 'a']))
+        
+        assert codes.tolist() == [1, 0, 2, 0]
+        assert list(store.vocabulary('city')) == ['a', 'b', 'c']
+    
+    def test_transform_unseen_category(self):
+        """Test unseen and missing values get the reserved code."""
+        store = CategoricalEncoderStore()
+        store.fit_transform('city', pd.Series(['a', 'b']))
+        
+        codes = store.transform('city', pd.Series(['b', 'z', None]))
+        
+        assert codes.tolist() == [1, UNKNOWN_CODE, UNKNOWN_CODE]
+    
+    def test_transform_categorical_input(self):
+        """Test categorical columns are encoded through their codes."""
+        store = CategoricalEncoderStore()
+        store.fit_transform('city', pd.Series(['a', 'b', 'c']))
+        
+        values = pd.Series(['c', 'x', 'a', None], dtype='category')
+        codes = store.transform('city', values)
+        
+        assert codes.tolist() == [2, UNKNOWN_CODE, 0, UNKNOWN_CODE]
+    
+    def test_inverse_transform(self):
+        """Test codes map back to categories."""
+        store = CategoricalEncoderStore()
+        store.fit_transform('city', pd.Series(['a', 'b']))
+        
+        restored = store.inverse_transform('city', np.array([1, UNKNOWN_CODE, 0]))
+        
+        assert restored.tolist() == ['b', None, 'a']
+    
+    def test_save_and_load(self, tmp_path):
+        """Test vocabularies round-trip through the binary file."""
+        store = CategoricalEncoderStore()
+        store.fit_transform('city', pd.Series(['x', 'y', 'z']))
+        store.fit_transform('code', pd.Series([30, 10, 20]))
+        
+        path = tmp_path / 'encoders.npz'
+        store.save(str(path))
+        loaded = CategoricalEncoderStore.load(str(path))
+        
+        assert loaded.columns == ['city', 'code']
+        assert loaded.transform('city', pd.Series(['z', 'q'])).tolist() == [2, UNKNOWN_CODE]
+        assert loaded.transform('code', pd.Series([10, 30])).tolist() == [0, 2]
+    
+    def test_transform_without_fit(self):
+        """Test encoding an unknown column raises error."""
+        store = CategoricalEncoderStore()
+        
+        with pytest.raises(DataValidationError):
+            store.transform('missing', pd.Series(['a']))
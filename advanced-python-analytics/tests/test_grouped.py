@@ -0,0 +1,70 @@
+"""
+Tests for grouped statistics module.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.analysis.grouped import GroupedStatistics
+from src.analysis.statistics import StatisticalAnalyzer
+from src.core.exceptions import DataValidationError
+
+
+class TestGroupedStatistics:
+    """Test suite for GroupedStatistics class."""
+    
+    def test_matches_per_group_analysis(self, sample_dataframe):
+        """Test every group matches the global sections run on its slice."""
+        df = sample_dataframe.copy()
+        df.loc[0:5, 'feature2'] = np.nan
+        df.loc[50, 'feature1'] = 40.0
+        
+        groups = GroupedStatistics(chunk_size=1).compute(df, 'category', target='target')
+        analyzer = StatisticalAnalyzer()
+        
+        assert set(groups) == {'A', 'B', 'C'}
+        for key, result in groups.items():
+            subset = df[df['category'] == key]
+            descriptive = analyzer._descriptive_stats(subset)
+            correlations = analyzer._correlation_analysis(subset, 'target')
+            
+            assert result['size'] == len(subset)
+            for name, values in descriptive.items():
+                assert result['descriptive'][name] == pytest.approx(values)
+            assert pd.DataFrame(result['correlations']['matrix']).values == pytest.approx(
+                pd.DataFrame(correlations['matrix']).values
+            )
+            assert result['correlations']['target_correlations'] == pytest.approx(
+                correlations['target_correlations']
+            )
+            assert result['outliers'] == analyzer._detect_outliers(subset)
+    
+    def test_multiple_keys_and_small_groups(self, sample_dataframe):
+        """Test tuple keys, ignored missing keys and groups too small to correlate."""
+        df = sample_dataframe.copy()
+        df['tier'] = np.where(df.index < 2, 'gold', 'basic')
+        df.loc[99, 'category'] = None
+        
+        groups = GroupedStatistics().compute(df, ['category', 'tier'])
+        
+        assert sum(result['size'] for result in groups.values()) == 99
+        small = [result for result in groups.values() if result['size'] < 3]
+        assert small and all(result['correlations']['matrix'] == {} for result in small)
+        assert all(isinstance(key, tuple) for key in groups)
+    
+    def test_missing_group_column(self, sample_dataframe):
+        """Test an unknown group column raises a validation error."""
+        with pytest.raises(DataValidationError):
+            GroupedStatistics().compute(sample_dataframe, 'region')
+    
+    def test_analyze_group_by(self, sample_dataframe):
+        """Test analyze adds groups and keeps group keys out of global sections."""
+        df = sample_dataframe.copy()
+        df['region'] = np.arange(len(df)) % 4
+        
+        results = StatisticalAnalyzer().analyze(df, target='target', group_by='region')
+        
+        assert sorted(results['groups']) == [0, 1, 2, 3]
+        assert 'region' not in results['descriptive']['mean']
+        assert 'region' not in results['groups'][0]['descriptive']['mean']
@@ -4,8 +4,14 @@ Tests for ML pipeline module.
 
 import pytest
 import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import cross_val_score, cross_val_predict
 
-from src.models.ml_pipeline import MLPipeline
+from src.analysis.cache import AnalysisCache
+from src.models.ml_pipeline import MLPipeline, FoldEnsemble, IncrementalLinearModel
+from src.data.ingestion import StreamProcessor
+from src.core.config import Config
 from src.core.exceptions import ModelTrainingError, PredictionError
 
 
@@ -75,3 +81,198 @@ class TestMLPipeline:
         
         with pytest.raises(ModelTrainingError):
             pipeline._create_model()
+    
+    def test_cross_validate_matches_sklearn(self, sample_dataframe):
+        """Test parallel folds match cross_val_score and cross_val_predict."""
+        data = sample_dataframe.drop(columns=['category'])
+        X, y = data.drop(columns=['target']), data['target']
+        
+        pipeline = MLPipeline(model_type='linear', problem_type='regression')
+        results = pipeline.cross_validate(data, target='target', cv=5, n_jobs=2)
+        
+        assert results['scores'] == pytest.approx(cross_val_score(LinearRegression(), X, y, cv=5))
+        assert results['mean'] == pytest.approx(results['scores'].mean())
+        assert results['oof_predictions'].values == pytest.approx(
+            cross_val_predict(LinearRegression(), X, y, cv=5)
+        )
+        assert results['oof_predictions'].index.equals(data.index)
+    
+    def test_cross_validate_does_not_nest_parallelism(self, sample_dataframe, monkeypatch):
+        """Test fold models train single-threaded in parallel folds and keep their n_jobs."""
+        from joblib import parallel_config
+        import src.models.ml_pipeline as ml_pipeline
+        
+        data = sample_dataframe.drop(columns=['category'])
+        fit_fold = ml_pipeline._fit_fold
+        fit_n_jobs = []
+        
+        def recording_fit_fold(model, *args):
+            fit_n_jobs.append(model.n_jobs)
+            return fit_fold(model, *args)
+        
+        monkeypatch.setattr(ml_pipeline, '_fit_fold', recording_fit_fold)
+        pipeline = MLPipeline(model_type='random_forest', config=Config(), problem_type='regression')
+        with parallel_config(backend='threading'):
+            pipeline.cross_validate(data, target='target', cv=3, n_jobs=2, refit=True)
+        
+        assert fit_n_jobs == [1, 1, 1, 1]
+        assert pipeline.model.n_jobs == -1
+    
+    def test_cross_validate_reuses_fold_models(self, sample_dataframe):
+        """Test the final model averages the fold models unless refit is requested."""
+        data = sample_dataframe.drop(columns=['category'])
+        
+        pipeline = MLPipeline(model_type='linear', problem_type='regression')
+        pipeline.cross_validate(data, target='target', cv=4, n_jobs=1)
+        
+        assert isinstance(pipeline.model, FoldEnsemble)
+        assert len(pipeline.model.models) == 4
+        expected = np.mean([model.predict(data.drop(columns=['target'])) for model in pipeline.model.models], axis=0)
+        assert pipeline.predict(data) == pytest.approx(expected)
+        
+        refitted = MLPipeline(model_type='linear', problem_type='regression')
+        refitted.cross_validate(data, target='target', cv=4, refit=True)
+        full = MLPipeline(model_type='linear', problem_type='regression').fit(data, target='target')
+        
+        assert refitted.predict(data) == pytest.approx(full.predict(data))
+    
+    def test_cross_validate_classification(self, sample_dataframe):
+        """Test stratified folds and probability averaging for classification."""
+        data = sample_dataframe.drop(columns=['category'])
+        data['target'] = (data['target'] > data['target'].median()).astype('int64')
+        
+        pipeline = MLPipeline(model_type='random_forest')
+        results = pipeline.cross_validate(data, target='target', cv=3)
+        proba = pipeline.predict_proba(data)
+        
+        assert pipeline.problem_type == 'classification'
+        assert set(results['oof_predictions'].unique()) <= {0, 1}
+        assert proba.sum(axis=1) == pytest.approx(np.ones(len(data)))
+        assert (pipeline.predict(data) == pipeline.model.classes_[proba.argmax(axis=1)]).all()
+        assert len(pipeline.get_feature_importance()) == 3
+
+
+def _chunks(data, size):
+    """Split a DataFrame into consecutive chunks."""
+    return [data.iloc[start:start + size] for start in range(0, len(data), size)]
+
+
+class TestIncrementalTraining:
+    """Test suite for MLPipeline incremental training."""
+    
+    def test_linear_regression_chunks(self, sample_dataframe):
+        """Test SGD regression learns a linear target from chunks."""
+        data = sample_dataframe.drop(columns=['category'])
+        data['target'] = 3 * data['feature1'] - 2 * data['feature2'] + 5
+        
+        pipeline = MLPipeline(model_type='linear', problem_type='regression')
+        for _ in range(20):
+            pipeline.fit_incremental(_chunks(data, 25), target='target')
+        
+        assert isinstance(pipeline.model, IncrementalLinearModel)
+        assert pipeline.model.n_chunks == 80
+        assert pipeline.evaluate(data, target='target')['r2'] > 0.99
+    
+    def test_linear_classification_classes(self, sample_dataframe):
+        """Test classes missing from the first chunk can be declared up front."""
+        data = sample_dataframe.drop(columns=['category']).sort_values('feature1')
+        data['target'] = (data['feature1'] > 0).astype('int64')
+        
+        pipeline = MLPipeline(model_type='linear', problem_type='classification')
+        for _ in range(10):
+            pipeline.fit_incremental(_chunks(data, 20), target='target', classes=[0, 1])
+        
+        assert list(pipeline.model.classes_) == [0, 1]
+        assert pipeline.predict_proba(data).shape == (len(data), 2)
+        assert (pipeline.predict(data) == data['target']).mean() > 0.9
+    
+    def test_data_fingerprint_keeps_no_data(self, sample_dataframe, monkeypatch):
+        """Test only the used columns are hashed and the training data is not retained."""
+        data = sample_dataframe.drop(columns=['category'])
+        data['unused'] = np.arange(len(data)) * 1.0
+        hashed = []
+        original = AnalysisCache.fingerprint
+        monkeypatch.setattr(
+            AnalysisCache, 'fingerprint',
+            staticmethod(lambda series: hashed.append(series.name) or original(series))
+        )
+        
+        pipeline = MLPipeline(model_type='linear').fit(data, target='target', features=['feature1', 'feature2'])
+        assert hashed == ['feature1', 'feature2', 'target']
+        assert not any(isinstance(value, pd.DataFrame) for value in vars(pipeline).values())
+        
+        fingerprint = pipeline.data_fingerprint
+        assert pipeline.data_fingerprint == fingerprint and len(hashed) == 3
+        
+        # The fingerprint of incremental training covers every chunk
+        incremental = MLPipeline(model_type='linear', problem_type='regression')
+        incremental.fit_incremental(_chunks(data, 25), target='target', features=['feature1', 'feature2'])
+        assert len(hashed) == 3 + 4 * 3
+        assert incremental.data_fingerprint not in (None, fingerprint)
+    
+    def test_random_forest_grows_trees(self, sample_dataframe):
+        """Test each chunk adds trees and only the newest max_trees are kept."""
+        data = sample_dataframe.drop(columns=['category'])
+        pipeline = MLPipeline(model_type='random_forest', problem_type='regression')
+        
+        pipeline.fit_incremental(_chunks(data, 25)[:2], target='target')
+        assert len(pipeline.model.estimators_) == 20
+        
+        pipeline.config = Config()
+        pipeline.config.incremental.max_trees = 25
+        pipeline.partial_fit(data.iloc[50:], target='target')
+        
+        assert len(pipeline.model.estimators_) == 25
+        assert pipeline.predict(data).shape == (len(data),)
+    
+    def test_random_forest_class_mismatch(self, sample_dataframe):
+        """Test a classification chunk lacking a known class is rejected."""
+        data = sample_dataframe.drop(columns=['category'])
+        data['target'] = (data['feature1'] > 0).astype('int64')
+        
+        pipeline = MLPipeline(model_type='random_forest').partial_fit(data, target='target')
+        
+        with pytest.raises(ModelTrainingError):
+            pipeline.partial_fit(data[data['target'] == 1], target='target')
+    
+    def test_xgboost_warm_start_from_saved_model(self, sample_dataframe, tmp_path):
+        """Test a saved XGBoost model continues boosting on new data."""
+        pytest.importorskip('xgboost')
+        data = sample_dataframe.drop(columns=['category'])
+        
+        pipeline = MLPipeline(model_type='xgboost', problem_type='regression')
+        pipeline.partial_fit(data.iloc[:50], target='target')
+        assert pipeline.model.get_booster().num_boosted_rounds() == 20
+        
+        path = tmp_path / "model.pkl"
+        pipeline.save_model(str(path))
+        first_fingerprint = pipeline.data_fingerprint
+        
+        retrained = MLPipeline.load_model(str(path)).partial_fit(data.iloc[50:], target='target')
+        
+        assert retrained.model.get_booster().num_boosted_rounds() == 40
+        assert retrained.data_fingerprint != first_fingerprint
+        assert retrained.feature_columns == pipeline.feature_columns
+    
+    @pytest.mark.asyncio
+    async def test_fit_stream(self, sample_dataframe, tmp_path):
+        """Test training on batches streamed by StreamProcessor."""
+        path = tmp_path / "train.csv"
+        sample_dataframe.drop(columns=['category']).to_csv(path, index=False)
+        processor = StreamProcessor(batch_size=40)
+        
+        pipeline = MLPipeline(model_type='linear', problem_type='regression')
+        await pipeline.fit_stream(processor.stream_data('file', file_path=str(path)), target='target')
+        
+        assert pipeline.model.n_chunks == 3
+        assert pipeline.predict(sample_dataframe).shape == (len(sample_dataframe),)
+    
+    def test_fitted_linear_model_cannot_continue(self, sample_dataframe):
+        """Test a model without incremental support raises and empty input is rejected."""
+        data = sample_dataframe.drop(columns=['category'])
+        pipeline = MLPipeline(model_type='linear', problem_type='regression').fit(data, target='target')
+        
+        with pytest.raises(ModelTrainingError):
+            pipeline.partial_fit(data, target='target')
+        with pytest.raises(ModelTrainingError):
+            MLPipeline(model_type='linear').fit_incremental([], target='target')
@@ -0,0 +1,105 @@
+"""
+Tests for normality testing module.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+from src.analysis.normality import NormalityTester, ReservoirSampler
+from src.analysis.statistics import StatisticalAnalyzer
+
+
+@pytest.fixture
+def skewed_data():
+    """Normal, exponential and uniform columns with missing values."""
+    rng = np.random.default_rng(0)
+    X = np.column_stack([
+        rng.normal(size=2000),
+        rng.exponential(size=2000),
+        rng.uniform(size=2000)
+    ])
+    X[5:20, 1] = np.nan
+    return X, ['normal', 'exponential', 'uniform']
+
+
+class TestNormalityTester:
+    """Test suite for NormalityTester class."""
+    
+    @pytest.mark.parametrize("test,reference", [
+        ("dagostino", stats.normaltest),
+        ("jarque_bera", stats.jarque_bera),
+        ("shapiro", stats.shapiro)
+    ])
+    def test_matches_scipy(self, skewed_data, test, reference):
+        """Test results match scipy on the full columns."""
+        X, columns = skewed_data
+        results = NormalityTester(test=test).test(X, columns)
+        
+        for j, col in enumerate(columns):
+            values = X[~np.isnan(X[:, j]), j]
+            expected = reference(values)
+            assert results[col]['statistic'] == pytest.approx(expected[0], rel=1e-9)
+            assert results[col]['p_value'] == pytest.approx(expected[1], rel=1e-6, abs=1e-300)
+    
+    def test_anderson_p_values(self, skewed_data):
+        """Test Anderson-Darling flags only the non-normal columns."""
+        X, columns = skewed_data
+        results = NormalityTester(test="anderson", n_jobs=2).test(X, columns)
+        
+        assert results['normal']['is_normal']
+        assert not results['exponential']['is_normal']
+        assert not results['uniform']['is_normal']
+    
+    def test_streaming_matches_batch(self, skewed_data):
+        """Test streamed moment tests equal a single in-memory run."""
+        X, columns = skewed_data
+        df = pd.DataFrame(X, columns=columns)
+        
+        streamed = NormalityTester(test="dagostino")
+        for start in range(0, len(df), 300):
+            streamed.update(df.iloc[start:start + 300])
+        
+        expected = NormalityTester(test="dagostino").test(X, columns)
+        for col in columns:
+            assert streamed.finalize()[col]['p_value'] == pytest.approx(expected[col]['p_value'])
+    
+    def test_degenerate_columns(self):
+        """Test tiny columns are not normal and constant columns follow stats.shapiro."""
+        X = np.column_stack([np.ones(20), np.r_[1.0, 2.0, np.full(18, np.nan)]])
+        
+        for test in ("shapiro", "dagostino", "jarque_bera", "anderson"):
+            results = NormalityTester(test=test).test(X, ['constant', 'tiny'])
+            assert results['constant']['is_normal'] == (test == "shapiro")
+            assert results['tiny']['p_value'] == 0.0
+        
+        results = NormalityTester(test="shapiro").test(X, ['constant', 'tiny'])
+        assert results['constant']['p_value'] == 1.0
+    
+    def test_unknown_test(self):
+        """Test unknown test names are rejected."""
+        with pytest.raises(ValueError):
+            NormalityTester(test="lilliefors")
+    
+    def test_reservoir_is_uniform(self):
+        """Test every row is equally likely to be sampled across batches."""
+        counts = np.zeros(100)
+        for seed in range(1000):
+            sampler = ReservoirSampler(10, random_state=seed)
+            for start in range(0, 100, 7):
+                sampler.update(np.arange(start, min(start + 7, 100), dtype=float)[:, None])
+            counts[sampler.sample[:, 0].astype(int)] += 1
+        
+        # Expected 100 draws per row
+        assert counts.sum() == 10000
+        assert counts.min() > 60 and counts.max() < 140
+    
+    def test_analyzer_distribution_test(self, sample_dataframe):
+        """Test the analyzer reports the configured test."""
+        analyzer = StatisticalAnalyzer(normality=NormalityTester(test="jarque_bera"))
+        distributions = analyzer._distribution_analysis(sample_dataframe)
+        
+        assert distributions['feature1']['normality_test'] == "jarque_bera"
+        assert distributions['feature1']['shapiro_p_value'] == distributions['feature1']['p_value']
+        assert 0.0 <= distributions['feature1']['p_value'] <= 1.0
@@ -0,0 +1,133 @@
+"""
+Tests for hyperparameter search module.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from sklearn.datasets import make_classification, make_regression
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import cross_val_score
+
+from src.core.config import Config
+from src.core.exceptions import ConfigurationError
+from src.models.search import HyperparameterSearch, sample_params, _stratified_order
+
+
+SPACE = {
+    'max_depth': [2, 4, None],
+    'min_samples_leaf': {'low': 1, 'high': 20, 'type': 'int', 'log': True}
+}
+
+
+@pytest.fixture
+def regression_data():
+    """Numeric regression data large enough for several halving rounds."""
+    X, y = make_regression(n_samples=540, n_features=5, noise=10.0, random_state=0)
+    data = pd.DataFrame(X, columns=[f"x{j}" for j in range(5)])
+    data['target'] = y
+    return data
+
+
+def make_search(**kwargs):
+    """Small random forest search on two processes."""
+    config = Config()
+    config.models.random_forest['n_estimators'] = 27
+    settings = {'space': SPACE, 'n_trials': 9, 'cv': 3, 'factor': 3, 'n_jobs': 2}
+    settings.update(kwargs)
+    return HyperparameterSearch('random_forest', config, problem_type='regression', **settings)
+
+
+class TestHyperparameterSearch:
+    """Test suite for HyperparameterSearch class."""
+    
+    def test_sample_params(self):
+        """Test choices and ranges are drawn with the declared types and bounds."""
+        space = {
+            'choice': ['sqrt', 0.5, None],
+            'rate': {'low': 0.01, 'high': 0.3, 'log': True},
+            'depth': {'low': 2, 'high': 4, 'type': 'int'}
+        }
+        params = sample_params(space, 200, np.random.default_rng(0))
+        
+        assert {p['choice'] for p in params} == {'sqrt', 0.5, None}
+        assert all(0.01 <= p['rate'] <= 0.3 for p in params)
+        assert {p['depth'] for p in params} == {2, 3, 4}
+        assert all(isinstance(p['depth'], int) for p in params)
+        
+        with pytest.raises(ConfigurationError):
+            sample_params({'bad': {'low': 1}}, 1, np.random.default_rng(0))
+    
+    def test_successive_halving(self, regression_data):
+        """Test rounds keep the best third of trials on three times the rows."""
+        search = make_search().fit(regression_data, target='target')
+        board = search.leaderboard_
+        
+        assert len(board) == 9
+        assert board['round'].value_counts().sort_index().tolist() == [6, 2, 1]
+        assert sorted(board['n_samples'].unique()) == [60, 180, 540]
+        assert board.iloc[0]['round'] == 2
+        # One set of folds per budget, shared by all trials
+        assert sorted(search._folds) == [60, 180, 540]
+        
+        assert search.best_score_ == board.iloc[0]['mean_score']
+        assert search.best_pipeline_.model_params == search.best_params_
+        assert search.best_pipeline_.model.get_params()['max_depth'] == search.best_params_['max_depth']
+        assert len(search.best_pipeline_.predict(regression_data)) == len(regression_data)
+    
+    def test_n_estimators_budget(self, regression_data):
+        """Test the tree count can be the budget instead of the rows."""
+        search = make_search(resource='n_estimators').fit(regression_data, target='target')
+        
+        assert sorted(search.leaderboard_['n_estimators'].unique()) == [3, 9, 27]
+        assert list(search._folds) == [540]
+        assert search.best_pipeline_.model.n_estimators == 27
+    
+    def test_random_search_matches_cross_val_score(self, regression_data):
+        """Test random search scores every trial on all rows like cross_val_score."""
+        search = make_search(method='random', n_trials=3).fit(regression_data, target='target')
+        X, y = regression_data.drop(columns=['target']), regression_data['target']
+        
+        assert (search.leaderboard_['round'] == 0).all()
+        for _, row in search.leaderboard_.iterrows():
+            depth = None if pd.isna(row['param_max_depth']) else int(row['param_max_depth'])
+            model = RandomForestRegressor(
+                n_estimators=27, max_depth=depth, min_samples_leaf=int(row['param_min_samples_leaf']), random_state=42
+            )
+            assert row['mean_score'] == pytest.approx(cross_val_score(model, X.values, y.values, cv=3).mean())
+    
+    def test_halving_subsamples_are_stratified(self):
+        """Test every round's subsample keeps the share of a rare class."""
+        X, y = make_classification(
+            n_samples=540, n_features=5, weights=[0.95], flip_y=0, random_state=0
+        )
+        data = pd.DataFrame(X, columns=[f"x{j}" for j in range(5)])
+        data['target'] = y
+        config = Config()
+        config.models.random_forest['n_estimators'] = 9
+        search = HyperparameterSearch(
+            'random_forest', config, problem_type='classification',
+            space=SPACE, n_trials=9, cv=3, factor=3, n_jobs=1
+        ).fit(data, target='target')
+        
+        for folds in search._folds.values():
+            # Each held-out fold contains the rare class
+            assert all(y[test].sum() > 0 for _, test in folds)
+        
+        # Every prefix of the row order, so every budget, keeps the class share
+        order = _stratified_order(y, np.random.default_rng(0))
+        rare = np.cumsum(y[order])
+        assert np.abs(rare - np.arange(1, len(y) + 1) * y.mean()).max() <= 1
+    
+    def test_invalid_settings(self, regression_data):
+        """Test unknown methods and budgets that clash with the space are rejected."""
+        with pytest.raises(ValueError):
+            make_search(method='grid')
+        with pytest.raises(ValueError):
+            make_search(resource='epochs')
+        with pytest.raises(ConfigurationError):
+            make_search(resource='n_estimators', space={'n_estimators': [10, 20]})
+        with pytest.raises(ConfigurationError):
+            HyperparameterSearch('linear', resource='n_estimators', n_jobs=1).fit(
+                regression_data, target='target'
+            )
@@ -0,0 +1,127 @@
+"""
+Tests for seasonal anomaly detection module.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.analysis.anomaly import StreamingAnomalyDetector
+from src.analysis.seasonal import SeasonalAnomalyDetector, _ages, _decayed_update
+from src.core.exceptions import DataValidationError
+
+
+@pytest.fixture
+def hourly_stream():
+    """Four weeks of hourly values for three series with a Monday 9am peak."""
+    rng = np.random.default_rng(0)
+    timestamps = pd.date_range('2024-01-01', periods=24 * 7 * 4, freq='1h')
+    frames = []
+    for series in ['a', 'b', 'c']:
+        peak = np.where((timestamps.dayofweek == 0) & (timestamps.hour == 9), 30.0, 0.0)
+        frames.append(pd.DataFrame({
+            'timestamp': timestamps,
+            'id': series,
+            'value': 10 + peak + rng.normal(size=len(timestamps))
+        }))
+    return pd.concat(frames).sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def daily_batches(df):
+    """Split a stream into one batch per day."""
+    return [batch for _, batch in df.groupby(df['timestamp'].dt.floor('D'))]
+
+
+class TestSeasonalAnomalyDetector:
+    """Test suite for SeasonalAnomalyDetector class."""
+    
+    def test_recurring_peak_is_learned(self, hourly_stream):
+        """Test a weekly peak stops being flagged while an off-schedule spike is flagged."""
+        df = hourly_stream.copy()
+        spike = df.index[(df['timestamp'] == '2024-01-24 09:00') & (df['id'] == 'b')][0]
+        df.loc[spike, 'value'] += 30
+        
+        detector = SeasonalAnomalyDetector(id_column='id')
+        streaming = StreamingAnomalyDetector(threshold=3.5)
+        flagged, streaming_flagged = [], []
+        for batch in daily_batches(df):
+            flagged.extend(detector.detect(batch).index)
+            streaming_flagged.extend(streaming.detect(batch[['value']]).index)
+        
+        mondays = df.index[(df['timestamp'].dt.dayofweek == 0) & (df['timestamp'].dt.hour == 9)]
+        assert spike in flagged
+        assert not set(mondays) & set(flagged)
+        # A detector without time awareness flags the recurring peak
+        assert set(mondays) & set(streaming_flagged)
+    
+    def test_series_are_independent(self, hourly_stream):
+        """Test each series keeps its own compact state and baseline."""
+        detector = SeasonalAnomalyDetector(id_column='id', seasonality='daily')
+        for batch in daily_batches(hourly_stream):
+            detector.update(batch)
+        
+        assert detector.n_series == 3
+        assert detector._state['offset'].shape == (3, 24)
+        
+        batch = pd.DataFrame({
+            'timestamp': pd.Timestamp('2024-02-01 15:00'),
+            'id': ['a', 'b', 'c', 'd'],
+            'value': [10.0, 40.0, 10.0, 40.0]
+        })
+        scores = detector.score(batch)
+        
+        assert scores[1] > 10
+        assert scores[0] < 3.5 and scores[2] < 3.5
+        # A new series is never flagged before warmup, and scoring does not register it
+        assert scores[3] == 0
+        assert detector.n_series == 3
+        assert detector._state['offset'].shape == (3, 24)
+        
+        fresh = SeasonalAnomalyDetector()
+        assert fresh.score(batch).tolist() == [0.0] * 4
+        assert fresh.n_series == 0
+    
+    def test_decayed_update_matches_sequential(self):
+        """Test batched exponentially weighted updates equal row-by-row updates."""
+        rng = np.random.default_rng(1)
+        keys = rng.integers(0, 4, size=50)
+        times = np.arange(50)
+        values = rng.normal(size=50)
+        decay = 0.9
+        
+        mean, count = np.zeros(4), np.zeros(4, dtype=np.int64)
+        _decayed_update(mean, count, keys[:20], values[:20], _ages(keys[:20], times[:20]), decay)
+        _decayed_update(mean, count, keys[20:], values[20:], _ages(keys[20:], times[20:]), decay)
+        
+        expected = np.zeros(4)
+        weight = np.zeros(4)
+        for key, value in zip(keys, values):
+            weight[key] = weight[key] * decay + 1
+            expected[key] += (value - expected[key]) / weight[key]
+        
+        assert mean == pytest.approx(expected)
+        assert count.tolist() == np.bincount(keys, minlength=4).tolist()
+    
+    def test_rolling_baseline_matches_pandas(self, hourly_stream):
+        """Test the rolling method scores against the median and MAD of the window."""
+        series = hourly_stream[hourly_stream['id'] == 'a'].head(300)
+        detector = SeasonalAnomalyDetector(method='rolling', window=50, id_column='id')
+        for start in range(0, len(series), 37):
+            detector.update(series.iloc[start:start + 37])
+        
+        window = series['value'].tail(50)
+        median = window.median()
+        mad = (window - median).abs().median() * 1.4826
+        batch = pd.DataFrame({'timestamp': [series['timestamp'].iloc[-1]], 'id': ['a'], 'value': [25.0]})
+        
+        assert sorted(detector._state['buffer'][0]) == pytest.approx(sorted(window))
+        assert detector.score(batch)[0] == pytest.approx(abs(25.0 - median) / mad)
+    
+    def test_invalid_input(self, hourly_stream):
+        """Test missing columns and slots that do not divide a day are rejected."""
+        with pytest.raises(DataValidationError):
+            SeasonalAnomalyDetector(id_column='id').detect(hourly_stream.drop(columns=['id']))
+        with pytest.raises(ValueError):
+            SeasonalAnomalyDetector(slot='7h')
+        with pytest.raises(ValueError):
+            SeasonalAnomalyDetector(method='stl')
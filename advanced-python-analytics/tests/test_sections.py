@@ -0,0 +1,138 @@
+"""
+Tests for analysis section registry.
+"""
+
+import pytest
+import numpy as np
+
+from src.analysis import sections
+from src.analysis.sections import SectionRegistry
+from src.analysis.statistics import StatisticalAnalyzer
+from src.core.config import Config
+from src.core.exceptions import ConfigurationError
+
+
+class TestSectionRegistry:
+    """Test suite for SectionRegistry class."""
+    
+    def test_shared_inputs_computed_once(self, sample_dataframe):
+        """Test inputs used by several parallel sections are computed once."""
+        calls = []
+        registry = SectionRegistry()
+        registry.register_input('numeric', lambda ctx: calls.append(1) or (['x'], np.ones((3, 1))))
+        for name in ('a', 'b', 'c'):
+            registry.register(name, lambda ctx: ctx.get('numeric')[1].sum(), inputs=('numeric',))
+        
+        results = registry.run(registry.context(sample_dataframe), n_jobs=3)
+        
+        assert results == {'a': 3.0, 'b': 3.0, 'c': 3.0}
+        assert calls == [1]
+    
+    def test_requires_and_disabled(self, sample_dataframe):
+        """Test dependent sections see earlier results and skip with their dependency."""
+        registry = SectionRegistry()
+        registry.register('total', lambda ctx: ctx.results['base'] * 2, requires=('base',))
+        registry.register('base', lambda ctx: len(ctx.data))
+        
+        assert registry.run(registry.context(sample_dataframe), n_jobs=2) == {
+            'total': 200, 'base': 100
+        }
+        assert registry.run(registry.context(sample_dataframe), disabled=['base']) == {}
+    
+    def test_circular_requirements(self, sample_dataframe):
+        """Test dependency cycles are rejected."""
+        registry = SectionRegistry()
+        registry.register('a', lambda ctx: 1, requires=('b',))
+        registry.register('b', lambda ctx: 2, requires=('a',))
+        
+        with pytest.raises(ConfigurationError):
+            registry.run(registry.context(sample_dataframe))
+    
+    def test_unknown_input(self):
+        """Test sections declaring unknown inputs are rejected."""
+        with pytest.raises(ConfigurationError):
+            SectionRegistry().register('a', lambda ctx: 1, inputs=('histogram',))
+    
+    def test_analyzer_parallel_matches_sequential(self, sample_dataframe):
+        """Test threaded section execution gives the sequential results."""
+        sequential = StatisticalAnalyzer().analyze(sample_dataframe, target='target')
+        parallel = StatisticalAnalyzer(n_jobs=4).analyze(sample_dataframe, target='target')
+        
+        assert list(parallel) == list(sequential)
+        assert parallel['outliers'] == sequential['outliers']
+        assert parallel['distributions'] == sequential['distributions']
+        assert parallel['correlations']['pairs'] == sequential['correlations']['pairs']
+        for name, values in sequential['descriptive'].items():
+            assert parallel['descriptive'][name] == pytest.approx(values)
+    
+    @pytest.mark.parametrize('n_jobs', [1, 3])
+    def test_cached_run_builds_inputs_for_missed_columns(self, sample_dataframe, monkeypatch, n_jobs):
+        """Test a cached run only builds the numeric block for columns that missed the cache."""
+        analyzer = StatisticalAnalyzer(cache=True, n_jobs=n_jobs)
+        analyzer.sections.unregister('correlations')
+        analyzer.analyze(sample_dataframe, target='target')
+        
+        built = []
+        original = sections._numeric_block
+        monkeypatch.setattr(
+            sections, '_numeric_block', lambda frame: built.append(list(frame.columns)) or original(frame)
+        )
+        
+        analyzer.analyze(sample_dataframe, target='target')
+        assert built == []
+        
+        df = sample_dataframe.copy()
+        df['feature2'] = df['feature2'] * 2 + 1
+        results = analyzer.analyze(df, target='target')
+        
+        assert built == [['feature2']]
+        assert results['descriptive']['std']['feature2'] == pytest.approx(df['feature2'].std())
+    
+    def test_descriptive_matches_pandas(self, sample_dataframe):
+        """Test moment-based descriptive statistics match pandas."""
+        df = sample_dataframe.copy()
+        df.loc[0:4, 'feature1'] = np.nan
+        numeric = df.select_dtypes(include=[np.number])
+        
+        descriptive = StatisticalAnalyzer()._descriptive_stats(df)
+        
+        assert descriptive['mean'] == pytest.approx(numeric.mean().to_dict())
+        assert descriptive['median'] == pytest.approx(numeric.median().to_dict())
+        assert descriptive['std'] == pytest.approx(numeric.std().to_dict())
+        assert descriptive['skewness'] == pytest.approx(numeric.skew().to_dict())
+        assert descriptive['kurtosis'] == pytest.approx(numeric.kurtosis().to_dict())
+    
+    def test_custom_section_and_config(self, sample_dataframe):
+        """Test registered sections run and config disables built-in ones."""
+        config = Config()
+        config.analysis.disabled_sections = ['importance', 'distributions']
+        
+        analyzer = StatisticalAnalyzer(config=config)
+        analyzer.register_section(
+            'coefficient_of_variation',
+            lambda ctx: {
+                col: ctx.results['descriptive']['std'][col] / ctx.results['descriptive']['mean'][col]
+                for col in ctx.numeric()[0]
+            },
+            inputs=('numeric',),
+            requires=('descriptive',)
+        )
+        results = analyzer.analyze(sample_dataframe, target='target')
+        
+        assert 'importance' not in results and 'distributions' not in results
+        assert analyzer.n_jobs == 1
+        assert results['coefficient_of_variation']['target'] == pytest.approx(
+            sample_dataframe['target'].std() / sample_dataframe['target'].mean()
+        )
+    
+    def test_explicit_arguments_override_config(self):
+        """Test n_jobs and disabled_sections passed explicitly win over the config."""
+        config = Config()
+        config.analysis.n_jobs = 4
+        config.analysis.disabled_sections = ['importance']
+        
+        analyzer = StatisticalAnalyzer(n_jobs=2, disabled_sections=[], config=config)
+        
+        assert analyzer.n_jobs == 2
+        assert analyzer.disabled_sections == []
+        assert StatisticalAnalyzer(config=config).disabled_sections == ['importance']
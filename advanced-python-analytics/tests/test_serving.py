@@ -0,0 +1,147 @@
+"""
+Tests for model serving module.
+"""
+
+import asyncio
+
+import pytest
+import numpy as np
+import aiohttp
+from aiohttp import web
+
+from src.models.ml_pipeline import MLPipeline
+from src.models.serving import ModelServer, create_app
+from src.core.exceptions import PredictionError
+
+
+@pytest.fixture
+def trained_pipeline(tmp_path, sample_dataframe):
+    """Random forest regressor round-tripped through save_model and load_model."""
+    data = sample_dataframe.drop(columns=['category'])
+    pipeline = MLPipeline(model_type='random_forest', problem_type='regression')
+    pipeline.fit(data, target='target')
+    
+    path = tmp_path / "model.joblib"
+    pipeline.save_model(str(path))
+    return MLPipeline.load_model(str(path)), data
+
+
+class TestModelServer:
+    """Test suite for ModelServer class."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_match_pipeline(self, trained_pipeline):
+        """Test batched dict and array requests give the pipeline's predictions."""
+        pipeline, data = trained_pipeline
+        features = data[pipeline.feature_columns]
+        expected = pipeline.predict(data)
+        
+        # Dicts list the features out of training order
+        records = [dict(reversed(list(row.items()))) for row in features.to_dict('records')]
+        async with ModelServer(pipeline, max_batch_size=32, max_wait=0.01) as server:
+            from_dicts = await asyncio.gather(*(server.predict(record) for record in records))
+            from_arrays = await asyncio.gather(*(server.predict(row) for row in features.values))
+            several = await server.predict(records[:5])
+        
+        assert np.array(from_dicts) == pytest.approx(expected)
+        assert np.array(from_arrays) == pytest.approx(expected)
+        assert several == pytest.approx(expected[:5])
+        assert server.predict_batch(features.values) == pytest.approx(expected)
+        
+        stats = server.stats
+        assert stats['requests'] == 201
+        assert stats['rows'] == 205
+        assert stats['batches'] < 20
+        assert 0 < stats['p50_ms'] <= stats['p99_ms']
+    
+    @pytest.mark.asyncio
+    async def test_max_batch_size(self, trained_pipeline):
+        """Test a burst of requests is split into batches of at most max_batch_size rows."""
+        pipeline, data = trained_pipeline
+        rows = data[pipeline.feature_columns].values[:10]
+        
+        async with ModelServer(pipeline, max_batch_size=4, max_wait=1.0) as server:
+            await asyncio.gather(*(server.predict(row) for row in rows))
+        
+        assert server.stats['batches'] == 3
+        assert server.stats['mean_batch_rows'] == pytest.approx(10 / 3)
+    
+    @pytest.mark.asyncio
+    async def test_predict_proba(self, sample_dataframe):
+        """Test serving class probabilities of a classifier."""
+        data = sample_dataframe.drop(columns=['category'])
+        data['target'] = (data['target'] > data['target'].median()).astype('int64')
+        pipeline = MLPipeline(model_type='random_forest').fit(data, target='target')
+        
+        async with ModelServer(pipeline, method='predict_proba') as server:
+            proba = await server.predict(data[pipeline.feature_columns].values[:3])
+        
+        assert proba == pytest.approx(pipeline.predict_proba(data.head(3)))
+    
+    def test_invalid_input(self, trained_pipeline):
+        """Test untrained models, wrong widths and missing features are rejected."""
+        pipeline, _ = trained_pipeline
+        server = ModelServer(pipeline)
+        
+        with pytest.raises(PredictionError):
+            server.to_matrix(np.zeros(2))
+        with pytest.raises(PredictionError):
+            server.to_matrix({'feature1': 1.0})
+        with pytest.raises(PredictionError):
+            ModelServer(MLPipeline())
+        with pytest.raises(ValueError):
+            ModelServer(pipeline, method='transform')
+    
+    @pytest.mark.asyncio
+    async def test_bad_request_fails_alone(self, trained_pipeline):
+        """Test a request with a string or null value fails without failing its batch."""
+        pipeline, data = trained_pipeline
+        records = data[pipeline.feature_columns].head(4).to_dict('records')
+        bad_string = {**records[1], 'feature1': 'abc'}
+        bad_null = {**records[2], 'feature2': None}
+        
+        async with ModelServer(pipeline, max_batch_size=8, max_wait=0.05) as server:
+            results = await asyncio.gather(
+                server.predict(records[0]), server.predict(bad_string),
+                server.predict(bad_null), server.predict(records[3]),
+                return_exceptions=True
+            )
+        
+        assert isinstance(results[1], PredictionError)
+        assert isinstance(results[2], PredictionError)
+        assert [results[0], results[3]] == pytest.approx(pipeline.predict(data.iloc[[0, 3]]))
+        assert server.stats['errors'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_http_endpoint(self, trained_pipeline):
+        """Test the local HTTP endpoint serves predictions and latency counters."""
+        pipeline, data = trained_pipeline
+        records = data[pipeline.feature_columns].head(3).to_dict('records')
+        
+        runner = web.AppRunner(create_app(ModelServer(pipeline)))
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(f"{url}/predict", json={'instances': records}) as response:
+                    assert response.status == 200
+                    predictions = (await response.json())['predictions']
+                async with session.post(f"{url}/predict", json={'instances': records[0]}) as response:
+                    single = (await response.json())['predictions']
+                async with session.post(f"{url}/predict", json={'instances': [[1.0]]}) as response:
+                    assert response.status == 400
+                async with session.post(f"{url}/predict", json={'instances': {**records[0], 'feature1': 'x'}}) as response:
+                    assert response.status == 400
+                async with session.get(f"{url}/stats") as response:
+                    stats = await response.json()
+        finally:
+            await runner.cleanup()
+        
+        assert predictions == pytest.approx(pipeline.predict(data.head(3)))
+        # A single instance also gets a list of predictions
+        assert single == pytest.approx(pipeline.predict(data.head(1)).tolist())
+        assert stats['requests'] == 2
+        assert stats['p99_ms'] is not None
@@ -0,0 +1,145 @@
+"""
+Tests for statistical analysis module.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+from src.analysis.statistics import StatisticalAnalyzer
+from src.analysis.accumulators import MomentAccumulator
+from src.analysis.importance import MutualInformationImportance
+
+
+class TestStatisticalAnalyzer:
+    """Test suite for StatisticalAnalyzer class."""
+    
+    def test_analyze_sections(self, sample_dataframe):
+        """Test analysis returns every section."""
+        analyzer = StatisticalAnalyzer()
+        results = analyzer.analyze(sample_dataframe, target='target')
+        
+        for section in ['descriptive', 'correlations', 'distributions', 'importance', 'outliers']:
+            assert section in results
+    
+    def test_detect_outliers_matches_zscore(self, sample_dataframe):
+        """Test vectorized outlier counts match per-column z-scores."""
+        df = sample_dataframe.copy()
+        df.loc[0, 'feature1'] = 25.0
+        df.loc[1:10, 'feature2'] = np.nan
+        
+        outliers = StatisticalAnalyzer()._detect_outliers(df)
+        
+        for col in ['feature1', 'feature2', 'feature3', 'target']:
+            z_scores = np.abs(stats.zscore(df[col].dropna()))
+            assert outliers[col]['count'] == int((z_scores > 3.0).sum())
+        assert outliers['feature1']['count'] >= 1
+    
+    def test_distribution_quartiles(self, sample_dataframe):
+        """Test quartiles match pandas quantiles with missing values."""
+        df = sample_dataframe.copy()
+        df.loc[1:10, 'feature2'] = np.nan
+        
+        distributions = StatisticalAnalyzer()._distribution_analysis(df)
+        
+        quartiles = distributions['feature2']['quartiles']
+        assert quartiles['q25'] == pytest.approx(df['feature2'].quantile(0.25))
+        assert quartiles['q50'] == pytest.approx(df['feature2'].quantile(0.50))
+        assert quartiles['q75'] == pytest.approx(df['feature2'].quantile(0.75))
+        assert 'category' not in distributions
+    
+    def test_feature_importance_sampled(self, sample_dataframe):
+        """Test sampled importance reports confidence and prefilter skips."""
+        df = sample_dataframe.copy()
+        df['signal'] = df['target'] * 2 + np.random.default_rng(0).normal(size=len(df))
+        
+        analyzer = StatisticalAnalyzer(importance=MutualInformationImportance(
+            sample_size=60, n_repeats=2, prefilter='correlation', prefilter_threshold=0.5
+        ))
+        importance, details = analyzer._feature_importance(df, 'target')
+        
+        assert next(iter(importance)) == 'signal'
+        assert set(importance) == {'feature1', 'feature2', 'feature3', 'signal'}
+        assert details['n_rows'] == 60
+        assert details['n_repeats'] == 2
+        assert 'signal' not in details['skipped']
+        assert details['confidence']['signal']['ci_low'] <= importance['signal']
+    
+    def test_hypothesis_test_batch(self, sample_dataframe):
+        """Test batched tests match pairwise hypothesis_test calls."""
+        analyzer = StatisticalAnalyzer()
+        results = analyzer.hypothesis_test_batch(
+            sample_dataframe, 'category', ['feature1', 'target'], correction='bonferroni'
+        )
+        
+        # 3 group pairs x 2 columns x 2 tests
+        assert len(results) == 12
+        for _, row in results.iterrows():
+            group1 = sample_dataframe.loc[sample_dataframe['category'] == row['group1'], row['value_column']]
+            group2 = sample_dataframe.loc[sample_dataframe['category'] == row['group2'], row['value_column']]
+            expected = analyzer.hypothesis_test(group1, group2, test_type=row['test'])
+            
+            assert row['statistic'] == pytest.approx(expected['statistic'])
+            assert row['p_value'] == pytest.approx(expected['p_value'])
+            assert row['p_adjusted'] == pytest.approx(min(expected['p_value'] * 6, 1.0))
+    
+    def test_cache_recomputes_changed_columns(self, sample_dataframe, monkeypatch):
+        """Test cached analysis only recomputes columns whose contents changed."""
+        analyzer = StatisticalAnalyzer(cache=True)
+        analyzer.analyze(sample_dataframe, target='target')
+        
+        computed = []
+        original = analyzer._distribution_analysis
+        monkeypatch.setattr(
+            analyzer, '_distribution_analysis',
+            lambda data, **kwargs: computed.append(list(data.columns)) or original(data, **kwargs)
+        )
+        
+        df = sample_dataframe.copy()
+        df['feature2'] = df['feature2'] * 2 + 1
+        results = analyzer.analyze(df, target='target')
+        expected = StatisticalAnalyzer().analyze(df, target='target')
+        
+        assert computed == [['feature2']]
+        assert results['distributions'] == expected['distributions']
+        for name, values in expected['descriptive'].items():
+            assert results['descriptive'][name] == pytest.approx(values)
+        assert pd.DataFrame(results['correlations']['matrix']).values == pytest.approx(
+            pd.DataFrame(expected['correlations']['matrix']).values
+        )
+        assert results['importance'] == pytest.approx(expected['importance'])
+    
+    def test_cache_merges_appended_rows(self, sample_dataframe, monkeypatch):
+        """Test cached analysis merges appended rows instead of recomputing."""
+        analyzer = StatisticalAnalyzer(cache=True)
+        analyzer.analyze(sample_dataframe, target='target')
+        
+        fitted, updated = [], []
+        fit = analyzer._fit_correlation_engine
+        monkeypatch.setattr(
+            analyzer, '_fit_correlation_engine',
+            lambda *args, **kwargs: fitted.append(True) or fit(*args, **kwargs)
+        )
+        update = MomentAccumulator.update
+        monkeypatch.setattr(
+            MomentAccumulator, 'update',
+            lambda self, X: updated.append(len(X)) or update(self, X)
+        )
+        
+        rng = np.random.default_rng(0)
+        extra = sample_dataframe.sample(20, random_state=0).reset_index(drop=True)
+        extra[['feature1', 'feature2']] = rng.normal(size=(20, 2))
+        df = pd.concat([sample_dataframe, extra], ignore_index=True)
+        results = analyzer.analyze(df, target='target')
+        
+        assert not fitted
+        assert updated and set(updated) == {20}
+        
+        expected = StatisticalAnalyzer().analyze(df, target='target')
+        for name, values in expected['descriptive'].items():
+            assert results['descriptive'][name] == pytest.approx(values)
+        assert pd.DataFrame(results['correlations']['matrix']).values == pytest.approx(
+            pd.DataFrame(expected['correlations']['matrix']).values
+        )
+        assert results['distributions'] == expected['distributions']